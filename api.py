@@ -0,0 +1,84 @@
+"""JSON HTTP routes for the armor filter and combination search, served next to the Gradio UI.
+
+Queries use the batch_search.py format and answers hold armor Ids and scores rather than
+HTML, so tools can call the search without rendering tables or going through the Gradio queue.
+"""
+import logging
+from typing import Dict, List
+
+from fastapi import FastAPI, HTTPException
+
+from armor_picker import ArmorPicker
+from batch_search import filter_query_armors, get_query_catalog, group_queries, search_queries, validate_query
+
+logger = logging.getLogger(__name__)
+
+def create_api(picker: ArmorPicker = None) -> FastAPI:
+    """Create the FastAPI app with the /api routes, searching with its own ArmorPicker by default.
+
+    /api/ready answers 503 until the picker is marked ready (see app.warm_up).
+    """
+    if picker is None:
+        picker = ArmorPicker()
+        picker.ready.set()
+    api = FastAPI(title="QM Armor Picker API")
+
+    @api.get("/api/health")
+    def health() -> Dict:
+        return {"status": "ok"}
+
+    @api.get("/api/ready")
+    def ready() -> Dict:
+        if not picker.ready.is_set():
+            raise HTTPException(status_code=503, detail="Warming up")
+        return {"status": "ready"}
+
+    @api.post("/api/filter")
+    def filter_armors(query: Dict) -> Dict:
+        """Armors passing the query's filters by type, with their resistances"""
+        try:
+            validate_query(picker, query)
+            filtered_armors = filter_query_armors(picker, query)
+            armor_rows = picker.get_armor_rows(*get_query_catalog(picker, query))
+            armors = {
+                armor_type: [
+                    {
+                        "id": armor_rows[row].Id,
+                        "name": armor_rows[row].Name,
+                        "resistances": dict(zip(picker.resistance_types, armor_rows[row].resists)),
+                    }
+                    for row in rows
+                ]
+                for armor_type, rows in filtered_armors.items()
+            }
+        except (ValueError, TypeError, KeyError) as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"armors": armors}
+
+    @api.post("/api/search")
+    def search(query: Dict) -> Dict:
+        """Best armor combinations of one query"""
+        result = search_queries(picker, [query])[0]
+        if "error" in result:
+            raise HTTPException(status_code=400, detail=result["error"])
+        return result
+
+    @api.post("/api/search/batch")
+    def search_batch(queries: List[Dict]) -> List[Dict]:
+        """Best armor combinations of many queries, in order; queries differing only in requirements are scored together"""
+        # One bad query fails the request before anything is searched
+        for query_index, query in enumerate(queries):
+            try:
+                validate_query(picker, query)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Query {query_index}: {e}")
+
+        results = [None] * len(queries)
+        for query_indexes in group_queries(queries):
+            group_results = search_queries(picker, [queries[query_index] for query_index in query_indexes])
+            for query_index, result in zip(query_indexes, group_results):
+                results[query_index] = result
+        return results
+
+    logger.info("JSON API routes ready under /api")
+    return api
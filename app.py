@@ -1,1001 +1,25 @@
 import gradio as gr
+import asyncio
+import contextvars
 import json
-import pandas as pd
-from typing import Dict, List, Any, Tuple
-import math
-from languages import translations
-import os
 import logging
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[logging.FileHandler("armorpicker.log"), logging.StreamHandler()]
-)
+import os
+import threading
+from armor_picker import DEFAULT_LANGUAGE, DEFAULT_VERSION, ArmorPicker, SearchQueueFull
+from combination_search import parse_modifiers
 
 logger = logging.getLogger(__name__)
 
-class ArmorPicker:
-    def __init__(self):
-        self.resistance_types = ["blunt", "pierce", "lacer", "fire", "cold", "poison", "shock", "beam"]
-        self.current_language = "English"
-        self.current_version = "0.9.2"  # Default version
-        self.armor_data = {}
-
-        # Color gradient configuration
-        self.color_stops = [
-            (0.0, "#F8696B"),   # Red at 0%
-            (0.3, "#FED280"),   # Orange at 30%
-            (0.6, "#C0D980"),   # Yellow at 60%
-            (1.0, "#63BE7B")    # Green at 100%
-        ]
-
-        # Language configuration
-        self.base_languages = {
-            "English": {"code": "english", "file": "armor_data_english.json"},
-            "Русский": {"code": "russian", "file": "armor_data_russian.json"},
-            "Deutsch": {"code": "german", "file": "armor_data_german.json"},
-            "Français": {"code": "french", "file": "armor_data_frenсh.json"},
-            "Español": {"code": "spanish", "file": "armor_data_spanish.json"},
-            "Polski": {"code": "polish", "file": "armor_data_polish.json"},
-            "Türkçe": {"code": "turkish", "file": "armor_data_turkish.json"},
-            "Português Brasileiro": {"code": "brazilian", "file": "armor_data_brazilianportugal.json"},
-            "한국어": {"code": "korean", "file": "armor_data_korean.json"},
-            "日本": {"code": "japanese", "file": "armor_data_japanese.json"},
-            "中国人": {"code": "chinese", "file": "armor_data_chinesesimp.json"}
-        }
-        
-        self.translations = translations
-        
-        # Initialize languages for default version
-        self.languages = self.get_version_languages(self.current_version)
-
-        # Tech Levels
-        self.tech_levels = [1,2,3,4,5,6,7,8,9,10]
-        self.armor_categories_block = ['Common Civillian', 'Common Civillian Managment']
-        self.armor_class =  ['Cloth', 'HeavyArmor', 'LightArmor', 'MediumArmor', 'PowerArmor']
-        self.armor_subclass =  ['Default', 'Quasi']
-
-        # Load default language data
-        self.load_armor_data("English")
-    
-    def get_version_languages(self, version: str) -> Dict:
-        """Get language configuration for specific version"""
-        version_languages = {}
-        for lang_name, lang_config in self.base_languages.items():
-            version_languages[lang_name] = {
-                "code": lang_config["code"],
-                "file": f"versions/{version}/{lang_config['file']}"
-            }
-        return version_languages
-    
-    def change_version(self, version: str) -> str:
-            """Handle version change and reload language configuration"""
-            if version != None:
-                self.current_version = version
-                self.languages = self.get_version_languages(version)
-            # Reload current language data with new version
-            self.load_armor_data(self.current_language)
-            return f"<p>{self.get_translation('click_search')}</p>"
-
-    def load_armor_data(self, language: str) -> Dict:
-        """Load armor data from JSON file for specified language"""
-        if language not in self.languages:
-            language = "English"
-        
-        file_path = self.languages[language]["file"]
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                self.armor_data = json.load(f)
-                self.current_language = language
-                return self.armor_data
-        except FileNotFoundError:
-            # Fallback to English if file not found
-            if language != "English":
-                return self.load_armor_data("English")
-            else:
-                self.armor_data = {"armors": {"data": []}}
-                return self.armor_data
-    
-    def get_translation(self, key: str) -> str:
-        """Get translation for current language"""
-        if (self.translations[self.current_language]):
-            if self.translations[self.current_language].get(key):
-                return self.translations[self.current_language].get(key)
-            else:
-                return self.translations["English"].get(key, key)
-
-        # return self.translations.get(self.current_language, self.translations["English"]).get(key, key)
-    
-    def get_armor_types(self) -> List[str]:
-        """Get unique armor types from the data"""
-        armor_types = set()
-        for armor in self.armor_data.get("armors", {}).get("data", []):
-            armor_types.add(armor.get("Type", "Unknown"))
-        return sorted(list(armor_types))
-    
-    def filter_armors(self, resistance_filters: Dict[str, Dict], selector_tech_level, armor_class, armor_subclass, armor_categories_block) -> List[Dict]:
-        """Filter armors based on resistance requirements"""
-        
-        # Get all filtered armors grouped by type
-        filtered_armors_by_type = {}
-        
-        # Dynamically get all armor categories from the data
-        for category_name, category_content in self.armor_data.items():
-
-            # Skip if this isn't a category with armor data
-            if not isinstance(category_content, dict) or "data" not in category_content:
-                continue
-                
-            # Get category data for boots, leggings, armor, helmets
-            category_data = category_content.get("data", [])
-            
-            for armor in category_data:
-                meets_requirements = True
-
-                if not (armor.get("ArmorClass")):
-                    logger.warning(f"Armor {armor.get('Name')} has no ArmorClass")
-                
-                if not (armor.get("TechLevel")):
-                    logger.warning(f"Armor {armor.get('Name')} has no TechLevel")
-
-                if not (armor.get("Categories")):
-                    logger.warning(f"Armor {armor.get('Name')} has no Category")
-
-                if not (armor.get("ArmorSubClass")):
-                    logger.warning(f"Armor {armor.get('Name')} has no ArmorSubClass")
-
-                if (armor_categories_block and armor.get("Categories") and armor.get("Categories") in armor_categories_block):
-                    logger.warning(f"{armor.get('Categories')} skipped as in {armor_categories_block}")
-                    meets_requirements = False
-                    continue
-
-                if (selector_tech_level and armor.get("TechLevel")):
-                    if (int(armor.get("TechLevel")) < selector_tech_level):
-                        logger.warning(f"{armor.get('TechLevel')} skipped as below {selector_tech_level}")
-                        meets_requirements = False
-                        continue
-
-                # We excluded some armor classes in filter
-                if (armor_class and armor.get("ArmorClass") and armor.get("ArmorClass") not in armor_class):
-                    logger.warning(f"{armor.get('ArmorClass')} skipped as not {armor_class}")
-                    meets_requirements = False
-                    continue
-
-                # Some items have None subclass so we treat them as default
-                if (armor_subclass and armor.get("ArmorSubClass") and armor.get("ArmorSubClass") not in armor_subclass):
-                    logger.warning(f"{armor.get('ArmorSubClass')} skipped as not {armor_subclass}")
-                    meets_requirements = False
-                    continue
-
-                # Check each resistance requirement
-                for resist_type, filter_config in resistance_filters.items():
-                    if not filter_config["enabled"]:
-                        continue
-                    
-                    required_value = filter_config["value"]
-                    
-                    # Skip if required_value is None or empty
-                    if required_value is None:
-                        continue
-                    
-                    # Convert to int if it's a string, default to 0 if conversion fails
-                    try:
-                        required_value = int(required_value)
-                    except (ValueError, TypeError):
-                        required_value = 0
-                    
-                    armor_resist_value = 0
-                    
-                    # Find the resistance value in armor's ResistSheet
-                    for resist in armor.get("ResistSheet", []):
-                        if resist.get("ResistType") == resist_type:
-                            armor_resist_value = resist.get("ResistValue", 0)
-                            break
-                    
-                    # Check if armor meets minimum requirement
-                    # Armor score here and required value is a resulting resist, disabling for now as we need to evaluate first.
-                    # if armor_resist_value < required_value:
-                    #     meets_requirements = False
-                    #     break
-                
-                if meets_requirements:
-                    armor_type = armor.get("Type", "Unknown")
-                    if armor_type not in filtered_armors_by_type:
-                        filtered_armors_by_type[armor_type] = []
-                    # Add category information to the armor data for better identification
-                    armor_with_category = armor.copy()
-                    armor_with_category["Category"] = category_name
-                    filtered_armors_by_type[armor_type].append(armor_with_category)
-        
-        return filtered_armors_by_type
-    
-    def sort_armors(self, armors: List[Dict], sort_by: str, sort_order: str) -> List[Dict]:
-        """Sort armors by specified column and order"""
-        if not armors or not sort_by:
-            return armors
-        
-        def get_sort_value(armor, column):
-            """Get the value to sort by for a given column"""
-            if column == "name":
-                return armor.get('Name', '').lower()
-            elif column == "type":
-                return armor.get('Type', '').lower()
-            elif column == "durability":
-                try:
-                    return int(armor.get('MaxDurability', 0))
-                except (ValueError, TypeError):
-                    return 0
-            elif column == "weight":
-                try:
-                    return float(armor.get('Weight', 0))
-                except (ValueError, TypeError):
-                    return 0.0
-            elif column in self.resistance_types:
-                # Find resistance value
-                for resist in armor.get("ResistSheet", []):
-                    if resist.get("ResistType") == column:
-                        return resist.get("ResistValue", 0)
-                return 0
-            else:
-                return ""
-        
-        # Sort the armors
-        reverse = (sort_order == "desc")
-        try:
-            sorted_armors = sorted(armors, key=lambda x: get_sort_value(x, sort_by), reverse=reverse)
-            return sorted_armors
-        except Exception:
-            # If sorting fails, return original list
-            return armors
-
-    def find_armor_combinations(self, filtered_armors, resistance_filters: Dict[str, Dict], language: str = None, invincible_perk: bool = False, hardened_talent: bool = False, hardened_talent_lvl: int = 1) -> str:
-        """Find armor combinations that meet resistance requirements"""
-        if language and language != self.current_language:
-            self.load_armor_data(language)
-        
-        # Get enabled resistance requirements
-        enabled_requirements = {}
-        for resist_type, filter_config in resistance_filters.items():
-            if filter_config["value"] == None: # If NoneType as we have nothing in the input
-                filter_config["value"] = 0
-            if filter_config["enabled"] and filter_config["value"] > 0:
-                enabled_requirements[resist_type] = filter_config["value"]
-        
-        if not enabled_requirements:
-            return f"<p>{self.get_translation('no_requirements_set')}</p>"
-        
-        # Get all armors grouped by type
-        # armor_by_type = {}
-        armor_by_type = filtered_armors
-        # for category_name, category_content in self.armor_data.items():
-        #     if not isinstance(category_content, dict) or "data" not in category_content:
-        #         continue
-                
-        #     for armor in category_content.get("data", []):
-        #         armor_type = armor.get("Type", "Unknown")
-        #         if armor_type not in armor_by_type:
-        #             armor_by_type[armor_type] = []
-        #         armor_with_category = armor.copy()
-        #         armor_with_category["Category"] = category_name
-        #         armor_by_type[armor_type].append(armor_with_category)
-        
-        # Find best armor combinations
-        combinations = []
-        armor_types = list(filtered_armors.keys())
-        
-        # Generate combinations (one armor per type)
-        from itertools import product
-        
-        # Limit combinations to prevent performance issues
-        max_combinations_per_type = 15
-        limited_armor_by_type = {}
-        for armor_type, armors in armor_by_type.items():
-            # Sort by total resistance for enabled requirements
-            def get_total_enabled_resistance(armor):
-                total = 0
-                for resist in armor.get("ResistSheet", []):
-                    resist_type = resist.get("ResistType")
-                    if resist_type in enabled_requirements:
-                        total += resist.get("ResistValue", 0)
-                return total
-            
-            sorted_armors = sorted(armors, key=get_total_enabled_resistance, reverse=True)
-            limited_armor_by_type[armor_type] = sorted_armors[:max_combinations_per_type]
-        
-        # Generate all possible combinations
-        # if len(limited_armor_by_type) > 1:
-        #     armor_lists = list(limited_armor_by_type.values())
-        #     for combination in product(*armor_lists):
-        #         combo_score = self.evaluate_combination(combination, enabled_requirements, invincible_perk, hardened_talent, hardened_talent_lvl)
-        #         
-        #         # Calculate percentage and filter above threshold
-        #         filter_above_threshold = True
-        # 
-        #         for resist_type in combo_score['resulting_resistances']:
-        #                 required_resistance = enabled_requirements[resist_type]
-        #                 actual_resistance = combo_score['resulting_resistances'][resist_type]['score']
-        #                 percentage_exceeded = (actual_resistance - required_resistance) / required_resistance * 100
-        #                 if percentage_exceeded > 10:
-        #                     filter_above_threshold = False
-        #                     break
-        # 
-        #         if filter_above_threshold:
-        #             combinations.append({
-        #                 'armors': combination,
-        #                 'score': combo_score
-        #             })
-        # 
-        from concurrent.futures import ThreadPoolExecutor
-
-        if len(limited_armor_by_type) > 1:
-            armor_lists = list(limited_armor_by_type.values())
-
-            # Function to process each combination
-            def process_combination(combination):
-                combo_score = self.evaluate_combination(combination, enabled_requirements, invincible_perk, hardened_talent, hardened_talent_lvl)
-
-                filter_above_threshold = True
-
-                for resist_type in combo_score['resulting_resistances']:
-                    required_resistance = enabled_requirements[resist_type]
-                    actual_resistance = combo_score['resulting_resistances'][resist_type]['score']
-                    percentage_exceeded = (actual_resistance - required_resistance) / required_resistance * 100
-                    if percentage_exceeded > 10:
-                        filter_above_threshold = False
-                        break
-
-                if filter_above_threshold:
-                    return {'armors': combination, 'score': combo_score}
-                else:
-                    return None
-
-            # Set the maximum number of threads to the number of CPU cores
-            max_threads = os.cpu_count() or 1  # Use all available CPU cores
-
-            # Use ThreadPoolExecutor to multithread the processing
-            with ThreadPoolExecutor(max_workers=max_threads) as executor:
-                futures = [executor.submit(process_combination, combination) for combination in product(*armor_lists)]
-                results = [future.result() for future in futures]
-
-            # Filter out None results and add valid combinations to the list
-            combinations.extend([result for result in results if result is not None])
-        
-        # Sort combinations by quality (best matches first)
-        # Now includes dispersion: lower dispersion (more balanced) is better
-        combinations.sort(key=lambda x: (
-            -x['score']['dispersion'],       # Lower dispersion is better (more balanced)
-             x['score']['avg_coverage'],      # Higher coverage is better
-            -x['score']['variance']          # Lower variance is better
-        ), reverse=True)
-        
-        # Filter combinations that meet threshold, but keep at least one
-        good_combinations = [combo for combo in combinations if combo['score']['meets_threshold']]
-        
-        if good_combinations:
-            # Use combinations that meet the threshold
-            final_combinations = good_combinations[:100]
-        elif combinations:
-            # No combinations meet threshold, but return the best match(es)
-            final_combinations = combinations[:20]  # Return top 5 best matches even if they don't meet requirements
-        else:
-            # This should rarely happen, but handle the edge case
-            return f"<p>{self.get_translation('no_combinations_found')}</p>"
-        
-        # Create HTML table for combinations
-        return self.create_combinations_table_html(final_combinations, enabled_requirements)
-
-    def calculate_armor_score_from_resistance(resulting_resistance):
-        if resulting_resistance >= 1:
-            return None  # Avoid log of non-positive number
-        numerator = math.log(1 - resulting_resistance)
-        denominator = -0.035 * math.log(1.75)
-        armor_score = numerator / denominator
-        return armor_score
-
-    def calculate_resulting_resistance(self, total_armor_score: int) -> float:
-        """Calculate resulting resistance percentage using the formula"""
-        if total_armor_score <= 0:
-            return 0.0
-        
-        try:
-            # 1 - 1.75^(-0.035 * v_armor)
-            result = 1 - math.pow(1.75, -0.035 * total_armor_score)
-            return max(0.0, min(1.0, result)) # Clamp between 0 and 1
-        except (OverflowError, ValueError):
-            # Handle edge cases where calculation might fail
-            return 1.0 if total_armor_score > 100 else 0.0
-        
-    def evaluate_combination(self, armor_combination, requirements: Dict[str, int], invincible_perk: bool = False, hardened_talent: bool = False, hardened_talent_lvl: int = 1) -> Dict:
-        """Evaluate how well an armor combination meets requirements using resistance formula"""
-        total_armor_scores = {}
-        
-        # Calculate total armor score for each resistance type
-        for armor in armor_combination:
-            for resist in armor.get("ResistSheet", []):
-                resist_type = resist.get("ResistType")
-                resist_value = resist.get("ResistValue", 0)
-                
-                total_armor_scores[resist_type] = total_armor_scores.get(resist_type, 0) + resist_value
-        
-        # Apply perks to the total combined resistance scores
-        for resist_type in total_armor_scores:
-            # Apply Invincible perk: +12 to all resistances
-            if invincible_perk:
-                total_armor_scores[resist_type] = total_armor_scores[resist_type] + 12
-            
-            # Apply Hardened talent: +10% to resistances
-            if hardened_talent:
-                resistance_increase = {
-                    1: 1.1,   # +10%
-                    2: 1.2,   # +20%
-                    3: 1.3,   # +30%
-                    4: 1.4    # +40%
-                }
-                
-                total_armor_scores[resist_type] = total_armor_scores[resist_type] * resistance_increase.get(hardened_talent_lvl, 1)
-        
-        # Calculate resulting resistance percentages and coverage
-        resulting_resistances = {}
-        coverages = []
-        enabled_resistance_percentages = []  # For dispersion calculation
-        
-        for resist_type, required_percentage in requirements.items():
-            total_score = total_armor_scores.get(resist_type, 0)
-            resulting_resistance = self.calculate_resulting_resistance(total_score)
-            resulting_percentage = resulting_resistance * 100  # Convert to percentage
-            
-            resulting_resistances[resist_type] = {
-                'score': total_score,
-                'percentage': resulting_percentage
-            }
-            
-            # Store for dispersion calculation
-            enabled_resistance_percentages.append(resulting_percentage)
-            
-            # Calculate coverage (how well we meet the requirement)
-            # Required percentage should be treated as the target resistance percentage
-            required_decimal = required_percentage / 100.0 if required_percentage > 1 else required_percentage
-            coverage = min(resulting_resistance / required_decimal, 1.0) if required_decimal > 0 else 1.0
-            coverages.append(coverage)
-        
-        # Calculate dispersion (standard deviation of resistance percentages)
-        # Lower dispersion = more balanced protection, Higher dispersion = uneven protection
-        dispersion = 0.0
-        
-        # Only calculate dispersion if we have more than one resistance type enabled
-        if len(enabled_resistance_percentages) > 1:
-            mean_percentage = sum(enabled_resistance_percentages) / len(enabled_resistance_percentages)
-            variance = sum((percentage - mean_percentage) ** 2 for percentage in enabled_resistance_percentages) / (len(enabled_resistance_percentages)-1)
-            dispersion = variance ** 0.5  # Standard deviation
-        
-        # Calculate metrics
-        avg_coverage = sum(coverages) / len(coverages) if coverages else 0
-        variance = sum((c - avg_coverage) ** 2 for c in coverages) / len(coverages) if coverages else 0
-        meets_threshold = avg_coverage >= 0.9  # At least 90% of requirements met
-        
-        return {
-            'avg_coverage': avg_coverage,
-            'variance': variance,
-            'meets_threshold': meets_threshold,
-            'total_armor_scores': total_armor_scores,  # Keep for backward compatibility
-            'resulting_resistances': resulting_resistances,  # New: actual resistance percentages
-            'coverages': coverages,
-            'dispersion': dispersion,  # New: resistance flatness measure
-            'mean_resistance': sum(enabled_resistance_percentages) / len(enabled_resistance_percentages) if enabled_resistance_percentages else 0
-        }
-
-    def create_combinations_table_html(self, combinations: List[Dict], requirements: Dict[str, int]) -> str:
-        """Create HTML table for armor combinations with CSS custom properties"""
-        
-        html = f"""
-        <style>
-        .combo-table {{
-            border-collapse: collapse !important;
-            width: 100% !important;
-            font-size: 16px !important;
-            margin-bottom: 20px !important;
-        }}
-        .combo-table th, .combo-table td {{
-            border: 1px solid #000 !important;
-            padding: 8px !important;
-            background-color: #333 !important;
-        }}
-        .combo-table th {{
-            background-color: #555 !important;
-            font-weight: bold !important;
-        }}
-        .combo-summary {{
-            font-weight: bold !important;
-            background-color: #2a2a2a !important;
-        }}
-        .combo-summary .combo-name {{
-            text-align: right !important;
-        }}
-        .combo-detail {{
-            padding-left: 20px !important;
-            font-style: bold !important;
-        }}
-        .combo-score-summary {{
-            font-weight: bold !important;
-            background-color: #444 !important;
-            font-style: italic !important;
-        }}
-        .combo-separator {{
-            background-color: transparent !important;
-            border: 1px solid transparent !important;
-        }}
-        .combo-separator td {{
-            background-color: transparent !important;
-            border: transparent !important;
-            padding: 8px !important;
-            height: 16px !important;
-        }}
-        .dispersion-cell {{
-            font-weight: bold !important;
-            text-align: left !important;
-            color: #000 !important;
-        }}
-        .summary-resist-cell {{
-            font-weight: bold !important;
-            text-align: left !important;
-            color: #000 !important;
-        }}
-        .armor-resist-cell {{
-            text-align: right !important;
-            background-color: #333 !important;
-            color: #fff !important;
-        }}
-        .result-resist-cell {{
-            font-weight: bold !important;
-            text-align: left !important;
-            background-color: #444 !important;
-        }}
-        .mean-cell {{
-            font-weight: bold !important;
-            text-align: left !important;
-            background-color: #444 !important;
-            color: #fff !important;
-            font-style: italic !important;
-        }}
-        
-        .dispersion-colored {{
-            color: var(--dispersion-color) !important;
-        }}
-        .diff-colored {{
-            color: var(--diff-color) !important;
-        }}
-        .percent-white {{
-            color: #fff !important;
-        }}
-        </style>
-        """
-        
-        html += f"<h3>{self.get_translation('armor_combinations')}</h3>"
-        html += f"<p>{self.get_translation('combinations_explanation')}</p>"
-        
-        html += '<table class="combo-table"><thead><tr>'
-        html += f'<th>{self.get_translation("item")}</th>'
-        html += f'<th>{self.get_translation("type")}</th>'
-        html += f'<th>{self.get_translation("dispersion")}</th>'
-        
-        # Add columns for each required resistance
-        for resist_type in requirements.keys():
-            html += f'<th>{self.get_translation(resist_type)}</th>'
-        
-        html += '</tr></thead><tbody>'
-        
-        # Add separator row after header
-        html += '<tr class="combo-separator">'
-        html += f'<td colspan="{3 + len(requirements)}">&nbsp;</td>'
-        html += '</tr>'
-        
-        # Get dispersion range for color calculation
-        all_dispersions = [combo['score']['dispersion'] for combo in combinations]
-        min_dispersion = min(all_dispersions) if all_dispersions else 0
-        max_dispersion = max(all_dispersions) if all_dispersions else 0
-        
-        for i, combo in enumerate(combinations, 1):
-            # Add separator row between combinations (except before the first one)
-            if i > 1:
-                html += '<tr class="combo-separator">'
-                html += f'<td colspan="{3 + len(requirements)}">&nbsp;</td>'
-                html += '</tr>'
-            
-            # Summary row - combination name with raw scores
-            html += '<tr class="combo-summary">'
-            
-            # Combination name (right-aligned)
-            combo_name = f"Combination {i}"
-            html += f'<td class="combo-name"><strong>{combo_name}</strong></td>'
-            html += f'<td><strong>Total</strong></td>'
-            
-            # Dispersion with gradient color (lower dispersion = better = greener)
-            dispersion = combo['score']['dispersion']
-            # Invert the color mapping: lower dispersion should be green (better)
-            inverted_dispersion = max_dispersion - dispersion if max_dispersion > min_dispersion else 0
-            dispersion_color = self.value_to_color(inverted_dispersion, 0, max_dispersion - min_dispersion)
-            html += f'<td class="dispersion-cell" style="background-color: {dispersion_color} !important;">{dispersion:.2f}</td>'
-            
-            max_value = max(combo['score']['resulting_resistances'][key]['score'] for key in combo['score']['resulting_resistances'])
-            min_value = min(combo['score']['resulting_resistances'][key]['score'] for key in combo['score']['resulting_resistances'])
-
-            # Show just the raw scores
-            for resist_type in requirements.keys():
-                resistance_info = combo['score']['resulting_resistances'].get(resist_type, {'score': 0, 'percentage': 0})
-                total_score = resistance_info['score']
-                diff_color = self.value_to_color(total_score, min_value, max_value)
-                
-                html += f'<td class="summary-resist-cell" style="background-color: {diff_color} !important;">{total_score:.0f}</td>'
-            
-            html += '</tr>'
-            
-            # Detail rows - one for each armor piece
-            for armor in combo['armors']:
-                html += '<tr class="combo-detail">'
-                
-                # Armor name (indented under combination name)
-                armor_name = armor.get('Name', 'Unknown')
-                html += f'<td class="combo-detail">{armor_name}</td>'
-                
-                # Armor type
-                armor_type = armor.get('Type', 'Unknown')
-                html += f'<td class="combo-detail">{armor_type}</td>'
-                
-                # Empty dispersion cell for detail rows
-                html += '<td></td>'
-                
-                # Individual armor resistance values
-                armor_resist_dict = {}
-                for resist in armor.get("ResistSheet", []):
-                    resist_value = resist.get("ResistValue", 0)
-                    
-                    armor_resist_dict[resist.get("ResistType")] = resist_value
-                
-                for resist_type in requirements.keys():
-                    value = armor_resist_dict.get(resist_type, 0)
-                    
-                    html += f'<td class="armor-resist-cell">{value:.0f}</td>'
-                
-                html += '</tr>'
-            
-            # Resulting Resistance row - shows percentages with brackets and mean percentage
-            html += '<tr class="combo-score-summary">'
-            html += f'<td class="combo-detail" style="font-style: italic;">Resulting Resistance</td>'
-            html += f'<td class="combo-detail" style="font-style: italic;">Percentages</td>'
-            
-            # Show mean percentage in the dispersion column
-            mean_resistance = combo['score']['mean_resistance']
-            html += f'<td class="mean-cell">Mean: {mean_resistance:.2f}%</td>'
-            
-            # Show percentage with difference in brackets
-            for resist_type in requirements.keys():
-                resistance_info = combo['score']['resulting_resistances'].get(resist_type, {'score': 0, 'percentage': 0})
-                resulting_percentage = resistance_info['percentage']
-                required_percentage = requirements[resist_type]
-                
-                # Calculate difference in percentage points
-                difference = resulting_percentage - required_percentage
-                
-                # Get gradient colors
-                diff_color = self.get_difference_color(difference, required_percentage)
-                
-                # Format difference text
-                if difference > 0:
-                    diff_text = f"(+{difference:.1f}%)"
-                elif difference < 0:
-                    diff_text = f"({difference:.1f}%)"
-                else:
-                    diff_text = "(0%)"
-                
-                html += f'''<td class="result-resist-cell" style="--diff-color: {diff_color};">
-                            <span class="percent-white">{resulting_percentage:.1f}%</span> 
-                            <span class="diff-colored">{diff_text}</span>
-                            </td>'''
-            
-            html += '</tr>'
-        
-        html += '</tbody></table>'
-        return html
-
-    def get_difference_color(self, difference: int, required: int) -> str:
-        """Get color for difference value based on gradient using existing color system"""
-        if required == 0:
-            return "#fff"  # White for zero requirement
-        
-        # Normalize difference as percentage of requirement
-        # -1.0 = completely missing requirement, 0 = exact match, +1.0 = double requirement
-        normalized_diff = difference / required
-        
-        # Clamp to reasonable range for color calculation
-        normalized_diff = max(-1.0, min(1.0, normalized_diff))
-        
-        # Map to 0-1 range for color gradient
-        # -1.0 -> 0.0 (red), 0.0 -> 0.5 (yellow), +1.0 -> 1.0 (green)
-        color_position = (normalized_diff + 1.0) / 2.0
-        
-        # Use the existing color system from the class
-        return self.value_to_color_from_position(color_position)
-
-    def get_coverage_color(self, coverage_pct: float) -> str:
-        """Get color for coverage percentage using existing color system"""
-        # Map coverage percentage (0-100) to color position (0-1)
-        color_position = coverage_pct / 100.0
-        return self.value_to_color_from_position(color_position)
-
-    def value_to_color_from_position(self, position: float) -> str:
-        """Convert a normalized position (0-1) to color using existing gradient system"""
-        # Clamp position to 0-1 range
-        position = max(0.0, min(1.0, position))
-        
-        def hex_to_rgb(hex_color: str) -> tuple:
-            hex_color = hex_color.lstrip('#')
-            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-        
-        def rgb_to_hex(r: int, g: int, b: int) -> str:
-            return f"#{r:02x}{g:02x}{b:02x}"
-        
-        # Find the two color stops to interpolate between
-        for i in range(len(self.color_stops) - 1):
-            pos1, color1 = self.color_stops[i]
-            pos2, color2 = self.color_stops[i + 1]
-            
-            if pos1 <= position <= pos2:
-                # Interpolate between these two colors
-                local_normalized = (position - pos1) / (pos2 - pos1)
-                
-                rgb1 = hex_to_rgb(color1)
-                rgb2 = hex_to_rgb(color2)
-                
-                red = int(rgb1[0] + (rgb2[0] - rgb1[0]) * local_normalized)
-                green = int(rgb1[1] + (rgb2[1] - rgb1[1]) * local_normalized)
-                blue = int(rgb1[2] + (rgb2[2] - rgb1[2]) * local_normalized)
-                
-                return rgb_to_hex(red, green, blue)
-        
-        # Fallback to last color if position >= 1
-        return self.color_stops[-1][1]
-
-        
-    def get_top_armors_per_type(self, filtered_armors: List[Dict], max_per_type: int = 4) -> List[Dict]:
-        """Get top armors from each armor type"""
-        # armor_types = {}  
-        armor_types = filtered_armors
-        
-        # Group by armor type
-        # for armor in filtered_armors:
-            # armor_type = armor.get("Type", "Unknown")
-            # if armor_type not in armor_types:
-                # armor_types[armor_type] = []
-            # armor_types[armor_type].append(armor)
-        
-        # Get top items from each type (sorted by total resistance)
-        result = []
-        for armor_type, armors in armor_types.items():
-            # Sort by total resistance value (descending)
-            sorted_armors = sorted(armors, key=lambda x: sum(
-                resist.get("ResistValue", 0) for resist in x.get("ResistSheet", [])
-            ), reverse=True)
-            
-            # Take top N items from this type
-            result.extend(sorted_armors[:max_per_type])
-        
-        return result
-    
-    def get_resistance_range(self, armors: List[Dict]) -> Dict[str, Tuple[int, int]]:
-        """Get min/max values for each resistance type to calculate gradients"""
-        ranges = {}
-        
-        for resist_type in self.resistance_types:
-            values = []
-            for armor in armors:
-                for resist in armor.get("ResistSheet", []):
-                    if resist.get("ResistType") == resist_type:
-                        values.append(resist.get("ResistValue", 0))
-                        break
-                else:
-                    values.append(0)
-            
-            if values:
-                ranges[resist_type] = (min(values), max(values))
-            else:
-                ranges[resist_type] = (0, 0)
-        
-        return ranges
-    
-    def value_to_color(self, value: int, min_val: int, max_val: int, color_stops: list = None) -> str:
-        """Convert resistance value to color gradient with multiple color stops"""
-        if max_val == min_val:
-            return "#3D3D3D"  # Black for single value
-        
-        # Default color stops: Red → Yellow → Green
-        if self.color_stops is None:
-            self.color_stops = [
-                (0.0, "#FF0000"),   # Red at 0%
-                (0.5, "#FFFF00"),   # Yellow at 50%
-                (1.0, "#00FF00")    # Green at 100%
-            ]
-        
-        def hex_to_rgb(hex_color: str) -> tuple:
-            hex_color = hex_color.lstrip('#')
-            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-        
-        def rgb_to_hex(r: int, g: int, b: int) -> str:
-            return f"#{r:02x}{g:02x}{b:02x}"
-        
-        # Normalize value between 0 and 1
-        normalized = (value - min_val) / (max_val - min_val)
-        
-        # Find the two color stops to interpolate between
-        for i in range(len(self.color_stops) - 1):
-            pos1, color1 = self.color_stops[i]
-            pos2, color2 = self.color_stops[i + 1]
-            
-            if pos1 <= normalized <= pos2:
-                # Interpolate between these two colors
-                local_normalized = (normalized - pos1) / (pos2 - pos1)
-                
-                rgb1 = hex_to_rgb(color1)
-                rgb2 = hex_to_rgb(color2)
-                
-                red = int(rgb1[0] + (rgb2[0] - rgb1[0]) * local_normalized)
-                green = int(rgb1[1] + (rgb2[1] - rgb1[1]) * local_normalized)
-                blue = int(rgb1[2] + (rgb2[2] - rgb1[2]) * local_normalized)
-                
-                return rgb_to_hex(red, green, blue)
-        
-        # Fallback to last color if normalized > 1
-        return color_stops[-1][1]
-    
-    def create_styled_table_html(self, armors: List[Dict], sort_by: str = "name", sort_order: str = "asc", language: str = None) -> str:
-        """Create HTML table with color gradients and sortable headers"""
-        if not armors:
-            return f"<p>{self.get_translation('no_armors')}</p>"
-        
-        # Use provided language or fall back to current language
-        if language and language != self.current_language:
-            self.load_armor_data(language)
-        
-        # Get resistance ranges for color calculation
-        resist_ranges = self.get_resistance_range(armors)
-        
-        # Define sortable columns and their display names
-        sortable_columns = {
-            "name": self.get_translation('name'),
-            "type": self.get_translation('type'),
-            "durability": self.get_translation('durability'),
-            "weight": self.get_translation('weight'),
-            "blunt": self.get_translation('blunt'),
-            "pierce": self.get_translation('pierce'),
-            "lacer": self.get_translation('lacer'),
-            "fire": self.get_translation('fire'),
-            "cold": self.get_translation('cold'),
-            "poison": self.get_translation('poison'),
-            "shock": self.get_translation('shock'),
-            "beam": self.get_translation('beam')
-        }
-        
-        def create_header(column_key, display_name):
-            """Create a sortable header cell"""
-            if column_key == sort_by:
-                # Currently sorted column
-                if sort_order == "asc":
-                    next_order = "desc"
-                    arrow = " ↑"
-                else:
-                    next_order = "asc"
-                    arrow = " ↓"
-            else:
-                # Not currently sorted
-                next_order = "asc"
-                arrow = ""
-            
-            return f'''<th class="sortable-header" data-column="{column_key}" data-next-order="{next_order}" style="cursor: pointer; user-select: none;">{display_name}{arrow}</th>'''
-        
-        # Start HTML table
-        html = f"""
-        <style>
-        .armor-table {{
-            border-collapse: collapse !important;
-            width: 100% !important;
-            font-family: 'Roboto', Arial, sans-serif !important;
-            font-size: 16px !important;
-        }}
-        .armor-table th, .armor-table td {{
-            border: 1px solid #000 !important; /* Force black border */
-            padding: 8px !important;
-            text-align: left !important; /* Dynamic text alignment */
-            background-color: #333 !important; /* Dark grey background */
-            color: #fff !important; /* White text for readability */
-        }}
-        .armor-table th {{
-            background-color: #555 !important; /* Slightly darker grey for header */
-            font-weight: bold !important;
-        }}
-        .armor-table th.sortable-header:hover {{
-            background-color: #666 !important;
-        }}
-        .armor-table tr:nth-child(even) td {{
-            background-color: #444 !important; /* Alternate row color */
-        }}
-        .armor-table .resist-cell {{
-            font-weight: bold !important;
-            color: #000 !important; /* Force black text for resistance cells */
-            text-shadow: none !important; /* Remove text shadow for better readability */
-            text-align: center !important; /* Keep resistance cells centered for better readability */
-        }}
-        /* Override Gradio's default table styling */
-        .gradio-container .prose table.armor-table,
-        .gradio-container .prose table.armor-table tr,
-        .gradio-container .prose table.armor-table td,
-        .gradio-container .prose table.armor-table th {{
-            border: 1px solid #000 !important;
-            text-align: left !important;
-        }}
-        .gradio-container .prose table.armor-table .resist-cell {{
-            color: #000 !important;
-            text-align: center !important; /* Keep resistance cells centered */
-        }}
-        </style>
-        <table class="armor-table">
-        <thead>
-        <tr>
-        """
-        
-        # Add headers with translations and sorting functionality
-        html += create_header("name", sortable_columns["name"])
-        html += create_header("type", sortable_columns["type"])
-        html += f"<th>{self.get_translation('description')}</th>"  # Description not sortable
-        html += create_header("durability", sortable_columns["durability"])
-        html += create_header("weight", sortable_columns["weight"])
-        
-        # Add resistance headers
-        for resist_type in self.resistance_types:
-            html += create_header(resist_type, sortable_columns[resist_type])
-        
-        html += "</tr></thead><tbody>"
-        
-        # Add armor rows
-        for armor in armors:
-            html += "<tr>"
-            html += f"<td><strong>{armor.get('Name', 'Unknown')}</strong></td>"
-            html += f"<td>{armor.get('Type', 'Unknown')}</td>"
-            html += f"<td>{armor.get('Description', 'N/A')}</td>"
-            html += f"<td>{armor.get('MaxDurability', 'N/A')}</td>"
-            html += f"<td>{armor.get('Weight', 'N/A')}</td>"
-            
-            # Add resistance values with colors
-            resist_dict = {}
-            for resist in armor.get("ResistSheet", []):
-                resist_dict[resist.get("ResistType")] = resist.get("ResistValue", 0)
-            
-            for resist_type in self.resistance_types:
-                value = resist_dict.get(resist_type, 0)
-                min_val, max_val = resist_ranges[resist_type]
-                color = self.value_to_color(value, min_val, max_val)
-                html += f'<td class="resist-cell" style="background-color: {color} !important; color: #000 !important;">{value}</td>'
-            
-            html += "</tr>"
-        
-        html += "</tbody></table>"
-        
-        return html
-
-def create_armor_picker_interface():
-    picker = ArmorPicker()
+def create_armor_picker_interface(picker: ArmorPicker = None):
+    picker = picker or ArmorPicker()
     
-    def change_version(version):
+    def change_version(version, language):
         """Handle version change"""
-        return picker.change_version(version)
+        choices = picker.get_item_choices(version, language)
+        return f"<p>{picker.get_translation('click_search', language)}</p>", gr.Dropdown(choices=choices), gr.Dropdown(choices=choices)
     
-    def search_armors(language, version, current_sort_by, current_sort_order, invincible_perk, hardened_talent, hardened_talent_lvl, selector_tech_level, *args):
-        """Search armors with current language"""
-        # Ensure version and data are loaded for current language
-        picker.change_version(version)
-        picker.load_armor_data(language)
-
-        # Parse resistance filter arguments
+    def get_resistance_filters(*args):
+        """Parse the toggle and value inputs of each resistance type"""
         resistance_filters = {}
         # expected_args = len(picker.resistance_types) * 2
         # if len(args) != expected_args:
@@ -1014,20 +38,29 @@ def create_armor_picker_interface():
                     "enabled": True,
                     "value": 0
                 }
-        
-        # print(args[:16])
-        # print(args[16:]) # Resist and value is 16 look above
-        # print("")
+        return resistance_filters
+
+    def get_named_inputs(*args):
+        """Unpack the inputs following the resistance toggles and values.
 
-        arg_armor_class = args[16:][0]
-        arg_armor_subclass = args[16:][1]
-        arg_armor_categories_block = args[16:][2]
+        Returns (armor classes, armor subclasses, blocked categories, extra modifiers text,
+        pinned ids, banned ids), in search_inputs order.
+        """
+        armor_class, armor_subclass, armor_categories_block, modifiers_text, pinned_ids, banned_ids = args[len(picker.resistance_types) * 2:]
+        return armor_class, armor_subclass, armor_categories_block, modifiers_text, pinned_ids, banned_ids
+
+    def filter_and_sort_armors(session_key, language, version, current_sort_by, current_sort_order, selector_tech_level, *args):
+        """Filter armors of the session's version and build the individual armors table in its language"""
+        # Sessions share the picker, so version and language are passed along rather than switched
+        resistance_filters = get_resistance_filters(*args)
+        
+        arg_armor_class, arg_armor_subclass, arg_armor_categories_block, _, _, _ = get_named_inputs(*args)
 
         # Filter armors
-        filtered_armors = picker.filter_armors(resistance_filters, selector_tech_level, arg_armor_class, arg_armor_subclass, arg_armor_categories_block)
+        filtered_armors = picker.filter_armors(resistance_filters, selector_tech_level, arg_armor_class, arg_armor_subclass, arg_armor_categories_block, session_key=session_key, version=version, language=language)
 
         # Get top 4 from each armor type
-        top_armors = picker.get_top_armors_per_type(filtered_armors, max_per_type=99)
+        top_armors = picker.get_top_armors_per_type(filtered_armors, max_per_type=99, version=version, language=language)
         
         # Ensure we have sort parameters
         if not current_sort_by:
@@ -1039,34 +72,117 @@ def create_armor_picker_interface():
         
         # Create styled HTML table with sort indicators - pass language explicitly
         html_table = picker.create_styled_table_html(sorted_armors, current_sort_by, current_sort_order, language)
-        
-        # Find armor combinations
-        combinations_html = picker.find_armor_combinations(filtered_armors, resistance_filters, language, invincible_perk, hardened_talent, hardened_talent_lvl)
-        
-        return html_table, combinations_html, current_sort_by, current_sort_order
+
+        return html_table, filtered_armors, resistance_filters, current_sort_by, current_sort_order
+
+    def get_extra_modifiers(modifiers_text):
+        """Parse the extra modifiers text box, ignoring it with a warning when invalid"""
+        try:
+            return parse_modifiers(modifiers_text)
+        except ValueError as e:
+            gr.Warning(str(e))
+            return []
+
+    def search_armors(session_key, language, version, current_sort_by, current_sort_order, invincible_perk, hardened_talent, hardened_talent_lvl, selector_tech_level, *args):
+        """Search armors with current language, streaming combinations as better ones are found"""
+        html_table, filtered_armors, resistance_filters, current_sort_by, current_sort_order = filter_and_sort_armors(
+            session_key, language, version, current_sort_by, current_sort_order, selector_tech_level, *args)
+        _, _, _, modifiers_text, pinned_ids, banned_ids = get_named_inputs(*args)
+
+        # A new search of the same session cancels this one
+        cancel_event = picker.begin_search(session_key)
+        try:
+            # Find armor combinations
+            for combinations_html in picker.iter_armor_combinations(
+                filtered_armors, resistance_filters, language, invincible_perk, hardened_talent, hardened_talent_lvl,
+                time_budget=picker.search_time_budget,
+                cancel_event=cancel_event,
+                update_interval=picker.search_update_interval,
+                modifiers=get_extra_modifiers(modifiers_text),
+                pinned_ids=pinned_ids,
+                banned_ids=banned_ids,
+                version=version,
+            ):
+                yield html_table, combinations_html, current_sort_by, current_sort_order
+        finally:
+            picker.end_search(session_key, cancel_event)
     
-    def handle_sort_with_js_params(json_data, current_language, current_version, *current_resistance_args):
+    def rescore_armors(session_key, language, version, invincible_perk, hardened_talent, hardened_talent_lvl, selector_tech_level, *args):
+        """Rank the combinations of a finished search again after a perk change, without searching again"""
+        resistance_filters = get_resistance_filters(*args)
+        if not picker.get_enabled_requirements(resistance_filters):
+            yield gr.update()
+            return
+
+        # Only the filtered armors are needed, the individual armors table is left as it is
+        armor_class, armor_subclass, armor_categories_block, modifiers_text, pinned_ids, banned_ids = get_named_inputs(*args)
+        filtered_armors = picker.filter_armors(resistance_filters, selector_tech_level, armor_class, armor_subclass, armor_categories_block, session_key=session_key, version=version, language=language)
+
+        rescored = False
+        for combinations_html in picker.iter_armor_combinations(
+            filtered_armors, resistance_filters, language, invincible_perk, hardened_talent, hardened_talent_lvl,
+            cached_only=True,
+            modifiers=get_extra_modifiers(modifiers_text),
+            pinned_ids=pinned_ids,
+            banned_ids=banned_ids,
+            version=version,
+        ):
+            rescored = True
+            yield combinations_html
+
+        # Nothing to rank again, keep the results until the next search
+        if not rescored:
+            yield gr.update()
+    
+    async def stream_search(generator_function, *args):
+        """Run a streaming handler on the picker's search threads, passing its updates on as they come.
+
+        Keeps heavy searches off the event loop; raises SearchQueueFull when the search queue is full.
+        """
+        loop = asyncio.get_running_loop()
+        updates = asyncio.Queue()
+        stopped = threading.Event()
+        finished = object()
+
+        def run():
+            generator = generator_function(*args)
+            try:
+                for update in generator:
+                    loop.call_soon_threadsafe(updates.put_nowait, update)
+                    if stopped.is_set():
+                        break
+            finally:
+                generator.close()
+                loop.call_soon_threadsafe(updates.put_nowait, finished)
+
+        # The handler's context is copied so gr.Warning still reaches the session
+        future = picker.submit_search(contextvars.copy_context().run, run)
+        try:
+            while (update := await updates.get()) is not finished:
+                yield update
+            await asyncio.wrap_future(future)
+        finally:
+            # The session left or started something else, stop at the next update
+            stopped.set()
+
+    async def run_search(function, *args):
+        """Run a handler on the picker's search threads; raises SearchQueueFull when the search queue is full"""
+        return await asyncio.wrap_future(picker.submit_search(contextvars.copy_context().run, function, *args))
+
+    def handle_sort_with_js_params(session_key, json_data, language, version, invincible_perk, hardened_talent, hardened_talent_lvl, selector_tech_level, *args):
         """Handle sort with parameters returned from JavaScript as JSON"""
         try:
-            import json
             data = json.loads(json_data)
             
             sort_column = data.get('sortColumn', 'name')
             sort_order = data.get('sortOrder', 'asc')
-            
-            # Use the current Gradio state values instead of JavaScript values
-            language = current_language
-            version = current_version
-            resistance_args = current_resistance_args
-            
-            # Ensure the picker has the correct language loaded
-            picker.change_version(version)
-            picker.load_armor_data(language)
-            
-            if sort_column and sort_order:
-                return search_armors(language, version, sort_column, sort_order, *resistance_args)
-            else:
-                return search_armors(language, version, "name", "asc", *resistance_args)
+
+            if not (sort_column and sort_order):
+                sort_column, sort_order = "name", "asc"
+
+            # Sorting only affects the individual armors table, combinations are left as they are
+            html_table, _, _, sort_column, sort_order = filter_and_sort_armors(session_key, language, version, sort_column, sort_order, selector_tech_level, *args)
+            return html_table, sort_column, sort_order
                     
         except (json.JSONDecodeError, Exception) as e:
             return gr.update(), gr.update(), gr.update()
@@ -1114,8 +230,8 @@ def create_armor_picker_interface():
                 
             with gr.Column(scale=1, min_width=150):
                 language_selector = gr.Dropdown(
-                    choices=list(picker.languages.keys()),
-                    value="English",
+                    choices=list(picker.base_languages.keys()),
+                    value=DEFAULT_LANGUAGE,
                     label="Language",
                     scale=0,
                     container=True,
@@ -1181,13 +297,18 @@ def create_armor_picker_interface():
                 # Version selector
                 with gr.Row():
                     version_selector = gr.Dropdown(
-                        choices=["0.9", "0.9.2"],
-                        value="0.9.2",
+                        choices=picker.versions,
+                        value=DEFAULT_VERSION,
                         label="Game Version",
                         scale=1
                     )
                 
                 search_btn = gr.Button("Search Armors", variant="primary")
+                auto_search = gr.Checkbox(
+                    label="Live search",
+                    info="Search again automatically shortly after filters change",
+                    value=False,
+                )
 
                 # Create toggle and value inputs for each resistance type
                 resistance_inputs = []
@@ -1226,6 +347,26 @@ def create_armor_picker_interface():
                             scale=1,
                             label="Hardened Level",
                         )
+                        extra_modifiers = gr.Textbox(
+                            label="Extra modifiers",
+                            info="e.g. +5, fire +10, cold +20%",
+                            value="",
+                            max_lines=1,
+                        )
+                        pinned_items = gr.Dropdown(
+                            choices=picker.get_item_choices(),
+                            value=[],
+                            multiselect=True,
+                            label="Locked items",
+                            info="Only these items are used in their slots",
+                        )
+                        banned_items = gr.Dropdown(
+                            choices=picker.get_item_choices(),
+                            value=[],
+                            multiselect=True,
+                            label="Banned items",
+                            info="These items are never used",
+                        )
                         
             with gr.Column(scale=4):
                 results_md = gr.Markdown("## Results")
@@ -1312,45 +453,48 @@ def create_armor_picker_interface():
         # Version change handler
         version_selector.change(
             fn=change_version,
-            inputs=[version_selector],
-            outputs=[individual_results]
+            inputs=[version_selector, language_selector],
+            outputs=[individual_results, pinned_items, banned_items]
         )
 
         # Language change handler - update text elements and checkbox labels
-        def update_ui_language(language):
-            picker.load_armor_data(language)
+        def update_ui_language(language, version):
             
             # Update text elements
             updates = []
-            updates.append(f"# {picker.get_translation('title')}")  # title
-            updates.append(picker.get_translation('subtitle'))  # subtitle
-            updates.append(picker.get_translation('color_legend'))  # legend
-            updates.append(f"## {picker.get_translation('resistance_filters')}")  # filters
-            updates.append(f"## {picker.get_translation('results')}")  # results
-            updates.append(picker.get_translation('search_button'))  # search button
-            updates.append(f"<p>{picker.get_translation('click_search')}</p>")  # individual_results
-            updates.append(f"<p>{picker.get_translation('click_search')}</p>")  # combination_results
-            updates.append(gr.Dropdown(label=picker.get_translation('game_version'))) # game version
-            updates.append(gr.TabItem(label=picker.get_translation('armor_combinations_tab')))  # armor combinations tab
-            updates.append(gr.TabItem(label=picker.get_translation('individual_armors_tab')))  # individual armors tab
-            updates.append(gr.Checkbox(label=picker.get_translation('perk_invincible')))
-            updates.append(gr.Checkbox(label=picker.get_translation('talent_all_resists')))
-            updates.append(gr.Checkbox(label=picker.get_translation('talent_all_resist_damage'))) # hardened_talent_lvl
-
-            updates.append(f"# {picker.get_translation('extra_settings_markdown')}") # extra_settings_markdown
-            updates.append(f"{picker.get_translation('extra_settings_markdown_text')}") # extra_settings_markdown_text
-            updates.append(f"{picker.get_translation('extra_settings_textlevels_text')}") # extra_settings_textlevels_text
-            updates.append(gr.Slider(info=picker.get_translation('selector_tech_level'))) # selector_tech_level
-            updates.append(f"{picker.get_translation('extra_settings_armorclass_text')}") # extra_settings_armorclass_text
-            updates.append(f"{picker.get_translation('extra_settings_armorsubclass_text')}") # extra_settings_armorsubclass_text
-            updates.append(f"{picker.get_translation('extra_settings_armorignore_text')}") # extra_settings_armorignore_text
+            updates.append(f"# {picker.get_translation('title', language)}")  # title
+            updates.append(picker.get_translation('subtitle', language))  # subtitle
+            updates.append(picker.get_translation('color_legend', language))  # legend
+            updates.append(f"## {picker.get_translation('resistance_filters', language)}")  # filters
+            updates.append(f"## {picker.get_translation('results', language)}")  # results
+            updates.append(picker.get_translation('search_button', language))  # search button
+            updates.append(gr.Checkbox(label=picker.get_translation('auto_search', language), info=picker.get_translation('auto_search_info', language)))  # auto search
+            updates.append(f"<p>{picker.get_translation('click_search', language)}</p>")  # individual_results
+            updates.append(f"<p>{picker.get_translation('click_search', language)}</p>")  # combination_results
+            updates.append(gr.Dropdown(label=picker.get_translation('game_version', language))) # game version
+            updates.append(gr.TabItem(label=picker.get_translation('armor_combinations_tab', language)))  # armor combinations tab
+            updates.append(gr.TabItem(label=picker.get_translation('individual_armors_tab', language)))  # individual armors tab
+            updates.append(gr.Checkbox(label=picker.get_translation('perk_invincible', language)))
+            updates.append(gr.Checkbox(label=picker.get_translation('talent_all_resists', language)))
+            updates.append(gr.Checkbox(label=picker.get_translation('talent_all_resist_damage', language))) # hardened_talent_lvl
+            updates.append(gr.Textbox(label=picker.get_translation('extra_modifiers', language), info=picker.get_translation('extra_modifiers_info', language))) # extra_modifiers
+            updates.append(gr.Dropdown(label=picker.get_translation('pinned_items', language), info=picker.get_translation('pinned_items_info', language), choices=picker.get_item_choices(version, language))) # pinned_items
+            updates.append(gr.Dropdown(label=picker.get_translation('banned_items', language), info=picker.get_translation('banned_items_info', language), choices=picker.get_item_choices(version, language))) # banned_items
+
+            updates.append(f"# {picker.get_translation('extra_settings_markdown', language)}") # extra_settings_markdown
+            updates.append(f"{picker.get_translation('extra_settings_markdown_text', language)}") # extra_settings_markdown_text
+            updates.append(f"{picker.get_translation('extra_settings_textlevels_text', language)}") # extra_settings_textlevels_text
+            updates.append(gr.Slider(info=picker.get_translation('selector_tech_level', language))) # selector_tech_level
+            updates.append(f"{picker.get_translation('extra_settings_armorclass_text', language)}") # extra_settings_armorclass_text
+            updates.append(f"{picker.get_translation('extra_settings_armorsubclass_text', language)}") # extra_settings_armorsubclass_text
+            updates.append(f"{picker.get_translation('extra_settings_armorignore_text', language)}") # extra_settings_armorignore_text
 
             # Update checkbox labels for resistance types
             for resist_type in picker.resistance_types:
-                updates.append(gr.Checkbox(label=picker.get_translation(resist_type)))
+                updates.append(gr.Checkbox(label=picker.get_translation(resist_type, language)))
             
-            updates.append(gr.CheckboxGroup(info=picker.get_translation('selector_armor_subclass_info'))) # selector_armor_subclass
-            updates.append(gr.CheckboxGroup(info=picker.get_translation('selector_armor_categories_block_info'))) # selector_armor_categories_block
+            updates.append(gr.CheckboxGroup(info=picker.get_translation('selector_armor_subclass_info', language))) # selector_armor_subclass
+            updates.append(gr.CheckboxGroup(info=picker.get_translation('selector_armor_categories_block_info', language))) # selector_armor_categories_block
 
             return updates
         
@@ -1362,6 +506,7 @@ def create_armor_picker_interface():
             filters_md,
             results_md,
             search_btn,
+            auto_search,
             individual_results,
             combination_results,
             version_selector,
@@ -1370,6 +515,9 @@ def create_armor_picker_interface():
             invincible_perk,
             hardened_talent,
             hardened_talent_lvl,
+            extra_modifiers,
+            pinned_items,
+            banned_items,
             extra_settings_markdown,
             extra_settings_markdown_text,
             extra_settings_textlevels_text,
@@ -1384,14 +532,56 @@ def create_armor_picker_interface():
 
         language_selector.change(
             fn=update_ui_language,
-            inputs=[language_selector],
+            inputs=[language_selector, version_selector],
             outputs=outputs_list
         )
         
         # Search button click handler
-        def initial_search(language, version, *args):
-            result_html, combo_html, new_sort_by, new_sort_order = search_armors(language, version, "name", "asc", *args)
-            return result_html, combo_html, new_sort_by, new_sort_order
+        async def initial_search(request: gr.Request, language, version, *args):
+            session_key = request.session_hash if request else None
+            try:
+                async for update in stream_search(search_armors, session_key, language, version, "name", "asc", *args):
+                    yield update
+            except SearchQueueFull:
+                gr.Warning(picker.get_translation('search_queue_full', language))
+                yield gr.update(), gr.update(), gr.update(), gr.update()
+
+        async def rescore_search(request: gr.Request, language, *args):
+            session_key = request.session_hash if request else None
+            try:
+                async for update in stream_search(rescore_armors, session_key, language, *args):
+                    yield update
+            except SearchQueueFull:
+                gr.Warning(picker.get_translation('search_queue_full', language))
+                yield gr.update()
+
+        async def sort_search(request: gr.Request, json_data, language, *args):
+            session_key = request.session_hash if request else None
+            try:
+                return await run_search(handle_sort_with_js_params, session_key, json_data, language, *args)
+            except SearchQueueFull:
+                gr.Warning(picker.get_translation('search_queue_full', language))
+                return gr.update(), gr.update(), gr.update()
+
+        async def live_search(request: gr.Request, auto_search_enabled, language, version, *args):
+            """Search after filter changes in live search mode, once input has been quiet for a moment"""
+            if not auto_search_enabled:
+                yield gr.update(), gr.update(), gr.update(), gr.update()
+                return
+
+            # Later changes (or a search) of the session supersede this one while it waits
+            session_key = request.session_hash if request else None
+            superseded = picker.begin_search(session_key)
+            await asyncio.sleep(picker.auto_search_delay)
+            if superseded.is_set():
+                yield gr.update(), gr.update(), gr.update(), gr.update()
+                return
+
+            async for update in initial_search(request, language, version, *args):
+                yield update
+
+        def cancel_previous_search(request: gr.Request):
+            picker.cancel_search(request.session_hash if request else None)
         
         search_inputs = [
             language_selector, 
@@ -1404,26 +594,65 @@ def create_armor_picker_interface():
             resistance_inputs + \
             list(selector_armor_class) + \
             list(selector_armor_subclass) + \
-            list(selector_armor_categories_block)
+            list(selector_armor_categories_block) + \
+            [extra_modifiers, pinned_items, banned_items]
 
         
         
+        # Cancel the session's running search right away, then start the new one streaming results
         search_btn.click(
+            fn=cancel_previous_search,
+            inputs=None,
+            outputs=None,
+            trigger_mode="multiple",
+            concurrency_limit=None,
+            show_progress="hidden",
+        ).then(
             fn=initial_search,
             inputs=search_inputs,
-            outputs=[individual_results, combination_results, sort_by_state, sort_order_state]
+            outputs=[individual_results, combination_results, sort_by_state, sort_order_state],
+            # The picker's search executor limits how many searches run at once
+            concurrency_limit=None,
+        )
+        
+        # In live search mode filter changes search again, debounced with the newest change winning.
+        # Pinned and banned items change which combinations exist, so they search again the same way.
+        # Waiting events beyond what the search threads accept queue in Gradio instead of failing
+        gr.on(
+            triggers=[auto_search.change, version_selector.change, selector_tech_level.change, pinned_items.change, banned_items.change] + [
+                component.change
+                for component in resistance_inputs + list(selector_armor_class) + list(selector_armor_subclass) + list(selector_armor_categories_block)
+            ],
+            fn=live_search,
+            inputs=[auto_search] + search_inputs,
+            outputs=[individual_results, combination_results, sort_by_state, sort_order_state],
+            trigger_mode="multiple",
+            concurrency_limit=picker.search_concurrency + picker.search_queue_depth,
+            show_progress="minimal",
+        )
+
+        # Perk and modifier changes only rank the last search again
+        gr.on(
+            triggers=[invincible_perk.change, hardened_talent.change, hardened_talent_lvl.change, extra_modifiers.submit, extra_modifiers.blur],
+            fn=rescore_search,
+            inputs=search_inputs,
+            outputs=[combination_results],
+            concurrency_limit=None,
+            api_name="rescore_armors",
         )
         
         # Sort trigger handler - now uses actual Gradio component values
-        sort_inputs = [js_data_input, language_selector, version_selector] + resistance_inputs
+        sort_inputs = [js_data_input] + search_inputs
         
         # Sort trigger handler
         sort_trigger_btn.click(
-            fn=handle_sort_with_js_params,
+            fn=sort_search,
             inputs=sort_inputs,  # Use actual Gradio components
             outputs=[individual_results, sort_by_state, sort_order_state],
+            concurrency_limit=None,
+            api_name="handle_sort_with_js_params",
             js="""
-            function(dummy_input, language, version, ...resistance_args) {
+            function(dummy_input, language, version, ...search_args) {
                 // Only send sort parameters from JavaScript, everything else comes from Gradio
                 const data = {
                     sortColumn: window.currentSortColumn || 'name',
@@ -1433,23 +662,78 @@ def create_armor_picker_interface():
                 console.log('Sending sort data:', data);
                 console.log('Language from Gradio:', language);
                 console.log('Version from Gradio:', version);
-                console.log('Resistance args count:', resistance_args.length);
+                console.log('Search args count:', search_args.length);
                 
-                return [JSON.stringify(data), language, version, ...resistance_args];
+                return [JSON.stringify(data), language, version, ...search_args];
             }
             """
         )
     
     return interface
 
-demo = create_armor_picker_interface()
+def configure_logging():
+    """Log to armorpicker.log and the console, done when the app is launched rather than imported"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.FileHandler("armorpicker.log"), logging.StreamHandler()]
+    )
+
+def warm_up(picker: ArmorPicker, queries_path: str = None):
+    """Load every catalog of the picker and run the preset searches of a batch_search.py query file, then mark it ready"""
+    from batch_search import read_queries, validate_query, warm_up_query
+
+    try:
+        picker.warm_up()
+        if queries_path:
+            # Preset searches only speed up the first requests, so a bad file or query is logged and skipped
+            try:
+                queries = list(read_queries(queries_path))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipped the warm-up queries of {queries_path}: {e}")
+                queries = []
+            for query_index, query in enumerate(queries):
+                try:
+                    validate_query(picker, query)
+                    warm_up_query(picker, query)
+                except ValueError as e:
+                    logger.warning(f"Skipped warm-up query {query_index}: {e}")
+                except Exception:
+                    logger.exception(f"Warm-up query {query_index} failed")
+    finally:
+        # A failed warm-up must not keep /api/ready failing for good
+        picker.ready.set()
+    logger.info("Warm-up done, ready for traffic")
+
+def __getattr__(name):
+    # Build the UI on first access of app.demo only, so importing app stays cheap
+    if name == "demo":
+        global demo
+        demo = create_armor_picker_interface()
+        return demo
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Launch the application
 if __name__ == "__main__":
-    demo.launch(
-        server_name="0.0.0.0",
-        server_port=7860,
-        share=False,
-        debug=True,
-    )
+    import uvicorn
+    from api import create_api
+
+    configure_logging()
+    # The UI and the JSON API share one picker, so data, matrices, workers and caches exist once
+    picker = ArmorPicker()
+
+    # "blocking" warms up before serving, "background" serves at once with /api/ready failing until done
+    warm_up_mode = os.environ.get("ARMORPICKER_WARM_UP", "blocking")
+    warm_up_queries = os.environ.get("ARMORPICKER_WARM_UP_QUERIES")
+    if warm_up_mode == "blocking":
+        warm_up(picker, warm_up_queries)
+    elif warm_up_mode == "background":
+        threading.Thread(target=warm_up, args=(picker, warm_up_queries), name="warm-up", daemon=True).start()
+    else:
+        picker.ready.set()
+
+    demo = create_armor_picker_interface(picker)
+    # The JSON routes are registered first so they take precedence over the UI mounted at /
+    app = gr.mount_gradio_app(create_api(picker), demo, path="/")
+    uvicorn.run(app, host="0.0.0.0", port=7860)
 
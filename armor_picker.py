@@ -0,0 +1,1423 @@
+"""Armor search and scoring without any UI, importable by scripts and worker processes"""
+import hashlib
+import json
+from typing import Dict, List, Any, Tuple
+from collections import OrderedDict
+from itertools import product
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import resource_tracker, shared_memory
+import multiprocessing
+import atexit
+import math
+from languages import translations
+from armor_records import load_armor_records
+from result_cache import ResultCache
+from combination_search import (
+    RESISTANCE_TYPES, resulting_resistance, build_modifiers, compile_modifiers, apply_modifiers,
+    combination_base_index, combination_positions, rank_combination_sums, search_combination_block,
+    search_combination_block_profiles, search_shared_combination_block, warm_up_search_worker,
+)
+import os
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Version and language used when a caller does not pass one
+DEFAULT_VERSION = "0.9.2"
+DEFAULT_LANGUAGE = "English"
+
+class SearchQueueFull(RuntimeError):
+    """Raised when a search is submitted while every search slot and queue place is taken"""
+
+class ArmorPicker:
+    def __init__(self):
+        self.resistance_types = list(RESISTANCE_TYPES)
+        self.versions = ["0.9", "0.9.2"]
+        self.ready = threading.Event()  # Set once warm_up (and any preset searches) are done
+        self._armor_data_files = {}  # file path -> parsed armor data, kept so row lists stay valid
+        self._armor_data_lock = threading.Lock()
+        self._armor_rows = {}        # (version, language) -> armors of the language in matrix row order
+
+        # Color gradient configuration
+        self.color_stops = [
+            (0.0, "#F8696B"),   # Red at 0%
+            (0.3, "#FED280"),   # Orange at 30%
+            (0.6, "#C0D980"),   # Yellow at 60%
+            (1.0, "#63BE7B")    # Green at 100%
+        ]
+
+        # Language configuration
+        self.base_languages = {
+            "English": {"code": "english", "file": "armor_data_english.json"},
+            "Русский": {"code": "russian", "file": "armor_data_russian.json"},
+            "Deutsch": {"code": "german", "file": "armor_data_german.json"},
+            "Français": {"code": "french", "file": "armor_data_frenсh.json"},
+            "Español": {"code": "spanish", "file": "armor_data_spanish.json"},
+            "Polski": {"code": "polish", "file": "armor_data_polish.json"},
+            "Türkçe": {"code": "turkish", "file": "armor_data_turkish.json"},
+            "Português Brasileiro": {"code": "brazilian", "file": "armor_data_brazilianportugal.json"},
+            "한국어": {"code": "korean", "file": "armor_data_korean.json"},
+            "日本": {"code": "japanese", "file": "armor_data_japanese.json"},
+            "中国人": {"code": "chinese", "file": "armor_data_chinesesimp.json"}
+        }
+        
+        self.translations = translations
+
+        # Tech Levels
+        self.tech_levels = [1,2,3,4,5,6,7,8,9,10]
+        self.armor_categories_block = ['Common Civillian', 'Common Civillian Managment']
+        self.armor_class =  ['Cloth', 'HeavyArmor', 'LightArmor', 'MediumArmor', 'PowerArmor']
+        self.armor_subclass =  ['Default', 'Quasi']
+
+        # Combination search settings
+        self.max_combinations_per_type = 15
+        self.search_chunk_size = 5000      # Max combinations per block between progress/cancel checks
+        self.search_time_budget = 30.0     # Seconds before a search stops with the best sets found so far
+        self.search_update_interval = 0.5  # Seconds between partial results
+        self.auto_search_delay = 0.6       # Seconds without further changes before a live search starts
+        self._search_tokens = {}
+        self._search_tokens_lock = threading.Lock()
+
+        # Search backend: "inline" scores in the calling thread, "process" spreads blocks over a worker pool
+        self.search_backend = os.environ.get("ARMORPICKER_SEARCH_BACKEND", "inline")
+        self.search_workers = int(os.environ.get("ARMORPICKER_SEARCH_WORKERS", 0)) or os.cpu_count() or 1
+        self._search_pool = None
+        self._resistance_matrices = {}  # version -> {"rows": {Id: row}, "values": array}
+        self._shared_matrices = {}      # version -> SharedMemory holding the version's values
+        self._matrix_lock = threading.Lock()
+
+        # Searches run on a bounded thread pool so UI events of other sessions are not held up:
+        # at most search_concurrency run at once and search_queue_depth more may wait
+        self.search_concurrency = int(os.environ.get("ARMORPICKER_SEARCH_CONCURRENCY", 2))
+        self.search_queue_depth = int(os.environ.get("ARMORPICKER_SEARCH_QUEUE_DEPTH", 8))
+        self._search_executor = None
+        self._search_slots = threading.BoundedSemaphore(self.search_concurrency + self.search_queue_depth)
+
+        # Summed scores of recent searches, so perk changes only rank them again
+        self.score_cache_size = 8
+        self.score_cache_max_combinations = 1_000_000
+        self._score_cache = OrderedDict()  # (version, slot rows, requirements) -> [(base index, sums)]
+        self._score_cache_lock = threading.Lock()
+
+        # Last armor filter result of each session, narrowed when filters only tighten
+        self.filter_cache_size = 256
+        self._filter_cache = OrderedDict()  # session key -> (version, filters, rows by type)
+        self._filter_cache_lock = threading.Lock()
+
+        # Finished searches kept on disk across restarts, off unless a file is configured
+        result_cache_path = os.environ.get("ARMORPICKER_RESULT_CACHE")
+        self.result_cache = ResultCache(result_cache_path, int(os.environ.get("ARMORPICKER_RESULT_CACHE_SIZE", 1000))) if result_cache_path else None
+
+        # Start workers now so the first search does not pay for it (not from inside a worker)
+        if self.search_backend == "process" and multiprocessing.parent_process() is None:
+            self.get_search_pool()
+
+        # Load default language data
+        self.get_armor_data(DEFAULT_VERSION, DEFAULT_LANGUAGE)
+    
+    def get_version_languages(self, version: str) -> Dict:
+        """Get language configuration for specific version"""
+        version_languages = {}
+        for lang_name, lang_config in self.base_languages.items():
+            version_languages[lang_name] = {
+                "code": lang_config["code"],
+                "file": f"versions/{version}/{lang_config['file']}"
+            }
+        return version_languages
+    
+    def get_data_language(self, version: str, language: str) -> str:
+        """Get the language armor data of a version is shown in: language if it has a data file, else English"""
+        version_languages = self.get_version_languages(version)
+        if language in version_languages and os.path.exists(version_languages[language]["file"]):
+            return language
+        return "English"
+
+    def get_armor_data(self, version: str = None, language: str = None) -> Dict:
+        """Get the armor data of a version and language, DEFAULT_VERSION and DEFAULT_LANGUAGE by default.
+
+        Files are loaded once and never changed afterwards, so searches of any version and
+        language can read them at the same time.
+        """
+        version = version or DEFAULT_VERSION
+        language = self.get_data_language(version, language or DEFAULT_LANGUAGE)
+        file_path = self.get_version_languages(version)[language]["file"]
+        with self._armor_data_lock:
+            if file_path not in self._armor_data_files:
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        self._armor_data_files[file_path] = load_armor_records(json.load(f))
+                except FileNotFoundError:
+                    return {"armors": {"data": []}}
+            return self._armor_data_files[file_path]
+    
+    def warm_up(self):
+        """Load the armor data of every version and language and build their matrices and row lists.
+
+        Only fills the per-version caches, so it can run while the picker serves searches.
+        """
+        started = time.monotonic()
+        for version in self.versions:
+            for language in self.get_version_languages(version):
+                self.get_armor_rows(version, language)
+            if self.search_backend == "process":
+                self.get_shared_matrix(version)
+        logger.info(f"Loaded {len(self.versions)} versions in {len(self.base_languages)} languages in {time.monotonic() - started:.2f}s")
+
+    def get_translation(self, key: str, language: str = None) -> str:
+        """Get translation for a language, DEFAULT_LANGUAGE by default"""
+        language = language or DEFAULT_LANGUAGE
+        if (self.translations[language]):
+            if self.translations[language].get(key):
+                return self.translations[language].get(key)
+            else:
+                return self.translations["English"].get(key, key)
+
+        # return self.translations.get(language, self.translations["English"]).get(key, key)
+    
+    def get_armor_types(self, version: str = None, language: str = None) -> List[str]:
+        """Get unique armor types from the data"""
+        armor_types = set()
+        for armor in self.get_armor_data(version, language).get("armors", {}).get("data", []):
+            armor_types.add(armor.Type)
+        return sorted(list(armor_types))
+    
+    def filter_armors(self, resistance_filters: Dict[str, Dict], selector_tech_level, armor_class, armor_subclass, armor_categories_block, session_key: str = None, version: str = None, language: str = None) -> Dict[str, List[int]]:
+        """Filter armors of a version (DEFAULT_VERSION by default) based on resistance requirements, returning matrix rows grouped by type.
+
+        The last result of each session is kept: filters that only tighten it (higher tech
+        level, fewer classes or subclasses, more blocked categories) narrow that result
+        instead of going through every armor again.
+        """
+        version = version or DEFAULT_VERSION
+        filters = (selector_tech_level or 0, list(armor_class or []), list(armor_subclass or []), list(armor_categories_block or []))
+        if session_key is None:
+            return self.filter_all_armors(resistance_filters, selector_tech_level, armor_class, armor_subclass, armor_categories_block, version, language)
+
+        with self._filter_cache_lock:
+            cached = self._filter_cache.get(session_key)
+        if cached is not None and cached[0] == version and self.filters_narrow(cached[1], filters):
+            armor_rows = self.get_armor_rows(version, language)
+            filtered_armors_by_type = {}
+            for armor_type, rows in cached[2].items():
+                rows = [row for row in rows if self.armor_meets_filters(armor_rows[row], selector_tech_level, armor_class, armor_subclass, armor_categories_block)]
+                if rows:
+                    filtered_armors_by_type[armor_type] = rows
+        else:
+            filtered_armors_by_type = self.filter_all_armors(resistance_filters, selector_tech_level, armor_class, armor_subclass, armor_categories_block, version, language)
+
+        with self._filter_cache_lock:
+            self._filter_cache[session_key] = (version, filters, filtered_armors_by_type)
+            self._filter_cache.move_to_end(session_key)
+            while len(self._filter_cache) > self.filter_cache_size:
+                self._filter_cache.popitem(last=False)
+        return filtered_armors_by_type
+
+    @staticmethod
+    def filters_narrow(previous: Tuple, filters: Tuple) -> bool:
+        """Check whether (tech level, classes, subclasses, blocked categories) filters only keep armors the previous ones kept"""
+        previous_tech_level, previous_classes, previous_subclasses, previous_blocked = previous
+        tech_level, classes, subclasses, blocked = filters
+        # An empty class or subclass list lets everything through
+        return (tech_level >= previous_tech_level
+                and (not previous_classes or (classes and set(classes) <= set(previous_classes)))
+                and (not previous_subclasses or (subclasses and set(subclasses) <= set(previous_subclasses)))
+                and set(previous_blocked) <= set(blocked))
+
+    def filter_all_armors(self, resistance_filters: Dict[str, Dict], selector_tech_level, armor_class, armor_subclass, armor_categories_block, version: str = None, language: str = None) -> Dict[str, List[int]]:
+        """Filter every armor of a version (DEFAULT_VERSION by default), returning matrix rows grouped by type"""
+        version = version or DEFAULT_VERSION
+        
+        # Get all filtered armors grouped by type
+        filtered_armors_by_type = {}
+        matrix_rows = self.get_resistance_matrix(version)["rows"]
+        
+        # Dynamically get all armor categories from the data
+        for category_name, category_content in self.get_armor_data(version, language).items():
+
+            # Skip if this isn't a category with armor data
+            if not isinstance(category_content, dict) or "data" not in category_content:
+                continue
+                
+            # Get category data for boots, leggings, armor, helmets
+            category_data = category_content.get("data", [])
+            
+            for armor in category_data:
+                meets_requirements = self.armor_meets_filters(armor, selector_tech_level, armor_class, armor_subclass, armor_categories_block)
+                if not meets_requirements:
+                    continue
+
+                # Check each resistance requirement
+                for resist_type, filter_config in resistance_filters.items():
+                    if not filter_config["enabled"]:
+                        continue
+                    
+                    required_value = filter_config["value"]
+                    
+                    # Skip if required_value is None or empty
+                    if required_value is None:
+                        continue
+                    
+                    # Convert to int if it's a string, default to 0 if conversion fails
+                    try:
+                        required_value = int(required_value)
+                    except (ValueError, TypeError):
+                        required_value = 0
+                    
+                    armor_resist_value = armor.get_resist(resist_type)
+                    
+                    # Check if armor meets minimum requirement
+                    # Armor score here and required value is a resulting resist, disabling for now as we need to evaluate first.
+                    # if armor_resist_value < required_value:
+                    #     meets_requirements = False
+                    #     break
+                
+                if meets_requirements:
+                    armor_type = armor.Type
+                    if armor_type not in filtered_armors_by_type:
+                        filtered_armors_by_type[armor_type] = []
+                    # Rows are shared by all languages, names are looked up when rendering
+                    filtered_armors_by_type[armor_type].append(matrix_rows[armor.Id])
+        
+        return filtered_armors_by_type
+    
+    def armor_meets_filters(self, armor, selector_tech_level, armor_class, armor_subclass, armor_categories_block) -> bool:
+        """Check an armor against the sidebar filters, logging why it is skipped"""
+        if not (armor.ArmorClass):
+            logger.warning(f"Armor {armor.Name} has no ArmorClass")
+        
+        if not (armor.TechLevel):
+            logger.warning(f"Armor {armor.Name} has no TechLevel")
+
+        if not (armor.Categories):
+            logger.warning(f"Armor {armor.Name} has no Category")
+
+        if not (armor.ArmorSubClass):
+            logger.warning(f"Armor {armor.Name} has no ArmorSubClass")
+
+        if (armor_categories_block and armor.Categories and armor.Categories in armor_categories_block):
+            logger.warning(f"{armor.Categories} skipped as in {armor_categories_block}")
+            return False
+
+        if (selector_tech_level and armor.TechLevel):
+            if (armor.TechLevel < selector_tech_level):
+                logger.warning(f"{armor.TechLevel} skipped as below {selector_tech_level}")
+                return False
+
+        # We excluded some armor classes in filter
+        if (armor_class and armor.ArmorClass and armor.ArmorClass not in armor_class):
+            logger.warning(f"{armor.ArmorClass} skipped as not {armor_class}")
+            return False
+
+        # Some items have None subclass so we treat them as default
+        if (armor_subclass and armor.ArmorSubClass and armor.ArmorSubClass not in armor_subclass):
+            logger.warning(f"{armor.ArmorSubClass} skipped as not {armor_subclass}")
+            return False
+
+        return True
+
+    def sort_armors(self, armors: List[Dict], sort_by: str, sort_order: str) -> List[Dict]:
+        """Sort armors by specified column and order"""
+        if not armors or not sort_by:
+            return armors
+        
+        def get_sort_value(armor, column):
+            """Get the value to sort by for a given column"""
+            if column == "name":
+                return armor.Name.lower()
+            elif column == "type":
+                return armor.Type.lower()
+            elif column == "durability":
+                return armor.MaxDurability
+            elif column == "weight":
+                return armor.Weight
+            elif column in self.resistance_types:
+                return armor.get_resist(column)
+            else:
+                return ""
+        
+        # Sort the armors
+        reverse = (sort_order == "desc")
+        try:
+            sorted_armors = sorted(armors, key=lambda x: get_sort_value(x, sort_by), reverse=reverse)
+            return sorted_armors
+        except Exception:
+            # If sorting fails, return original list
+            return armors
+
+    def get_item_choices(self, version: str = None, language: str = None) -> List[Tuple[str, str]]:
+        """Get (label, Id) choices of all armors of a version and language for the locked and banned item selectors"""
+        choices = []
+        for category_content in self.get_armor_data(version, language).values():
+            if not isinstance(category_content, dict) or "data" not in category_content:
+                continue
+            for armor in category_content.get("data", []):
+                # Some names are shared by several items, the Id tells them apart
+                choices.append((f"{armor.Name} ({armor.Id})", armor.Id))
+        return sorted(choices, key=lambda choice: choice[0].lower())
+
+    def get_row_mask(self, armor_ids: List[str], version: str = None) -> int:
+        """Get a bitmask of the resistance matrix rows of armor Ids, ignoring unknown Ids"""
+        rows = self.get_resistance_matrix(version)["rows"]
+        mask = 0
+        for armor_id in armor_ids or []:
+            if armor_id in rows:
+                mask |= 1 << rows[armor_id]
+        return mask
+
+    def constrain_armors(self, armor_by_type: Dict[str, List[int]], pinned_ids: List[str] = None, banned_ids: List[str] = None, version: str = None, language: str = None) -> Dict[str, List[int]]:
+        """Apply locked and banned items to armor rows grouped by type.
+
+        A slot with locked items collapses to those items, even ones the filters excluded. Banned
+        items are removed from the other slots and slots left empty are dropped.
+        """
+        if not pinned_ids and not banned_ids:
+            return armor_by_type
+
+        pinned_mask = self.get_row_mask(pinned_ids, version)
+        banned_mask = self.get_row_mask(banned_ids, version) & ~pinned_mask
+
+        pinned_by_type = {}
+        armor_rows = self.get_armor_rows(version, language)
+        for row in range(pinned_mask.bit_length()):
+            if pinned_mask >> row & 1:
+                pinned_by_type.setdefault(armor_rows[row].Type, []).append(row)
+
+        constrained = {}
+        for armor_type in list(armor_by_type) + [armor_type for armor_type in pinned_by_type if armor_type not in armor_by_type]:
+            if armor_type in pinned_by_type:
+                rows = pinned_by_type[armor_type]
+            else:
+                rows = [row for row in armor_by_type[armor_type] if not banned_mask >> row & 1]
+            if rows:
+                constrained[armor_type] = rows
+        return constrained
+
+    def get_enabled_requirements(self, resistance_filters: Dict[str, Dict]) -> Dict[str, int]:
+        """Get resistance requirements that are enabled and above zero"""
+        enabled_requirements = {}
+        for resist_type, filter_config in resistance_filters.items():
+            if filter_config["value"] == None: # If NoneType as we have nothing in the input
+                filter_config["value"] = 0
+            if filter_config["enabled"] and filter_config["value"] > 0:
+                enabled_requirements[resist_type] = filter_config["value"]
+        return enabled_requirements
+
+    def limit_armors_per_type(self, armor_by_type: Dict[str, List[int]], enabled_requirements: Dict[str, int], version: str = None) -> Dict[str, List[int]]:
+        """Keep only the best armor rows of each type for enabled requirements to limit combinations"""
+        values = self.get_resistance_matrix(version)["values"]
+        width = len(RESISTANCE_TYPES)
+        columns = [RESISTANCE_TYPES.index(resist_type) for resist_type in enabled_requirements]
+        limited_armor_by_type = {}
+        for armor_type, rows in armor_by_type.items():
+            # Sort by total resistance for enabled requirements
+            sorted_rows = sorted(rows, key=lambda row: sum(values[row * width + column] for column in columns), reverse=True)
+            limited_armor_by_type[armor_type] = sorted_rows[:self.max_combinations_per_type]
+        return limited_armor_by_type
+
+    def begin_search(self, session_key: str = None) -> threading.Event:
+        """Cancel the running search of a session and return a cancel token for the new one"""
+        cancel_event = threading.Event()
+        with self._search_tokens_lock:
+            previous = self._search_tokens.get(session_key)
+            if previous is not None:
+                previous.set()
+            self._search_tokens[session_key] = cancel_event
+        return cancel_event
+
+    def cancel_search(self, session_key: str = None):
+        """Cancel the running search of a session, if any"""
+        with self._search_tokens_lock:
+            cancel_event = self._search_tokens.pop(session_key, None)
+        if cancel_event is not None:
+            cancel_event.set()
+
+    def end_search(self, session_key: str, cancel_event: threading.Event):
+        """Forget the cancel token of a finished search"""
+        with self._search_tokens_lock:
+            if self._search_tokens.get(session_key) is cancel_event:
+                del self._search_tokens[session_key]
+
+    def get_search_pool(self) -> ProcessPoolExecutor:
+        """Get the search worker pool, starting all workers on first use"""
+        if self._search_pool is None:
+            # Workers must share our resource tracker, or they report attached matrices as leaked on exit
+            resource_tracker.ensure_running()
+            self._search_pool = ProcessPoolExecutor(max_workers=self.search_workers)
+            # Workers are spawned on demand, so keep them busy until every one has started
+            wait([self._search_pool.submit(warm_up_search_worker) for _ in range(self.search_workers)])
+            atexit.register(self.close)
+            logger.info(f"Started {self.search_workers} search worker processes")
+        return self._search_pool
+
+    def submit_search(self, function, *args) -> Future:
+        """Run function(*args) on the search thread pool.
+
+        Raises SearchQueueFull instead of queueing more than search_queue_depth searches
+        behind the search_concurrency running ones.
+        """
+        if not self._search_slots.acquire(blocking=False):
+            raise SearchQueueFull(f"{self.search_concurrency} searches running and {self.search_queue_depth} waiting")
+        if self._search_executor is None:
+            self._search_executor = ThreadPoolExecutor(max_workers=self.search_concurrency, thread_name_prefix="armor-search")
+        try:
+            future = self._search_executor.submit(function, *args)
+        except RuntimeError:
+            self._search_slots.release()
+            raise
+        future.add_done_callback(lambda _: self._search_slots.release())
+        return future
+
+    def close(self):
+        """Stop search threads and workers, release shared resistance matrices and close the result cache"""
+        if self.result_cache is not None:
+            self.result_cache.close()
+            self.result_cache = None
+        if self._search_executor is not None:
+            self._search_executor.shutdown(cancel_futures=True)
+            self._search_executor = None
+        if self._search_pool is not None:
+            self._search_pool.shutdown(cancel_futures=True)
+            self._search_pool = None
+        with self._matrix_lock:
+            for shared in self._shared_matrices.values():
+                shared.close()
+                shared.unlink()
+            self._shared_matrices.clear()
+
+    def get_resistance_matrix(self, version: str = None) -> Dict:
+        """Get the flat resistance matrix of a version: one row of resistance_types values per armor Id.
+
+        Ids and resistances are the same in every language, so the matrix and its Id -> row index
+        are built once per version and shared by all languages.
+        """
+        version = version or DEFAULT_VERSION
+        with self._matrix_lock:
+            matrix = self._resistance_matrices.get(version)
+            if matrix is None:
+                rows = {}
+                values = array('i')
+                for category_content in self.get_armor_data(version, "English").values():
+                    if not isinstance(category_content, dict) or "data" not in category_content:
+                        continue
+                    for armor in category_content.get("data", []):
+                        rows[armor.Id] = len(rows)
+                        values.extend(armor.resists)
+                # Content hash of the matrix, so cached results are dropped when the catalog changes
+                catalog_hash = hashlib.sha256("\t".join(rows).encode("utf-8") + values.tobytes()).hexdigest()
+                matrix = self._resistance_matrices[version] = {"rows": rows, "values": values, "hash": catalog_hash}
+            return matrix
+
+    def get_armor_rows(self, version: str = None, language: str = None) -> List[Dict]:
+        """Get the armors of a version and language (the defaults if not given), indexed by matrix row"""
+        version = version or DEFAULT_VERSION
+        language = self.get_data_language(version, language or DEFAULT_LANGUAGE)
+        key = (version, language)
+        with self._matrix_lock:
+            armor_rows = self._armor_rows.get(key)
+        if armor_rows is None:
+            matrix_rows = self.get_resistance_matrix(version)["rows"]
+            armor_rows = [None] * len(matrix_rows)
+            for category_content in self.get_armor_data(version, language).values():
+                if not isinstance(category_content, dict) or "data" not in category_content:
+                    continue
+                for armor in category_content.get("data", []):
+                    armor_rows[matrix_rows[armor.Id]] = armor
+            with self._matrix_lock:
+                self._armor_rows[key] = armor_rows
+        return armor_rows
+
+    def get_shared_matrix(self, version: str = None) -> shared_memory.SharedMemory:
+        """Publish the resistance matrix of a version in shared memory for worker processes"""
+        version = version or DEFAULT_VERSION
+        values = self.get_resistance_matrix(version)["values"]
+        with self._matrix_lock:
+            shared = self._shared_matrices.get(version)
+            if shared is None:
+                size = len(values) * values.itemsize
+                shared = shared_memory.SharedMemory(create=True, size=max(size, 1))
+                shared.buf[:size] = values.tobytes()
+                self._shared_matrices[version] = shared
+            return shared
+
+    def get_result_cache_key(self, slot_rows: List[List[int]], requirements: Dict[str, int], modifiers: List[Dict], version: str = None) -> str:
+        """Key a search by all its result depends on: the slots' armor Ids, requirements, compiled modifiers and catalog"""
+        matrix = self.get_resistance_matrix(version)
+        # Matrix rows are numbered in Id order
+        row_ids = list(matrix["rows"])
+        normalized = {
+            "catalog": matrix["hash"],
+            "slots": [[row_ids[row] for row in rows] for rows in slot_rows],
+            "requirements": list(requirements.items()),
+            "modifiers": compile_modifiers(modifiers, list(requirements)),
+        }
+        return hashlib.sha256(json.dumps(normalized).encode("utf-8")).hexdigest()
+
+    def get_combination_prefixes(self, slot_sizes: List[int], min_blocks: int = 1) -> List[Tuple[int, ...]]:
+        """Split the combination product into blocks by fixing the first slots.
+
+        Uses as few fixed slots as possible while giving at least min_blocks blocks of at most
+        search_chunk_size combinations each.
+        """
+        depth = 0
+        while depth < len(slot_sizes) and (math.prod(slot_sizes[:depth]) < min_blocks or math.prod(slot_sizes[depth:]) > self.search_chunk_size):
+            depth += 1
+        return list(product(*(range(size) for size in slot_sizes[:depth])))
+
+    def iter_combination_blocks(self, slot_rows: List[List[int]], block_args: Tuple, version: str = None):
+        """Search combination blocks with the configured backend.
+
+        Yields (base index, (good, best, checked, sums)) per finished block, or None while
+        waiting on worker processes so callers can check time and cancellation. Closing the
+        generator cancels blocks that have not started.
+        """
+        slot_sizes = [len(rows) for rows in slot_rows]
+        if self.search_backend != "process":
+            matrix = self.get_resistance_matrix(version)["values"]
+            for prefix in self.get_combination_prefixes(slot_sizes):
+                yield combination_base_index(slot_sizes, prefix), search_combination_block(matrix, slot_rows, prefix, *block_args)
+            return
+
+        pool = self.get_search_pool()
+        shared = self.get_shared_matrix(version)
+        matrix_size = len(self.get_resistance_matrix(version)["values"])
+        prefixes = iter(self.get_combination_prefixes(slot_sizes, min_blocks=self.search_workers * 4))
+        pending = {}
+        try:
+            while True:
+                # Keep every worker busy without queueing the whole search up front
+                for prefix in prefixes:
+                    future = pool.submit(search_shared_combination_block, shared.name, matrix_size, slot_rows, prefix, *block_args)
+                    pending[future] = combination_base_index(slot_sizes, prefix)
+                    if len(pending) >= self.search_workers * 2:
+                        break
+                if not pending:
+                    return
+                done, _ = wait(pending, timeout=self.search_update_interval, return_when=FIRST_COMPLETED)
+                if not done:
+                    yield None
+                for future in done:
+                    yield pending.pop(future), future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def iter_cached_combination_blocks(self, cached_blocks: List[Tuple[int, array]], requirements: Dict[str, int], modifiers: List[Dict]):
+        """Rank cached combination sums again with other modifiers, like iter_combination_blocks"""
+        required_values = list(requirements.values())
+        scales, offsets = compile_modifiers(modifiers, list(requirements))
+        for base_index, sums in cached_blocks:
+            good, best, checked = rank_combination_sums(sums, required_values, base_index, scales, offsets)
+            yield base_index, (good, best, checked, None)
+
+    def find_armor_combinations(self, filtered_armors, resistance_filters: Dict[str, Dict], language: str = None, invincible_perk: bool = False, hardened_talent: bool = False, hardened_talent_lvl: int = 1, modifiers: List[Dict] = None, pinned_ids: List[str] = None, banned_ids: List[str] = None, version: str = None) -> str:
+        """Find armor combinations that meet resistance requirements"""
+        html = f"<p>{self.get_translation('no_combinations_found', language)}</p>"
+        for html in self.iter_armor_combinations(filtered_armors, resistance_filters, language, invincible_perk, hardened_talent, hardened_talent_lvl, update_interval=None, modifiers=modifiers, pinned_ids=pinned_ids, banned_ids=banned_ids, version=version):
+            pass
+        return html
+
+    def find_best_combinations(self, filtered_armors, resistance_filters: Dict[str, Dict], language: str = None, invincible_perk: bool = False, hardened_talent: bool = False, hardened_talent_lvl: int = 1, modifiers: List[Dict] = None, pinned_ids: List[str] = None, banned_ids: List[str] = None, version: str = None) -> List[Dict]:
+        """Find the best armor combinations as {'armors', 'score'} dicts instead of HTML"""
+        combinations = []
+        for _, combinations, _, _ in self.iter_combination_results(filtered_armors, resistance_filters, language, invincible_perk, hardened_talent, hardened_talent_lvl, modifiers=modifiers, pinned_ids=pinned_ids, banned_ids=banned_ids, version=version):
+            pass
+        return combinations
+
+    def find_best_combinations_batch(self, filtered_armors, requirement_profiles: List[Dict[str, int]], language: str = None, invincible_perk: bool = False, hardened_talent: bool = False, hardened_talent_lvl: int = 1, modifiers: List[Dict] = None, pinned_ids: List[str] = None, banned_ids: List[str] = None, version: str = None) -> List[List[Dict]]:
+        """Find the best armor combinations of many requirement profiles sharing the other settings.
+
+        requirement_profiles are {resist type: required value} dicts. Locked items and modifiers
+        are prepared once, and profiles requiring the same resistance types share their slots,
+        summed scores and resistance percentages, so each group is scored in a single pass
+        (see combination_search.rank_combination_sums_profiles). Profiles searched before are
+        served from the result and score caches, and new ones are stored there, as in
+        iter_combination_results. Returns the best sets of each profile, as
+        find_best_combinations would.
+        """
+        all_modifiers = build_modifiers(invincible_perk, hardened_talent, hardened_talent_lvl, modifiers)
+        filtered_armors = self.constrain_armors(filtered_armors, pinned_ids, banned_ids, version, language)
+        matrix = self.get_resistance_matrix(version)["values"]
+        armor_rows = self.get_armor_rows(version, language)
+
+        # Group profiles by required types, in resistance_types order like the UI's filters
+        groups = {}
+        for profile_index, profile in enumerate(requirement_profiles):
+            requirements = {resist_type: profile[resist_type] for resist_type in self.resistance_types if (profile.get(resist_type) or 0) > 0}
+            if requirements:
+                groups.setdefault(tuple(requirements), []).append((profile_index, requirements))
+
+        results = [[] for _ in requirement_profiles]
+        for resist_types, members in groups.items():
+            slot_rows = list(self.limit_armors_per_type(filtered_armors, members[0][1], version).values())
+            if len(slot_rows) <= 1:
+                continue
+            slot_sizes = [len(rows) for rows in slot_rows]
+            total_combinations = math.prod(slot_sizes)
+
+            # Profiles searched before are served from the result or score caches, as in iter_combination_results
+            ranked = {}
+            pending = []
+            for profile_index, requirements in members:
+                result_key = self.get_result_cache_key(slot_rows, requirements, all_modifiers, version) if self.result_cache is not None else None
+                stored = self.result_cache.get(result_key) if result_key is not None else None
+                if stored is not None:
+                    ranked[profile_index] = ([tuple(sort_key) for sort_key in stored["good"]], [tuple(sort_key) for sort_key in stored["best"]])
+                    continue
+
+                cache_key = (version, tuple(map(tuple, slot_rows)), tuple(requirements.items()))
+                with self._score_cache_lock:
+                    cached_blocks = self._score_cache.get(cache_key)
+                    if cached_blocks is not None:
+                        self._score_cache.move_to_end(cache_key)
+                if cached_blocks is None:
+                    pending.append((profile_index, requirements, result_key, cache_key))
+                    continue
+
+                good, best, checked = [], [], 0
+                for _, (good_block, best_block, block_checked, _) in self.iter_cached_combination_blocks(cached_blocks, requirements, all_modifiers):
+                    good = sorted(good + good_block)[:100]
+                    best = sorted(best + best_block)[:20]
+                    checked += block_checked
+                ranked[profile_index] = (good, best)
+                if result_key is not None:
+                    self.result_cache.put(result_key, {"good": good, "best": best, "checked": checked})
+
+            if pending:
+                # The remaining profiles are scored together; their summed scores are the same, so each caches them
+                profiles = [list(requirements.values()) for _, requirements, _, _ in pending]
+                keep_sums = total_combinations <= self.score_cache_max_combinations
+                pending_ranked = [([], [], 0) for _ in pending]
+                new_blocks = [] if keep_sums else None
+                for prefix in self.get_combination_prefixes(slot_sizes):
+                    block, block_sums = search_combination_block_profiles(matrix, slot_rows, prefix, resist_types, profiles, all_modifiers, keep_sums)
+                    pending_ranked = [
+                        (sorted(good + good_block)[:100], sorted(best + best_block)[:20], checked + block_checked)
+                        for (good, best, checked), (good_block, best_block, block_checked) in zip(pending_ranked, block)
+                    ]
+                    if new_blocks is not None:
+                        new_blocks.append((combination_base_index(slot_sizes, prefix), block_sums))
+
+                for (profile_index, _, result_key, cache_key), (good, best, checked) in zip(pending, pending_ranked):
+                    ranked[profile_index] = (good, best)
+                    if new_blocks is not None:
+                        with self._score_cache_lock:
+                            self._score_cache[cache_key] = new_blocks
+                            while len(self._score_cache) > self.score_cache_size:
+                                self._score_cache.popitem(last=False)
+                    if result_key is not None:
+                        self.result_cache.put(result_key, {"good": good, "best": best, "checked": checked})
+
+            for profile_index, requirements in members:
+                good, best = ranked[profile_index]
+                combinations = []
+                for sort_key in good or best:
+                    positions = combination_positions(slot_sizes, sort_key[-1])
+                    combination = tuple(armor_rows[rows[position]] for rows, position in zip(slot_rows, positions))
+                    combinations.append({'armors': combination, 'score': self.evaluate_combination(combination, requirements, modifiers=all_modifiers)})
+                results[profile_index] = combinations
+        return results
+
+    def iter_armor_combinations(self, filtered_armors, resistance_filters: Dict[str, Dict], language: str = None, invincible_perk: bool = False, hardened_talent: bool = False, hardened_talent_lvl: int = 1, time_budget: float = None, cancel_event: threading.Event = None, update_interval: float = None, cached_only: bool = False, modifiers: List[Dict] = None, pinned_ids: List[str] = None, banned_ids: List[str] = None, version: str = None):
+        """Find armor combinations, yielding the best sets found so far as HTML at intervals (see iter_combination_results)"""
+        for status, combinations, checked, total_combinations in self.iter_combination_results(
+            filtered_armors, resistance_filters, language, invincible_perk, hardened_talent, hardened_talent_lvl,
+            time_budget, cancel_event, update_interval, cached_only, modifiers, pinned_ids, banned_ids, version,
+        ):
+            if status == "no_requirements":
+                yield f"<p>{self.get_translation('no_requirements_set', language)}</p>"
+                continue
+
+            progress_html = ""
+            if status == "time_budget":
+                progress_html = f"<p>{self.get_translation('search_time_budget_exceeded', language).format(checked, total_combinations)}</p>"
+            elif status == "progress":
+                progress_html = f"<p>{self.get_translation('search_in_progress', language).format(checked, total_combinations)}</p>"
+
+            if combinations:
+                yield progress_html + self.create_combinations_table_html(combinations, self.get_enabled_requirements(resistance_filters), language)
+            elif progress_html:
+                yield progress_html
+            else:
+                # This should rarely happen, but handle the edge case
+                yield f"<p>{self.get_translation('no_combinations_found', language)}</p>"
+
+    def iter_combination_results(self, filtered_armors, resistance_filters: Dict[str, Dict], language: str = None, invincible_perk: bool = False, hardened_talent: bool = False, hardened_talent_lvl: int = 1, time_budget: float = None, cancel_event: threading.Event = None, update_interval: float = None, cached_only: bool = False, modifiers: List[Dict] = None, pinned_ids: List[str] = None, banned_ids: List[str] = None, version: str = None):
+        """Find armor combinations of a version and language (the defaults if not given), yielding (status, combinations, checked, total) as the search goes.
+
+        combinations are the best sets so far as {'armors', 'score'} dicts: those meeting the
+        threshold, or else the overall best ones. status is "progress" every update_interval
+        seconds, then "done" (or "time_budget"); "no_requirements" when nothing is required.
+        modifiers are applied after the perks (see combination_search.build_modifiers). Slots
+        with pinned_ids only use those items and banned_ids are left out (see constrain_armors). The
+        search stops early when time_budget seconds have passed (showing the best sets found
+        so far) or when cancel_event is set (yielding nothing more). Summed scores of recent
+        searches are cached, so a search differing only in perks or modifiers just ranks them
+        again; with cached_only nothing is yielded unless that is possible.
+        """
+        version = version or DEFAULT_VERSION
+
+        # Get enabled resistance requirements
+        enabled_requirements = self.get_enabled_requirements(resistance_filters)
+
+        if not enabled_requirements:
+            if not cached_only:
+                yield "no_requirements", [], 0, 0
+            return
+
+        all_modifiers = build_modifiers(invincible_perk, hardened_talent, hardened_talent_lvl, modifiers)
+
+        # Locked slots collapse to their items before limiting, so the other slots keep their best picks
+        filtered_armors = self.constrain_armors(filtered_armors, pinned_ids, banned_ids, version, language)
+
+        # Limit combinations to prevent performance issues
+        limited_armor_by_type = self.limit_armors_per_type(filtered_armors, enabled_requirements, version)
+        slot_rows = list(limited_armor_by_type.values())
+        slot_sizes = [len(rows) for rows in slot_rows]
+        armor_rows = self.get_armor_rows(version, language)
+
+        # Best combinations so far as sort keys ending with the set's index in product order:
+        # those meeting the threshold and the overall best ones as fallback
+        good_combinations = []
+        best_combinations = []
+        evaluated = {}
+
+        def to_combination(sort_key):
+            index = sort_key[-1]
+            if index not in evaluated:
+                positions = combination_positions(slot_sizes, index)
+                combination = tuple(armor_rows[rows[position]] for rows, position in zip(slot_rows, positions))
+                evaluated[index] = {
+                    'armors': combination,
+                    'score': self.evaluate_combination(combination, enabled_requirements, modifiers=all_modifiers)
+                }
+            return evaluated[index]
+
+        def final_combinations():
+            # Use combinations that meet the threshold, else the best match(es)
+            return [to_combination(sort_key) for sort_key in good_combinations or best_combinations]
+
+        total_combinations = math.prod(slot_sizes) if len(slot_rows) > 1 else 0
+        checked = 0
+
+        # Searches finished before, even by an earlier run of the app, are served from disk
+        result_key = self.get_result_cache_key(slot_rows, enabled_requirements, all_modifiers, version) if self.result_cache is not None and len(slot_rows) > 1 else None
+        if result_key is not None:
+            stored = self.result_cache.get(result_key)
+            if stored is not None:
+                good_combinations = [tuple(sort_key) for sort_key in stored["good"]]
+                best_combinations = [tuple(sort_key) for sort_key in stored["best"]]
+                yield "done", final_combinations(), stored["checked"], total_combinations
+                return
+
+        if len(slot_rows) > 1:
+
+            # Summed scores do not depend on modifiers, so a cached search only needs ranking again
+            cache_key = (version, tuple(map(tuple, slot_rows)), tuple(enabled_requirements.items()))
+            with self._score_cache_lock:
+                cached_blocks = self._score_cache.get(cache_key)
+                if cached_blocks is not None:
+                    self._score_cache.move_to_end(cache_key)
+
+            if cached_blocks is not None:
+                blocks = self.iter_cached_combination_blocks(cached_blocks, enabled_requirements, all_modifiers)
+                new_blocks = None
+            elif cached_only:
+                return
+            else:
+                keep_sums = total_combinations <= self.score_cache_max_combinations
+                blocks = self.iter_combination_blocks(slot_rows, (enabled_requirements, all_modifiers, keep_sums), version)
+                new_blocks = [] if keep_sums else None
+
+            started = time.monotonic()
+            last_update = started
+
+            try:
+                for block in blocks:
+                    if block is not None:
+                        # Sort combinations by quality (best matches first), product order breaks ties
+                        # Lower dispersion (more balanced) is better, then higher coverage, then lower variance
+                        base_index, (good_block, best_block, block_checked, block_sums) = block
+                        good_combinations = sorted(good_combinations + good_block)[:100]
+                        best_combinations = sorted(best_combinations + best_block)[:20]
+                        checked += block_checked
+                        if new_blocks is not None:
+                            new_blocks.append((base_index, block_sums))
+
+                    if cancel_event is not None and cancel_event.is_set():
+                        logger.info(f"Combination search cancelled after {checked}/{total_combinations} combinations")
+                        return
+
+                    now = time.monotonic()
+                    if time_budget is not None and now - started >= time_budget and checked < total_combinations:
+                        logger.info(f"Combination search stopped by time budget after {checked}/{total_combinations} combinations")
+                        yield "time_budget", final_combinations(), checked, total_combinations
+                        return
+
+                    if update_interval is not None and now - last_update >= update_interval and checked < total_combinations:
+                        last_update = now
+                        yield "progress", final_combinations(), checked, total_combinations
+            finally:
+                blocks.close()
+
+            # Only complete searches are cached
+            if new_blocks is not None:
+                new_blocks.sort(key=lambda block: block[0])
+                with self._score_cache_lock:
+                    self._score_cache[cache_key] = new_blocks
+                    while len(self._score_cache) > self.score_cache_size:
+                        self._score_cache.popitem(last=False)
+        elif cached_only:
+            return
+
+        if result_key is not None:
+            self.result_cache.put(result_key, {"good": good_combinations, "best": best_combinations, "checked": checked})
+
+        yield "done", final_combinations(), checked, total_combinations
+
+    def calculate_armor_score_from_resistance(resulting_resistance):
+        if resulting_resistance >= 1:
+            return None  # Avoid log of non-positive number
+        numerator = math.log(1 - resulting_resistance)
+        denominator = -0.035 * math.log(1.75)
+        armor_score = numerator / denominator
+        return armor_score
+
+    def calculate_resulting_resistance(self, total_armor_score: int) -> float:
+        """Calculate resulting resistance percentage using the formula"""
+        return resulting_resistance(total_armor_score)
+        
+    def evaluate_combination(self, armor_combination, requirements: Dict[str, int], invincible_perk: bool = False, hardened_talent: bool = False, hardened_talent_lvl: int = 1, modifiers: List[Dict] = None) -> Dict:
+        """Evaluate how well an armor combination meets requirements using resistance formula"""
+        # Calculate total armor score for each resistance type
+        total_armor_scores = {
+            resist_type: sum(armor.resists[column] for armor in armor_combination)
+            for column, resist_type in enumerate(RESISTANCE_TYPES)
+        }
+        
+        # Apply perks (Invincible: +12, Hardened: +10% per level) and extra modifiers to the total combined resistance scores
+        resist_types = list(total_armor_scores)
+        modifiers = build_modifiers(invincible_perk, hardened_talent, hardened_talent_lvl, modifiers)
+        totals = apply_modifiers([total_armor_scores[resist_type] for resist_type in resist_types], *compile_modifiers(modifiers, resist_types))
+        total_armor_scores = dict(zip(resist_types, totals))
+        
+        # Calculate resulting resistance percentages and coverage
+        resulting_resistances = {}
+        coverages = []
+        enabled_resistance_percentages = []  # For dispersion calculation
+        
+        for resist_type, required_percentage in requirements.items():
+            total_score = total_armor_scores.get(resist_type, 0)
+            resulting_resistance = self.calculate_resulting_resistance(total_score)
+            resulting_percentage = resulting_resistance * 100  # Convert to percentage
+            
+            resulting_resistances[resist_type] = {
+                'score': total_score,
+                'percentage': resulting_percentage
+            }
+            
+            # Store for dispersion calculation
+            enabled_resistance_percentages.append(resulting_percentage)
+            
+            # Calculate coverage (how well we meet the requirement)
+            # Required percentage should be treated as the target resistance percentage
+            required_decimal = required_percentage / 100.0 if required_percentage > 1 else required_percentage
+            coverage = min(resulting_resistance / required_decimal, 1.0) if required_decimal > 0 else 1.0
+            coverages.append(coverage)
+        
+        # Calculate dispersion (standard deviation of resistance percentages)
+        # Lower dispersion = more balanced protection, Higher dispersion = uneven protection
+        dispersion = 0.0
+        
+        # Only calculate dispersion if we have more than one resistance type enabled
+        if len(enabled_resistance_percentages) > 1:
+            mean_percentage = sum(enabled_resistance_percentages) / len(enabled_resistance_percentages)
+            variance = sum((percentage - mean_percentage) ** 2 for percentage in enabled_resistance_percentages) / (len(enabled_resistance_percentages)-1)
+            dispersion = variance ** 0.5  # Standard deviation
+        
+        # Calculate metrics
+        avg_coverage = sum(coverages) / len(coverages) if coverages else 0
+        variance = sum((c - avg_coverage) ** 2 for c in coverages) / len(coverages) if coverages else 0
+        meets_threshold = avg_coverage >= 0.9  # At least 90% of requirements met
+        
+        return {
+            'avg_coverage': avg_coverage,
+            'variance': variance,
+            'meets_threshold': meets_threshold,
+            'total_armor_scores': total_armor_scores,  # Keep for backward compatibility
+            'resulting_resistances': resulting_resistances,  # New: actual resistance percentages
+            'coverages': coverages,
+            'dispersion': dispersion,  # New: resistance flatness measure
+            'mean_resistance': sum(enabled_resistance_percentages) / len(enabled_resistance_percentages) if enabled_resistance_percentages else 0
+        }
+
+    def create_combinations_table_html(self, combinations: List[Dict], requirements: Dict[str, int], language: str = None) -> str:
+        """Create HTML table for armor combinations with CSS custom properties"""
+        
+        html = f"""
+        <style>
+        .combo-table {{
+            border-collapse: collapse !important;
+            width: 100% !important;
+            font-size: 16px !important;
+            margin-bottom: 20px !important;
+        }}
+        .combo-table th, .combo-table td {{
+            border: 1px solid #000 !important;
+            padding: 8px !important;
+            background-color: #333 !important;
+        }}
+        .combo-table th {{
+            background-color: #555 !important;
+            font-weight: bold !important;
+        }}
+        .combo-summary {{
+            font-weight: bold !important;
+            background-color: #2a2a2a !important;
+        }}
+        .combo-summary .combo-name {{
+            text-align: right !important;
+        }}
+        .combo-detail {{
+            padding-left: 20px !important;
+            font-style: bold !important;
+        }}
+        .combo-score-summary {{
+            font-weight: bold !important;
+            background-color: #444 !important;
+            font-style: italic !important;
+        }}
+        .combo-separator {{
+            background-color: transparent !important;
+            border: 1px solid transparent !important;
+        }}
+        .combo-separator td {{
+            background-color: transparent !important;
+            border: transparent !important;
+            padding: 8px !important;
+            height: 16px !important;
+        }}
+        .dispersion-cell {{
+            font-weight: bold !important;
+            text-align: left !important;
+            color: #000 !important;
+        }}
+        .summary-resist-cell {{
+            font-weight: bold !important;
+            text-align: left !important;
+            color: #000 !important;
+        }}
+        .armor-resist-cell {{
+            text-align: right !important;
+            background-color: #333 !important;
+            color: #fff !important;
+        }}
+        .result-resist-cell {{
+            font-weight: bold !important;
+            text-align: left !important;
+            background-color: #444 !important;
+        }}
+        .mean-cell {{
+            font-weight: bold !important;
+            text-align: left !important;
+            background-color: #444 !important;
+            color: #fff !important;
+            font-style: italic !important;
+        }}
+        
+        .dispersion-colored {{
+            color: var(--dispersion-color) !important;
+        }}
+        .diff-colored {{
+            color: var(--diff-color) !important;
+        }}
+        .percent-white {{
+            color: #fff !important;
+        }}
+        </style>
+        """
+        
+        html += f"<h3>{self.get_translation('armor_combinations', language)}</h3>"
+        html += f"<p>{self.get_translation('combinations_explanation', language)}</p>"
+        
+        html += '<table class="combo-table"><thead><tr>'
+        html += f'<th>{self.get_translation("item", language)}</th>'
+        html += f'<th>{self.get_translation("type", language)}</th>'
+        html += f'<th>{self.get_translation("dispersion", language)}</th>'
+        
+        # Add columns for each required resistance
+        for resist_type in requirements.keys():
+            html += f'<th>{self.get_translation(resist_type, language)}</th>'
+        
+        html += '</tr></thead><tbody>'
+        
+        # Add separator row after header
+        html += '<tr class="combo-separator">'
+        html += f'<td colspan="{3 + len(requirements)}">&nbsp;</td>'
+        html += '</tr>'
+        
+        # Get dispersion range for color calculation
+        all_dispersions = [combo['score']['dispersion'] for combo in combinations]
+        min_dispersion = min(all_dispersions) if all_dispersions else 0
+        max_dispersion = max(all_dispersions) if all_dispersions else 0
+        
+        for i, combo in enumerate(combinations, 1):
+            # Add separator row between combinations (except before the first one)
+            if i > 1:
+                html += '<tr class="combo-separator">'
+                html += f'<td colspan="{3 + len(requirements)}">&nbsp;</td>'
+                html += '</tr>'
+            
+            # Summary row - combination name with raw scores
+            html += '<tr class="combo-summary">'
+            
+            # Combination name (right-aligned)
+            combo_name = f"Combination {i}"
+            html += f'<td class="combo-name"><strong>{combo_name}</strong></td>'
+            html += f'<td><strong>Total</strong></td>'
+            
+            # Dispersion with gradient color (lower dispersion = better = greener)
+            dispersion = combo['score']['dispersion']
+            # Invert the color mapping: lower dispersion should be green (better)
+            inverted_dispersion = max_dispersion - dispersion if max_dispersion > min_dispersion else 0
+            dispersion_color = self.value_to_color(inverted_dispersion, 0, max_dispersion - min_dispersion)
+            html += f'<td class="dispersion-cell" style="background-color: {dispersion_color} !important;">{dispersion:.2f}</td>'
+            
+            max_value = max(combo['score']['resulting_resistances'][key]['score'] for key in combo['score']['resulting_resistances'])
+            min_value = min(combo['score']['resulting_resistances'][key]['score'] for key in combo['score']['resulting_resistances'])
+
+            # Show just the raw scores
+            for resist_type in requirements.keys():
+                resistance_info = combo['score']['resulting_resistances'].get(resist_type, {'score': 0, 'percentage': 0})
+                total_score = resistance_info['score']
+                diff_color = self.value_to_color(total_score, min_value, max_value)
+                
+                html += f'<td class="summary-resist-cell" style="background-color: {diff_color} !important;">{total_score:.0f}</td>'
+            
+            html += '</tr>'
+            
+            # Detail rows - one for each armor piece
+            for armor in combo['armors']:
+                html += '<tr class="combo-detail">'
+                
+                # Armor name (indented under combination name)
+                armor_name = armor.Name
+                html += f'<td class="combo-detail">{armor_name}</td>'
+                
+                # Armor type
+                armor_type = armor.Type
+                html += f'<td class="combo-detail">{armor_type}</td>'
+                
+                # Empty dispersion cell for detail rows
+                html += '<td></td>'
+                
+                # Individual armor resistance values
+                for resist_type in requirements.keys():
+                    value = armor.get_resist(resist_type)
+                    
+                    html += f'<td class="armor-resist-cell">{value:.0f}</td>'
+                
+                html += '</tr>'
+            
+            # Resulting Resistance row - shows percentages with brackets and mean percentage
+            html += '<tr class="combo-score-summary">'
+            html += f'<td class="combo-detail" style="font-style: italic;">Resulting Resistance</td>'
+            html += f'<td class="combo-detail" style="font-style: italic;">Percentages</td>'
+            
+            # Show mean percentage in the dispersion column
+            mean_resistance = combo['score']['mean_resistance']
+            html += f'<td class="mean-cell">Mean: {mean_resistance:.2f}%</td>'
+            
+            # Show percentage with difference in brackets
+            for resist_type in requirements.keys():
+                resistance_info = combo['score']['resulting_resistances'].get(resist_type, {'score': 0, 'percentage': 0})
+                resulting_percentage = resistance_info['percentage']
+                required_percentage = requirements[resist_type]
+                
+                # Calculate difference in percentage points
+                difference = resulting_percentage - required_percentage
+                
+                # Get gradient colors
+                diff_color = self.get_difference_color(difference, required_percentage)
+                
+                # Format difference text
+                if difference > 0:
+                    diff_text = f"(+{difference:.1f}%)"
+                elif difference < 0:
+                    diff_text = f"({difference:.1f}%)"
+                else:
+                    diff_text = "(0%)"
+                
+                html += f'''<td class="result-resist-cell" style="--diff-color: {diff_color};">
+                            <span class="percent-white">{resulting_percentage:.1f}%</span> 
+                            <span class="diff-colored">{diff_text}</span>
+                            </td>'''
+            
+            html += '</tr>'
+        
+        html += '</tbody></table>'
+        return html
+
+    def get_difference_color(self, difference: int, required: int) -> str:
+        """Get color for difference value based on gradient using existing color system"""
+        if required == 0:
+            return "#fff"  # White for zero requirement
+        
+        # Normalize difference as percentage of requirement
+        # -1.0 = completely missing requirement, 0 = exact match, +1.0 = double requirement
+        normalized_diff = difference / required
+        
+        # Clamp to reasonable range for color calculation
+        normalized_diff = max(-1.0, min(1.0, normalized_diff))
+        
+        # Map to 0-1 range for color gradient
+        # -1.0 -> 0.0 (red), 0.0 -> 0.5 (yellow), +1.0 -> 1.0 (green)
+        color_position = (normalized_diff + 1.0) / 2.0
+        
+        # Use the existing color system from the class
+        return self.value_to_color_from_position(color_position)
+
+    def get_coverage_color(self, coverage_pct: float) -> str:
+        """Get color for coverage percentage using existing color system"""
+        # Map coverage percentage (0-100) to color position (0-1)
+        color_position = coverage_pct / 100.0
+        return self.value_to_color_from_position(color_position)
+
+    def value_to_color_from_position(self, position: float) -> str:
+        """Convert a normalized position (0-1) to color using existing gradient system"""
+        # Clamp position to 0-1 range
+        position = max(0.0, min(1.0, position))
+        
+        def hex_to_rgb(hex_color: str) -> tuple:
+            hex_color = hex_color.lstrip('#')
+            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        
+        def rgb_to_hex(r: int, g: int, b: int) -> str:
+            return f"#{r:02x}{g:02x}{b:02x}"
+        
+        # Find the two color stops to interpolate between
+        for i in range(len(self.color_stops) - 1):
+            pos1, color1 = self.color_stops[i]
+            pos2, color2 = self.color_stops[i + 1]
+            
+            if pos1 <= position <= pos2:
+                # Interpolate between these two colors
+                local_normalized = (position - pos1) / (pos2 - pos1)
+                
+                rgb1 = hex_to_rgb(color1)
+                rgb2 = hex_to_rgb(color2)
+                
+                red = int(rgb1[0] + (rgb2[0] - rgb1[0]) * local_normalized)
+                green = int(rgb1[1] + (rgb2[1] - rgb1[1]) * local_normalized)
+                blue = int(rgb1[2] + (rgb2[2] - rgb1[2]) * local_normalized)
+                
+                return rgb_to_hex(red, green, blue)
+        
+        # Fallback to last color if position >= 1
+        return self.color_stops[-1][1]
+
+        
+    def get_top_armors_per_type(self, filtered_armors: Dict[str, List[int]], max_per_type: int = 4, version: str = None, language: str = None) -> List[Dict]:
+        """Get top armors from each armor type"""
+        values = self.get_resistance_matrix(version)["values"]
+        width = len(RESISTANCE_TYPES)
+        armor_rows = self.get_armor_rows(version, language)
+        
+        # Get top items from each type (sorted by total resistance)
+        result = []
+        for armor_type, rows in filtered_armors.items():
+            # Sort by total resistance value (descending)
+            sorted_rows = sorted(rows, key=lambda row: sum(values[row * width:(row + 1) * width]), reverse=True)
+            
+            # Take top N items from this type
+            result.extend(armor_rows[row] for row in sorted_rows[:max_per_type])
+        
+        return result
+    
+    def get_resistance_range(self, armors: List[Dict]) -> Dict[str, Tuple[int, int]]:
+        """Get min/max values for each resistance type to calculate gradients"""
+        ranges = {}
+        
+        for resist_type in self.resistance_types:
+            values = []
+            for armor in armors:
+                values.append(armor.get_resist(resist_type))
+            
+            if values:
+                ranges[resist_type] = (min(values), max(values))
+            else:
+                ranges[resist_type] = (0, 0)
+        
+        return ranges
+    
+    def value_to_color(self, value: int, min_val: int, max_val: int, color_stops: list = None) -> str:
+        """Convert resistance value to color gradient with multiple color stops"""
+        if max_val == min_val:
+            return "#3D3D3D"  # Black for single value
+        
+        # Default color stops: Red → Yellow → Green
+        if self.color_stops is None:
+            self.color_stops = [
+                (0.0, "#FF0000"),   # Red at 0%
+                (0.5, "#FFFF00"),   # Yellow at 50%
+                (1.0, "#00FF00")    # Green at 100%
+            ]
+        
+        def hex_to_rgb(hex_color: str) -> tuple:
+            hex_color = hex_color.lstrip('#')
+            return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        
+        def rgb_to_hex(r: int, g: int, b: int) -> str:
+            return f"#{r:02x}{g:02x}{b:02x}"
+        
+        # Normalize value between 0 and 1
+        normalized = (value - min_val) / (max_val - min_val)
+        
+        # Find the two color stops to interpolate between
+        for i in range(len(self.color_stops) - 1):
+            pos1, color1 = self.color_stops[i]
+            pos2, color2 = self.color_stops[i + 1]
+            
+            if pos1 <= normalized <= pos2:
+                # Interpolate between these two colors
+                local_normalized = (normalized - pos1) / (pos2 - pos1)
+                
+                rgb1 = hex_to_rgb(color1)
+                rgb2 = hex_to_rgb(color2)
+                
+                red = int(rgb1[0] + (rgb2[0] - rgb1[0]) * local_normalized)
+                green = int(rgb1[1] + (rgb2[1] - rgb1[1]) * local_normalized)
+                blue = int(rgb1[2] + (rgb2[2] - rgb1[2]) * local_normalized)
+                
+                return rgb_to_hex(red, green, blue)
+        
+        # Fallback to last color if normalized > 1
+        return color_stops[-1][1]
+    
+    def create_styled_table_html(self, armors: List[Dict], sort_by: str = "name", sort_order: str = "asc", language: str = None) -> str:
+        """Create HTML table with color gradients and sortable headers"""
+        if not armors:
+            return f"<p>{self.get_translation('no_armors', language)}</p>"
+        
+        # Get resistance ranges for color calculation
+        resist_ranges = self.get_resistance_range(armors)
+        
+        # Define sortable columns and their display names
+        sortable_columns = {
+            "name": self.get_translation('name', language),
+            "type": self.get_translation('type', language),
+            "durability": self.get_translation('durability', language),
+            "weight": self.get_translation('weight', language),
+            "blunt": self.get_translation('blunt', language),
+            "pierce": self.get_translation('pierce', language),
+            "lacer": self.get_translation('lacer', language),
+            "fire": self.get_translation('fire', language),
+            "cold": self.get_translation('cold', language),
+            "poison": self.get_translation('poison', language),
+            "shock": self.get_translation('shock', language),
+            "beam": self.get_translation('beam', language)
+        }
+        
+        def create_header(column_key, display_name):
+            """Create a sortable header cell"""
+            if column_key == sort_by:
+                # Currently sorted column
+                if sort_order == "asc":
+                    next_order = "desc"
+                    arrow = " ↑"
+                else:
+                    next_order = "asc"
+                    arrow = " ↓"
+            else:
+                # Not currently sorted
+                next_order = "asc"
+                arrow = ""
+            
+            return f'''<th class="sortable-header" data-column="{column_key}" data-next-order="{next_order}" style="cursor: pointer; user-select: none;">{display_name}{arrow}</th>'''
+        
+        # Start HTML table
+        html = f"""
+        <style>
+        .armor-table {{
+            border-collapse: collapse !important;
+            width: 100% !important;
+            font-family: 'Roboto', Arial, sans-serif !important;
+            font-size: 16px !important;
+        }}
+        .armor-table th, .armor-table td {{
+            border: 1px solid #000 !important; /* Force black border */
+            padding: 8px !important;
+            text-align: left !important; /* Dynamic text alignment */
+            background-color: #333 !important; /* Dark grey background */
+            color: #fff !important; /* White text for readability */
+        }}
+        .armor-table th {{
+            background-color: #555 !important; /* Slightly darker grey for header */
+            font-weight: bold !important;
+        }}
+        .armor-table th.sortable-header:hover {{
+            background-color: #666 !important;
+        }}
+        .armor-table tr:nth-child(even) td {{
+            background-color: #444 !important; /* Alternate row color */
+        }}
+        .armor-table .resist-cell {{
+            font-weight: bold !important;
+            color: #000 !important; /* Force black text for resistance cells */
+            text-shadow: none !important; /* Remove text shadow for better readability */
+            text-align: center !important; /* Keep resistance cells centered for better readability */
+        }}
+        /* Override Gradio's default table styling */
+        .gradio-container .prose table.armor-table,
+        .gradio-container .prose table.armor-table tr,
+        .gradio-container .prose table.armor-table td,
+        .gradio-container .prose table.armor-table th {{
+            border: 1px solid #000 !important;
+            text-align: left !important;
+        }}
+        .gradio-container .prose table.armor-table .resist-cell {{
+            color: #000 !important;
+            text-align: center !important; /* Keep resistance cells centered */
+        }}
+        </style>
+        <table class="armor-table">
+        <thead>
+        <tr>
+        """
+        
+        # Add headers with translations and sorting functionality
+        html += create_header("name", sortable_columns["name"])
+        html += create_header("type", sortable_columns["type"])
+        html += f"<th>{self.get_translation('description', language)}</th>"  # Description not sortable
+        html += create_header("durability", sortable_columns["durability"])
+        html += create_header("weight", sortable_columns["weight"])
+        
+        # Add resistance headers
+        for resist_type in self.resistance_types:
+            html += create_header(resist_type, sortable_columns[resist_type])
+        
+        html += "</tr></thead><tbody>"
+        
+        # Add armor rows
+        for armor in armors:
+            html += "<tr>"
+            html += f"<td><strong>{armor.Name}</strong></td>"
+            html += f"<td>{armor.Type}</td>"
+            html += f"<td>{armor.Description}</td>"
+            html += f"<td>{armor.MaxDurability}</td>"
+            html += f"<td>{armor.Weight:g}</td>"
+            
+            # Add resistance values with colors
+            for resist_type in self.resistance_types:
+                value = armor.get_resist(resist_type)
+                min_val, max_val = resist_ranges[resist_type]
+                color = self.value_to_color(value, min_val, max_val)
+                html += f'<td class="resist-cell" style="background-color: {color} !important; color: #000 !important;">{value}</td>'
+            
+            html += "</tr>"
+        
+        html += "</tbody></table>"
+        
+        return html
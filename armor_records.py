@@ -0,0 +1,43 @@
+"""Compact armor records built from the exported armor data JSON files"""
+import sys
+from array import array
+from typing import Dict
+
+from combination_search import RESISTANCE_TYPES
+
+class ArmorRecord:
+    """One armor of one language with typed numbers and resistances in RESISTANCE_TYPES order"""
+    __slots__ = ("Id", "Name", "Description", "Type", "Categories", "TechLevel", "ArmorClass", "ArmorSubClass", "MaxDurability", "Weight", "resists")
+
+    def __init__(self, armor: Dict):
+        # Categorical strings repeat across items and languages, so they are interned
+        self.Id = sys.intern(armor["Id"])
+        self.Name = armor.get("Name") or ""
+        self.Description = armor.get("Description") or ""
+        self.Type = sys.intern(armor.get("Type") or "Unknown")
+        self.Categories = sys.intern(armor["Categories"]) if armor.get("Categories") else None
+        self.ArmorClass = sys.intern(armor["ArmorClass"]) if armor.get("ArmorClass") else None
+        self.ArmorSubClass = sys.intern(armor["ArmorSubClass"]) if armor.get("ArmorSubClass") else None
+
+        # Numbers are typed by parser.py; older exports have no TechLevel, 0 means unknown
+        self.TechLevel = armor.get("TechLevel") or 0
+        self.MaxDurability = armor.get("MaxDurability") or 0
+        self.Weight = armor.get("Weight") or 0.0
+
+        resist_values = {resist.get("ResistType"): resist.get("ResistValue", 0) for resist in armor.get("ResistSheet", [])}
+        self.resists = array('i', (resist_values.get(resist_type, 0) for resist_type in RESISTANCE_TYPES))
+
+    def get_resist(self, resist_type: str) -> int:
+        """Get the armor score of one resistance type"""
+        return self.resists[RESISTANCE_TYPES.index(resist_type)]
+
+    def __repr__(self):
+        return f"ArmorRecord({self.Id!r}, {self.Name!r})"
+
+def load_armor_records(armor_data: Dict) -> Dict:
+    """Replace the armor dicts of each category of loaded armor data with ArmorRecords"""
+    for category_content in armor_data.values():
+        if not isinstance(category_content, dict) or "data" not in category_content:
+            continue
+        category_content["data"] = [ArmorRecord(armor) for armor in category_content["data"]]
+    return armor_data
@@ -0,0 +1,237 @@
+"""
+Run many armor searches from a JSON Lines file without the UI.
+
+Each input line is one query, for example:
+    {"id": "q1", "version": "0.9.2", "requirements": {"blunt": 40, "fire": 30}, "armor_class": ["MediumArmor"]}
+
+Each output line holds the best combinations of the query in input order, as armor Ids and
+names with their scores. Queries differing only in requirements are searched together, and
+these groups are spread over a pool of worker processes, each with its own ArmorPicker so
+armor data and resistance matrices are loaded once per worker.
+
+Usage:
+    python batch_search.py queries.jsonl results.jsonl [--workers 4] [--verbose]
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from armor_picker import DEFAULT_LANGUAGE, DEFAULT_VERSION, ArmorPicker
+from combination_search import parse_modifiers
+
+picker = None  # ArmorPicker of this worker process
+
+def init_worker(verbose: bool = False):
+    """Create the ArmorPicker of a worker process"""
+    global picker
+    # Filtering logs a warning per skipped armor, far too much for thousands of queries
+    logging.getLogger("armor_picker").setLevel(logging.INFO if verbose else logging.ERROR)
+    picker = ArmorPicker()
+    # Queries already run in parallel, so each one is scored in its own worker
+    picker.search_backend = "inline"
+
+def get_search_settings(query: Dict) -> str:
+    """Get a key of everything but the requirements of a query, so queries sharing it are searched together"""
+    return json.dumps({key: value for key, value in query.items() if key not in ("id", "requirements")}, sort_keys=True)
+
+def group_queries(queries: List[Dict]) -> List[List[int]]:
+    """Group the indexes of queries differing only in requirements, in order of first appearance"""
+    groups = {}
+    for query_index, query in enumerate(queries):
+        groups.setdefault(get_search_settings(query), []).append(query_index)
+    return list(groups.values())
+
+# Query fields besides id and requirements, with the types they must have
+QUERY_FIELDS = {
+    "version": str,
+    "language": str,
+    "tech_level": int,
+    "armor_class": list,
+    "armor_subclass": list,
+    "blocked_categories": list,
+    "invincible_perk": bool,
+    "hardened_talent": bool,
+    "hardened_talent_lvl": int,
+    "modifiers": str,
+    "pinned_ids": list,
+    "banned_ids": list,
+}
+
+def validate_query(picker: ArmorPicker, query: Dict):
+    """Check the fields of a query, raising ValueError with the first problem found"""
+    if not isinstance(query, dict):
+        raise ValueError("A query must be a JSON object")
+    for field, value in query.items():
+        if field in ("id", "requirements"):
+            continue
+        if field not in QUERY_FIELDS:
+            raise ValueError(f"Unknown query field {field!r}")
+        expected_type = QUERY_FIELDS[field]
+        # bool is an int subclass, but true is no tech level
+        if not isinstance(value, expected_type) or (expected_type is int and isinstance(value, bool)):
+            raise ValueError(f"{field} must be of type {expected_type.__name__}")
+        if expected_type is list and not all(isinstance(item, str) for item in value):
+            raise ValueError(f"{field} must be a list of strings")
+
+    if "version" in query and query["version"] not in picker.versions:
+        raise ValueError(f"Unknown version {query['version']!r}, expected one of {picker.versions}")
+    if "language" in query and query["language"] not in picker.base_languages:
+        raise ValueError(f"Unknown language {query['language']!r}, expected one of {list(picker.base_languages)}")
+
+    requirements = query.get("requirements", {})
+    if not isinstance(requirements, dict):
+        raise ValueError("requirements must be an object of resistance types to required percentages")
+    for resist_type, value in requirements.items():
+        if resist_type not in picker.resistance_types:
+            raise ValueError(f"Unknown resistance type {resist_type!r}, expected one of {picker.resistance_types}")
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"Requirement {resist_type} must be a non-negative integer")
+
+    # Modifiers are only known to be valid once parsed
+    parse_modifiers(query.get("modifiers", ""))
+
+def get_query_catalog(picker: ArmorPicker, query: Dict) -> Tuple[str, str]:
+    """Get the (version, language) a query is searched in"""
+    return query.get("version", DEFAULT_VERSION), query.get("language", DEFAULT_LANGUAGE)
+
+def filter_query_armors(picker: ArmorPicker, query: Dict) -> Dict[str, List[int]]:
+    """Filter armors of the query's version with its settings, as matrix rows by type"""
+    version, language = get_query_catalog(picker, query)
+
+    # Requirements do not take part in filtering
+    resistance_filters = {resist_type: {"enabled": False, "value": 0} for resist_type in picker.resistance_types}
+    return picker.filter_armors(
+        resistance_filters,
+        query.get("tech_level", 1),
+        query.get("armor_class", picker.armor_class),
+        query.get("armor_subclass", picker.armor_subclass),
+        query.get("blocked_categories", []),
+        version=version,
+        language=language,
+    )
+
+def warm_up_query(picker: ArmorPicker, query: Dict):
+    """Search one query the way the UI does, so its summed scores land in the picker's score cache"""
+    requirements = query.get("requirements", {})
+    resistance_filters = {
+        resist_type: {"enabled": resist_type in requirements, "value": requirements.get(resist_type, 0)}
+        for resist_type in picker.resistance_types
+    }
+    version, language = get_query_catalog(picker, query)
+    picker.find_best_combinations(
+        filter_query_armors(picker, query), resistance_filters, language,
+        query.get("invincible_perk", False), query.get("hardened_talent", False), query.get("hardened_talent_lvl", 1),
+        modifiers=parse_modifiers(query.get("modifiers", "")),
+        pinned_ids=query.get("pinned_ids"), banned_ids=query.get("banned_ids"), version=version,
+    )
+
+def search_queries(picker: ArmorPicker, queries: List[Dict]) -> List[Dict]:
+    """Search the best armor combinations of queries sharing their search settings, as JSON-ready dicts.
+
+    Filtering and locked items are handled once and all requirement profiles are scored
+    together (see ArmorPicker.find_best_combinations_batch). Invalid queries get an error
+    instead of combinations (see validate_query).
+    """
+    started = time.perf_counter()
+    errors = {}
+    for query_index, query in enumerate(queries):
+        try:
+            validate_query(picker, query)
+        except ValueError as e:
+            errors[query_index] = str(e)
+    valid_queries = [query for query_index, query in enumerate(queries) if query_index not in errors]
+    if not valid_queries:
+        return [{"id": query.get("id"), "error": errors[query_index]} for query_index, query in enumerate(queries)]
+
+    settings = valid_queries[0]
+    version, language = get_query_catalog(picker, settings)
+    try:
+        filtered_armors = filter_query_armors(picker, settings)
+        all_combinations = picker.find_best_combinations_batch(
+            filtered_armors, [query.get("requirements", {}) for query in valid_queries], language,
+            settings.get("invincible_perk", False), settings.get("hardened_talent", False), settings.get("hardened_talent_lvl", 1),
+            modifiers=parse_modifiers(settings.get("modifiers", "")),
+            pinned_ids=settings.get("pinned_ids"), banned_ids=settings.get("banned_ids"), version=version,
+        )
+    except (ValueError, TypeError, KeyError) as e:
+        return [{"id": query.get("id"), "error": errors.get(query_index, str(e))} for query_index, query in enumerate(queries)]
+
+    elapsed = time.perf_counter() - started
+    results = [
+        {
+            "id": query.get("id"),
+            "combinations": [
+                {
+                    "ids": [armor.Id for armor in combination["armors"]],
+                    "names": [armor.Name for armor in combination["armors"]],
+                    "avg_coverage": combination["score"]["avg_coverage"],
+                    "dispersion": combination["score"]["dispersion"],
+                    "mean_resistance": combination["score"]["mean_resistance"],
+                    "meets_threshold": combination["score"]["meets_threshold"],
+                    "resistances": {
+                        resist_type: resistance["percentage"]
+                        for resist_type, resistance in combination["score"]["resulting_resistances"].items()
+                    },
+                }
+                for combination in combinations
+            ],
+            # Time of the whole group the query was searched with
+            "elapsed": elapsed,
+        }
+        for query, combinations in zip(valid_queries, all_combinations)
+    ]
+    for query_index in sorted(errors):
+        results.insert(query_index, {"id": queries[query_index].get("id"), "error": errors[query_index]})
+    return results
+
+def run_queries(queries: List[Dict]) -> List[Dict]:
+    """Process pool entry point: search_queries with the worker's ArmorPicker"""
+    return search_queries(picker, queries)
+
+def read_queries(path: str):
+    """Yield the queries of a JSON Lines file, skipping blank lines"""
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argument_parser.add_argument("input", help="JSON Lines file with one query per line")
+    argument_parser.add_argument("output", help="JSON Lines file for the results, in input order")
+    argument_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes, 1 runs the queries in this process")
+    argument_parser.add_argument("--verbose", action="store_true", help="Keep the armor filtering log")
+    args = argument_parser.parse_args()
+
+    queries = list(read_queries(args.input))
+    started = time.perf_counter()
+
+    # Queries differing only in requirements share filtering and scoring
+    groups = group_queries(queries)
+    grouped_queries = [[queries[query_index] for query_index in query_indexes] for query_indexes in groups]
+
+    if args.workers <= 1:
+        init_worker(args.verbose)
+        group_results = list(map(run_queries, grouped_queries))
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker, initargs=(args.verbose,)) as pool:
+            group_results = list(pool.map(run_queries, grouped_queries))
+
+    results = [None] * len(queries)
+    for query_indexes, query_results in zip(groups, group_results):
+        for query_index, result in zip(query_indexes, query_results):
+            results[query_index] = result
+    with open(args.output, "w", encoding="utf-8") as file:
+        for result in results:
+            file.write(json.dumps(result, ensure_ascii=False) + "\n")
+
+    elapsed = time.perf_counter() - started
+    rate = len(queries) / elapsed if elapsed > 0 else 0.0
+    print(f"{len(queries)} queries in {elapsed:.2f}s ({rate:.1f} queries/s), results saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
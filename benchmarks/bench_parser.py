@@ -0,0 +1,191 @@
+"""
+Benchmark and profile the parser.py data pipeline on synthetic game files.
+
+Generates config_items.txt and localization.txt files of growing size in a temporary
+directory, times each pipeline stage and writes the timings as JSON together with
+cProfile output of a full export per size.
+
+Usage:
+    python benchmarks/bench_parser.py [--sizes 500 2000 8000] [--repeat 3] [--output-dir bench_results]
+"""
+import argparse
+import contextlib
+import cProfile
+import io
+import json
+import os
+import pstats
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parser as qm_parser
+
+LANGUAGES = ["English", "Russian", "German", "French", "Spanish", "Polish", "Turkish", "BrazilianPortugal", "Korean", "Japanese", "ChineseSimp"]
+RESIST_TYPES = ["blunt", "pierce", "lacer", "fire", "cold", "poison", "shock", "beam"]
+ARMOR_HEADERS = ["Id", "Categories", "TechLevel", "ItemClass", "ArmorClass", "ArmorSubClass", "ResistSheet", "MaxDurability", "Weight", "Price"]
+EXPORT_HEADERS = ['Id', 'Name', 'Description', 'Type', 'Categories', 'TechLevel', 'ItemClass', 'ArmorClass', 'ArmorSubClass', 'ResistSheet', 'MaxDurability', 'Weight']
+
+def generate_files(directory, item_count, languages, seed=0):
+    """
+    Write synthetic config_items.txt and localization.txt files with item_count armors.
+
+    Besides the armors, the files hold non-armor categories and ui rows, as the game files do,
+    so the parser has to skip most of them.
+
+    Returns:
+        tuple: (config_items path, localization path)
+    """
+    rng = random.Random(seed)
+    config_path = os.path.join(directory, "config_items.txt")
+    localization_path = os.path.join(directory, "localization.txt")
+    item_ids = []
+
+    with open(config_path, "w", encoding="utf-8") as file:
+        file.write("#weapons\nId\tDamage\tWeight\n")
+        for i in range(item_count):
+            file.write(f"gun_{i}\t{rng.randint(1, 90)}\t{rng.randint(5, 90) / 10:g}\n")
+        file.write("#end\n\n")
+
+        for category in ["armors", "helmets", "leggings", "boots"]:
+            file.write(f"#{category}\n" + "\t\t".join(ARMOR_HEADERS) + "\n")
+            for i in range(item_count // 4):
+                item_id = f"{category}_{i}"
+                item_ids.append(item_id)
+                values = [
+                    item_id,
+                    rng.choice(["Military", "Common Civillian", "Moon"]),
+                    str(rng.randint(1, 10)),
+                    "Armor",
+                    rng.choice(["Cloth", "HeavyArmor", "LightArmor", "MediumArmor", "PowerArmor"]),
+                    rng.choice(["Default", "Quasi"]),
+                    " ".join(f"{resist_type} {rng.randint(0, 40)}" for resist_type in RESIST_TYPES),
+                    str(rng.randint(40, 220)),
+                    f"{rng.randint(1, 150) / 10:g}",
+                    str(rng.randint(1, 9999)),
+                ]
+                file.write("\t".join(values) + "\n")
+            file.write("#end\n\n")
+
+    with open(localization_path, "w", encoding="utf-8") as file:
+        file.write("\t".join(languages) + "\n")
+        file.write("\t".join(["key"] + languages) + "\n")
+        for resist_type in RESIST_TYPES:
+            file.write(f"ui.damage.{resist_type}\t" + "\t".join(f"{resist_type} ({language})" for language in languages) + "\n")
+        for item_id in item_ids:
+            file.write(f"item.{item_id}.name\t" + "\t".join(f"{item_id} {language}" for language in languages) + "\n")
+            file.write(f"item.{item_id}.shortdesc\t" + "\t".join(f"{item_id} description {language}" for language in languages) + "\n")
+        # Text of the rest of the game
+        for i in range(item_count * 10):
+            file.write(f"ui.text.{i}\t" + "\t".join(f"Some text {i} in {language}" for language in languages) + "\n")
+
+    return config_path, localization_path
+
+def time_call(function, repeat):
+    """
+    Run function repeat times with its output silenced.
+
+    Returns:
+        tuple: (best seconds, result of the last call)
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            result = function()
+            elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def benchmark_size(directory, item_count, languages, repeat):
+    """
+    Time each pipeline stage on synthetic files of one size.
+
+    Returns:
+        dict: Stage name to best seconds, plus the input sizes
+    """
+    config_path, localization_path = generate_files(directory, item_count, languages)
+    output_path = os.path.join(directory, "armor_data_benchmark.json")
+    timings = {
+        "items": item_count,
+        "languages": len(languages),
+        "config_items_bytes": os.path.getsize(config_path),
+        "localization_bytes": os.path.getsize(localization_path),
+    }
+
+    timings["parse_localization_file"], localization = time_call(lambda: qm_parser.parse_localization_file(localization_path), repeat)
+    timings["parse_config_items"], categories = time_call(lambda: qm_parser.parse_config_items(config_path), repeat)
+
+    item_ids = {row["Id"] for category_info in categories.values() for row in category_info["data"]}
+    timings["load_localization"], localization = time_call(lambda: qm_parser.load_localization(localization_path, item_ids, key_prefixes=["ui.damage."]), repeat)
+    qm_parser.add_localization(categories, localization)
+
+    timings["create_language_specific_data"], language_data = time_call(lambda: qm_parser.create_language_specific_data(categories, languages[0]), repeat)
+    timings["create_all_language_data"], all_language_data = time_call(lambda: qm_parser.create_all_language_data(categories, languages, EXPORT_HEADERS, localization), repeat)
+
+    resist_sheets = [row["ResistSheet"] for category_info in categories.values() for row in category_info["data"]]
+    timings["parse_resistance_sheet"], _ = time_call(lambda: [qm_parser.parse_resistance_sheet(resist_sheet) for resist_sheet in resist_sheets], repeat)
+
+    lang_data = all_language_data[languages[0]]
+    timings["save_data_to_json"], _ = time_call(lambda: qm_parser.save_data_to_json(lang_data, output_path), repeat)
+
+    return timings
+
+def profile_export(directory, item_count, languages, profile_path):
+    """
+    Profile a full export (parse, localize, build and write every language) with cProfile.
+
+    Writes the raw profile to profile_path and a text summary next to it.
+    """
+    config_path, localization_path = generate_files(directory, item_count, languages)
+
+    def export():
+        categories = qm_parser.parse_config_items(config_path)
+        item_ids = {row["Id"] for category_info in categories.values() for row in category_info["data"]}
+        localization = qm_parser.load_localization(localization_path, item_ids, key_prefixes=["ui.damage."])
+        qm_parser.add_localization(categories, localization)
+        all_language_data = qm_parser.create_all_language_data(categories, languages, EXPORT_HEADERS, localization)
+        for lang_name, lang_data in all_language_data.items():
+            qm_parser.save_data_to_json(lang_data, os.path.join(directory, f"armor_data_{lang_name.lower()}.json"))
+
+    profiler = cProfile.Profile()
+    with contextlib.redirect_stdout(io.StringIO()):
+        profiler.runcall(export)
+    profiler.dump_stats(profile_path)
+
+    summary = io.StringIO()
+    pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(30)
+    with open(os.path.splitext(profile_path)[0] + ".txt", "w", encoding="utf-8") as file:
+        file.write(summary.getvalue())
+
+def main():
+    argument_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    argument_parser.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 8000], help="Armor counts of the synthetic files")
+    argument_parser.add_argument("--languages", type=int, default=len(LANGUAGES), help="Number of languages in the localization file")
+    argument_parser.add_argument("--repeat", type=int, default=3, help="Runs per stage, the best one is kept")
+    argument_parser.add_argument("--output-dir", default="bench_results", help="Directory for timings.json and profiles")
+    args = argument_parser.parse_args()
+
+    languages = LANGUAGES[:max(1, min(args.languages, len(LANGUAGES)))]
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    results = []
+    for item_count in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            timings = benchmark_size(directory, item_count, languages, args.repeat)
+            profile_export(directory, item_count, languages, os.path.join(args.output_dir, f"export_{item_count}.prof"))
+        results.append(timings)
+        stages = ", ".join(f"{name} {value:.3f}s" for name, value in timings.items() if isinstance(value, float))
+        print(f"{item_count} items: {stages}")
+
+    timings_path = os.path.join(args.output_dir, "timings.json")
+    with open(timings_path, "w", encoding="utf-8") as file:
+        json.dump({"python": sys.version.split()[0], "results": results}, file, indent=2)
+    print(f"Timings saved to {timings_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""Armor set scoring kernel shared by the app and its search worker processes.
+
+Kept free of Gradio and other heavy imports so worker processes start fast and can
+import it while the app module itself is still loading.
+"""
+import math
+import os
+import re
+from array import array
+from itertools import cycle, product
+from operator import le
+from multiprocessing import shared_memory
+
+RESISTANCE_TYPES = ["blunt", "pierce", "lacer", "fire", "cold", "poison", "shock", "beam"]
+
+# Hardened talent level -> resistance multiplier
+HARDENED_TALENT_MULTIPLIERS = {
+    1: 1.1,   # +10%
+    2: 1.2,   # +20%
+    3: 1.3,   # +30%
+    4: 1.4    # +40%
+}
+
+# Resistance modifiers are dicts applied in order to the summed armor values of a set:
+#   {"kind": "flat", "value": 12}                                  adds 12 to every resistance
+#   {"kind": "multiplier", "value": 1.1, "resist_types": ["fire"]} multiplies fire by 1.1
+# Without "resist_types" a modifier applies to all resistances.
+INVINCIBLE_PERK_MODIFIER = {"kind": "flat", "value": 12}
+
+def build_modifiers(invincible_perk: bool = False, hardened_talent: bool = False, hardened_talent_lvl: int = 1, extra_modifiers: list = None) -> list:
+    """Get the modifier list for the perk settings, followed by any extra modifiers"""
+    modifiers = []
+    if invincible_perk:
+        modifiers.append(INVINCIBLE_PERK_MODIFIER)
+    if hardened_talent:
+        modifiers.append({"kind": "multiplier", "value": HARDENED_TALENT_MULTIPLIERS.get(hardened_talent_lvl, 1)})
+    return modifiers + list(extra_modifiers or [])
+
+def parse_modifiers(text: str) -> list:
+    """Parse modifiers such as "+12", "fire +5" or "cold +20%", separated by commas or new lines.
+
+    Raises ValueError for entries that cannot be parsed.
+    """
+    modifiers = []
+    for entry in re.split(r'[,\n]', text or ""):
+        entry = entry.strip().lower()
+        if not entry:
+            continue
+        match = re.fullmatch(r'(?:([a-z]+)\s*)?([+-]?\d+(?:\.\d+)?)\s*(%?)', entry)
+        if (not match or (match.group(1) and match.group(1) not in RESISTANCE_TYPES + ["all"])
+                or (match.group(3) and float(match.group(2)) <= -100)):
+            raise ValueError(f"Invalid modifier: {entry}")
+        resist_type, value, percent = match.groups()
+        modifier = {"kind": "multiplier", "value": 1 + float(value) / 100} if percent else {"kind": "flat", "value": float(value)}
+        if resist_type and resist_type != "all":
+            modifier["resist_types"] = [resist_type]
+        modifiers.append(modifier)
+    return modifiers
+
+def compile_modifiers(modifiers: list, resist_types: list) -> tuple:
+    """Compile modifiers into per-resistance (scales, offsets) so that total = (sum + offset) * scale.
+
+    Offsets are added before scaling so the usual flat bonus then multiplier order (Invincible,
+    then Hardened) gives exactly the same totals as applying the perks one by one.
+    """
+    scales = [1] * len(resist_types)
+    offsets = [0] * len(resist_types)
+    for modifier in modifiers:
+        applies_to = modifier.get("resist_types")
+        for i, resist_type in enumerate(resist_types):
+            if applies_to is not None and resist_type not in applies_to:
+                continue
+            if modifier["kind"] == "flat":
+                offsets[i] += modifier["value"] / scales[i] if scales[i] != 1 else modifier["value"]
+            elif modifier["kind"] == "multiplier":
+                if modifier["value"] <= 0:
+                    raise ValueError(f"Multiplier must be positive: {modifier['value']}")
+                scales[i] *= modifier["value"]
+            else:
+                raise ValueError(f"Unknown modifier kind: {modifier['kind']}")
+    return scales, offsets
+
+def apply_modifiers(sums, scales, offsets) -> list:
+    """Apply compiled modifiers to consecutive sets of summed values, one value per resistance"""
+    if all(scale == 1 for scale in scales) and not any(offsets):
+        return sums
+    return [(value + offset) * scale for value, scale, offset in zip(sums, cycle(scales), cycle(offsets))]
+
+def resulting_resistance(total_armor_score) -> float:
+    """Calculate resulting resistance fraction using the formula 1 - 1.75^(-0.035 * v_armor)"""
+    if total_armor_score <= 0:
+        return 0.0
+
+    try:
+        result = 1 - math.pow(1.75, -0.035 * total_armor_score)
+        return max(0.0, min(1.0, result)) # Clamp between 0 and 1
+    except (OverflowError, ValueError):
+        # Handle edge cases where calculation might fail
+        return 1.0 if total_armor_score > 100 else 0.0
+
+def score_resistance_sums(totals, required_values):
+    """Score the modified total armor values of a set against required percentages.
+
+    Mirrors ArmorPicker.evaluate_combination without building the full score dict.
+    Returns None if the set exceeds a requirement by more than 10%, otherwise
+    ((dispersion, -avg_coverage, variance), meets_threshold).
+    """
+    percentages = []
+    coverages = []
+    for total_score, required_percentage in zip(totals, required_values):
+        if (total_score - required_percentage) / required_percentage * 100 > 10:
+            return None
+
+        resistance = resulting_resistance(total_score)
+        percentages.append(resistance * 100)
+        required_decimal = required_percentage / 100.0 if required_percentage > 1 else required_percentage
+        coverages.append(min(resistance / required_decimal, 1.0) if required_decimal > 0 else 1.0)
+
+    dispersion = 0.0
+    if len(percentages) > 1:
+        mean_percentage = sum(percentages) / len(percentages)
+        variance = sum((percentage - mean_percentage) ** 2 for percentage in percentages) / (len(percentages)-1)
+        dispersion = variance ** 0.5
+
+    avg_coverage = sum(coverages) / len(coverages) if coverages else 0
+    variance = sum((c - avg_coverage) ** 2 for c in coverages) / len(coverages) if coverages else 0
+    return (dispersion, -avg_coverage, variance), avg_coverage >= 0.9
+
+def combination_base_index(slot_sizes, prefix) -> int:
+    """Get the product order index of the first armor set whose first slots are fixed to prefix"""
+    base_index = 0
+    for size, position in zip(slot_sizes, prefix):
+        base_index = base_index * size + position
+    return base_index * math.prod(slot_sizes[len(prefix):])
+
+def combination_positions(slot_sizes, index: int) -> tuple:
+    """Get the position in each slot of the armor set at index in product order"""
+    positions = []
+    for size in reversed(slot_sizes):
+        index, position = divmod(index, size)
+        positions.append(position)
+    return tuple(reversed(positions))
+
+def combination_block_sums(matrix, slot_rows, prefix, columns) -> array:
+    """Sum the given matrix columns for every armor set whose first slots are fixed to prefix.
+
+    matrix is a flat resistance matrix with one row of len(RESISTANCE_TYPES) values per armor,
+    slot_rows the candidate matrix rows of each slot and prefix the positions taken in the
+    first slots. Returns len(columns) sums per set, in product order.
+    """
+    width = len(RESISTANCE_TYPES)
+
+    def row_values(row):
+        return [matrix[row * width + column] for column in columns]
+
+    prefix_values = [row_values(slot_rows[slot][position]) for slot, position in enumerate(prefix)]
+    prefix_sums = [sum(values) for values in zip([0] * len(columns), *prefix_values)]
+    suffix = [[row_values(row) for row in rows] for rows in slot_rows[len(prefix):]]
+
+    sums = array('i')
+    for values in product(*suffix):
+        sums.extend(map(sum, zip(prefix_sums, *values)))
+    return sums
+
+def rank_combination_sums(sums, required_values, base_index: int = 0, scales=None, offsets=None, keep_good: int = 100, keep_best: int = 20):
+    """Rank consecutive armor sets from their summed requirement columns.
+
+    The compiled modifiers (scales, offsets) are applied to the whole block at once. Sort
+    keys end with the set's index in product order (base_index for the first set) so merged
+    blocks rank exactly like a single pass. Returns (good, best, checked) where good and
+    best are the sorted keys of sets meeting the threshold and of all kept sets.
+    """
+    width = len(required_values)
+    if scales is not None:
+        sums = apply_modifiers(sums, scales, offsets)
+    good = []
+    best = []
+    for offset in range(0, len(sums), width):
+        scored = score_resistance_sums(sums[offset:offset + width], required_values)
+        if scored is None:
+            continue
+        sort_key, meets_threshold = scored
+        sort_key += (base_index + offset // width,)
+        best.append(sort_key)
+        if meets_threshold:
+            good.append(sort_key)
+
+    good.sort()
+    best.sort()
+    return good[:keep_good], best[:keep_best], len(sums) // width
+
+def max_allowed_total(required_percentage) -> float:
+    """Get the largest total that score_resistance_sums does not reject as exceeding required_percentage by more than 10%.
+
+    Its check only grows with the total, so comparing totals to this limit gives exactly the same answers.
+    """
+    def exceeds(total_score):
+        return (total_score - required_percentage) / required_percentage * 100 > 10
+
+    limit = required_percentage * 1.1
+    while exceeds(limit):
+        limit = math.nextafter(limit, -math.inf)
+    while not exceeds(math.nextafter(limit, math.inf)):
+        limit = math.nextafter(limit, math.inf)
+    return limit
+
+def rank_combination_sums_profiles(sums, profiles, base_index: int = 0, scales=None, offsets=None, keep_good: int = 100, keep_best: int = 20):
+    """Rank consecutive armor sets against several requirement profiles in one pass.
+
+    profiles are lists of required values for the same columns. Resistance percentages and
+    their dispersion only depend on the set, so they are computed once per set and shared;
+    each profile then only checks its own requirements and coverage. Returns one
+    (good, best, checked) per profile, exactly as rank_combination_sums would.
+    """
+    width = len(profiles[0])
+    if scales is not None:
+        sums = apply_modifiers(sums, scales, offsets)
+    ranked = [
+        ([max_allowed_total(value) for value in required_values], [value / 100.0 if value > 1 else value for value in required_values], [], [])
+        for required_values in profiles
+    ]
+    for offset in range(0, len(sums), width):
+        totals = sums[offset:offset + width]
+        resistances = None
+        for limits, required_decimals, good, best in ranked:
+            if not all(map(le, totals, limits)):
+                continue
+
+            if resistances is None:
+                resistances = [resulting_resistance(total_score) for total_score in totals]
+                percentages = [resistance * 100 for resistance in resistances]
+                dispersion = 0.0
+                if len(percentages) > 1:
+                    mean_percentage = sum(percentages) / len(percentages)
+                    variance = sum((percentage - mean_percentage) ** 2 for percentage in percentages) / (len(percentages)-1)
+                    dispersion = variance ** 0.5
+
+            coverages = [min(resistance / required_decimal, 1.0) if required_decimal > 0 else 1.0 for resistance, required_decimal in zip(resistances, required_decimals)]
+            avg_coverage = sum(coverages) / len(coverages)
+            variance = sum((c - avg_coverage) ** 2 for c in coverages) / len(coverages)
+            sort_key = (dispersion, -avg_coverage, variance, base_index + offset // width)
+            best.append(sort_key)
+            if avg_coverage >= 0.9:
+                good.append(sort_key)
+
+    checked = len(sums) // width
+    return [(sorted(good)[:keep_good], sorted(best)[:keep_best], checked) for _, _, good, best in ranked]
+
+def search_combination_block(matrix, slot_rows, prefix, requirements, modifiers: list = None, keep_sums: bool = False):
+    """Score every armor set whose first slots are fixed to prefix.
+
+    Returns (good, best, checked, sums) as rank_combination_sums does, plus the block's
+    requirement sums when keep_sums is set so later modifier changes can rank them again.
+    """
+    columns = [RESISTANCE_TYPES.index(resist_type) for resist_type in requirements]
+    sums = combination_block_sums(matrix, slot_rows, prefix, columns)
+    good, best, checked = rank_combination_sums(
+        sums,
+        list(requirements.values()),
+        combination_base_index([len(rows) for rows in slot_rows], prefix),
+        *compile_modifiers(modifiers or [], list(requirements)),
+    )
+    return good, best, checked, sums if keep_sums else None
+
+def search_combination_block_profiles(matrix, slot_rows, prefix, resist_types, profiles, modifiers: list = None, keep_sums: bool = False):
+    """Score every armor set whose first slots are fixed to prefix against several requirement profiles.
+
+    profiles are lists of required values for resist_types. Returns (ranked, sums): one
+    (good, best, checked) per profile, as rank_combination_sums_profiles does, and the
+    block's sums when keep_sums is set, as search_combination_block does.
+    """
+    columns = [RESISTANCE_TYPES.index(resist_type) for resist_type in resist_types]
+    sums = combination_block_sums(matrix, slot_rows, prefix, columns)
+    ranked = rank_combination_sums_profiles(
+        sums,
+        profiles,
+        combination_base_index([len(rows) for rows in slot_rows], prefix),
+        *compile_modifiers(modifiers or [], list(resist_types)),
+    )
+    return ranked, sums if keep_sums else None
+
+# Shared resistance matrices attached by search worker processes, by shared memory name
+_worker_matrices = {}
+
+def _attach_shared_matrix(name: str, size: int):
+    """Attach a resistance matrix published in shared memory, once per worker process"""
+    attached = _worker_matrices.get(name)
+    if attached is None:
+        try:
+            shared = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Python < 3.13 has no track argument
+            shared = shared_memory.SharedMemory(name=name)
+        attached = _worker_matrices[name] = (shared, shared.buf.cast('i')[:size])
+    return attached[1]
+
+def search_shared_combination_block(matrix_name: str, matrix_size: int, *args):
+    """Process pool entry point: search_combination_block on a shared resistance matrix"""
+    return search_combination_block(_attach_shared_matrix(matrix_name, matrix_size), *args)
+
+def warm_up_search_worker():
+    """Process pool entry point used to start workers ahead of the first search"""
+    return os.getpid()
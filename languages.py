@@ -47,6 +47,17 @@ translations = {
         "extra_settings_armorignore_text": "Armor Ignore",
         "selector_armor_subclass_info": "All Quasimorph items are Quasi. Everything else is Default.",
         "selector_armor_categories_block_info": "These are the categories that are blocked by default as they are low tier.",
+        "search_in_progress": "Searching... {} of {} combinations checked, showing the best so far.",
+        "search_time_budget_exceeded": "Search stopped after the time limit: {} of {} combinations checked, showing the best found.",
+        "extra_modifiers": "Extra modifiers",
+        "extra_modifiers_info": "e.g. +5, fire +10, cold +20%",
+        "pinned_items": "Locked items",
+        "pinned_items_info": "Only these items are used in their slots",
+        "banned_items": "Banned items",
+        "banned_items_info": "These items are never used",
+        "search_queue_full": "Too many searches are running, please try again in a moment.",
+        "auto_search": "Live search",
+        "auto_search_info": "Search again automatically shortly after filters change",
 
     },
     "Русский": {
@@ -95,7 +106,18 @@ translations = {
         "extra_settings_armorsubclass_text": "Подкласс брони",
         "extra_settings_armorignore_text": "Игнорирование брони",
         "selector_armor_subclass_info": "Все предметы Квазиморфа являются Quasi. Всё остальное - Default.",
-        "selector_armor_categories_block_info": "Это категории, которые заблокированы по умолчанию, так как они низкого уровня."
+        "selector_armor_categories_block_info": "Это категории, которые заблокированы по умолчанию, так как они низкого уровня.",
+        "search_in_progress": "Поиск... проверено {} из {} комбинаций, показаны лучшие на данный момент.",
+        "search_time_budget_exceeded": "Поиск остановлен по лимиту времени: проверено {} из {} комбинаций, показаны лучшие найденные.",
+        "extra_modifiers": "Дополнительные модификаторы",
+        "extra_modifiers_info": "напр. +5, fire +10, cold +20%",
+        "pinned_items": "Закреплённые предметы",
+        "pinned_items_info": "В своих слотах используются только эти предметы",
+        "banned_items": "Исключённые предметы",
+        "banned_items_info": "Эти предметы никогда не используются",
+        "search_queue_full": "Выполняется слишком много поисков, попробуйте ещё раз чуть позже.",
+        "auto_search": "Живой поиск",
+        "auto_search_info": "Автоматически искать заново вскоре после изменения фильтров"
 
     },
     "Deutsch": {
@@ -144,7 +166,18 @@ translations = {
         "extra_settings_armorsubclass_text": "Rüstungsunterklasse",
         "extra_settings_armorignore_text": "Rüstungsignorieren",
         "selector_armor_subclass_info": "Alle Quasimorph-Artikel sind Quasi. Alles andere ist Default.",
-        "selector_armor_categories_block_info": "Dies sind die Kategorien, die standardmäßig blockiert sind, da sie niedrigerer Stufe sind."
+        "selector_armor_categories_block_info": "Dies sind die Kategorien, die standardmäßig blockiert sind, da sie niedrigerer Stufe sind.",
+        "search_in_progress": "Suche... {} von {} Kombinationen geprüft, die bisher besten werden angezeigt.",
+        "search_time_budget_exceeded": "Suche nach Zeitlimit beendet: {} von {} Kombinationen geprüft, die besten gefundenen werden angezeigt.",
+        "extra_modifiers": "Zusätzliche Modifikatoren",
+        "extra_modifiers_info": "z. B. +5, fire +10, cold +20%",
+        "pinned_items": "Fixierte Gegenstände",
+        "pinned_items_info": "In ihren Slots werden nur diese Gegenstände verwendet",
+        "banned_items": "Ausgeschlossene Gegenstände",
+        "banned_items_info": "Diese Gegenstände werden nie verwendet",
+        "search_queue_full": "Es laufen zu viele Suchen, bitte versuche es gleich noch einmal.",
+        "auto_search": "Live-Suche",
+        "auto_search_info": "Kurz nach Änderung der Filter automatisch neu suchen"
 
     },
     "Français": {
@@ -193,7 +226,18 @@ translations = {
         "extra_settings_armorsubclass_text": "Sous-classe d'armure",
         "extra_settings_armorignore_text": "Ignorer l'armure",
         "selector_armor_subclass_info": "Tous les objets Quasimorph sont Quasi. Tout le reste est Default.",
-        "selector_armor_categories_block_info": "Ce sont les catégories qui sont bloquées par défaut car elles sont de bas niveau."
+        "selector_armor_categories_block_info": "Ce sont les catégories qui sont bloquées par défaut car elles sont de bas niveau.",
+        "search_in_progress": "Recherche... {} sur {} combinaisons vérifiées, affichage des meilleures jusqu'à présent.",
+        "search_time_budget_exceeded": "Recherche arrêtée après la limite de temps : {} sur {} combinaisons vérifiées, affichage des meilleures trouvées.",
+        "extra_modifiers": "Modificateurs supplémentaires",
+        "extra_modifiers_info": "ex. +5, fire +10, cold +20%",
+        "pinned_items": "Objets verrouillés",
+        "pinned_items_info": "Seuls ces objets sont utilisés dans leurs emplacements",
+        "banned_items": "Objets exclus",
+        "banned_items_info": "Ces objets ne sont jamais utilisés",
+        "search_queue_full": "Trop de recherches sont en cours, veuillez réessayer dans un instant.",
+        "auto_search": "Recherche en direct",
+        "auto_search_info": "Relancer automatiquement la recherche peu après un changement de filtres"
 
     },
     "Español": {
@@ -242,7 +286,18 @@ translations = {
         "extra_settings_armorsubclass_text": "Subclase de armadura",
         "extra_settings_armorignore_text": "Ignorar armadura",
         "selector_armor_subclass_info": "Todos los artículos Quasimorph son Quasi. Todo lo demás es Default.",
-        "selector_armor_categories_block_info": "Estas son las categorías que están bloqueadas por defecto ya que son de nivel bajo."
+        "selector_armor_categories_block_info": "Estas son las categorías que están bloqueadas por defecto ya que son de nivel bajo.",
+        "search_in_progress": "Buscando... {} de {} combinaciones comprobadas, mostrando las mejores hasta ahora.",
+        "search_time_budget_exceeded": "Búsqueda detenida por límite de tiempo: {} de {} combinaciones comprobadas, mostrando las mejores encontradas.",
+        "extra_modifiers": "Modificadores adicionales",
+        "extra_modifiers_info": "p. ej. +5, fire +10, cold +20%",
+        "pinned_items": "Objetos fijados",
+        "pinned_items_info": "Solo se usan estos objetos en sus ranuras",
+        "banned_items": "Objetos excluidos",
+        "banned_items_info": "Estos objetos nunca se usan",
+        "search_queue_full": "Hay demasiadas búsquedas en curso, inténtalo de nuevo en un momento.",
+        "auto_search": "Búsqueda en vivo",
+        "auto_search_info": "Volver a buscar automáticamente poco después de cambiar los filtros"
 
     },
     "Polski": {
@@ -291,7 +346,18 @@ translations = {
         "extra_settings_armorsubclass_text": "Podklasa zbroi",
         "extra_settings_armorignore_text": "Ignoruj zbroję",
         "selector_armor_subclass_info": "Wszystkie przedmioty Quasimorph są Quasi. Wszystko inne to Default.",
-        "selector_armor_categories_block_info": "To są kategorie, które są domyślnie zablokowane, ponieważ są niskiego poziomu."
+        "selector_armor_categories_block_info": "To są kategorie, które są domyślnie zablokowane, ponieważ są niskiego poziomu.",
+        "search_in_progress": "Wyszukiwanie... sprawdzono {} z {} kombinacji, pokazano dotychczas najlepsze.",
+        "search_time_budget_exceeded": "Wyszukiwanie zatrzymane po limicie czasu: sprawdzono {} z {} kombinacji, pokazano najlepsze znalezione.",
+        "extra_modifiers": "Dodatkowe modyfikatory",
+        "extra_modifiers_info": "np. +5, fire +10, cold +20%",
+        "pinned_items": "Zablokowane przedmioty",
+        "pinned_items_info": "W swoich slotach używane są tylko te przedmioty",
+        "banned_items": "Wykluczone przedmioty",
+        "banned_items_info": "Te przedmioty nigdy nie są używane",
+        "search_queue_full": "Trwa zbyt wiele wyszukiwań, spróbuj ponownie za chwilę.",
+        "auto_search": "Wyszukiwanie na żywo",
+        "auto_search_info": "Automatycznie szukaj ponownie chwilę po zmianie filtrów"
 
     },
     "Türkçe": {
@@ -340,7 +406,18 @@ translations = {
         "extra_settings_armorsubclass_text": "Zırh Alt Sınıfı",
         "extra_settings_armorignore_text": "Zırhı Yoksay",
         "selector_armor_subclass_info": "Tüm Quasimorph eşyaları Quasi'dir. Diğer her şey Default'tır.",
-        "selector_armor_categories_block_info": "Bunlar, düşük seviyede oldukları için varsayılan olarak engellenmiş kategorilerdir."
+        "selector_armor_categories_block_info": "Bunlar, düşük seviyede oldukları için varsayılan olarak engellenmiş kategorilerdir.",
+        "search_in_progress": "Aranıyor... {} / {} kombinasyon kontrol edildi, şimdiye kadarki en iyiler gösteriliyor.",
+        "search_time_budget_exceeded": "Arama süre sınırında durduruldu: {} / {} kombinasyon kontrol edildi, bulunan en iyiler gösteriliyor.",
+        "extra_modifiers": "Ek değiştiriciler",
+        "extra_modifiers_info": "örn. +5, fire +10, cold +20%",
+        "pinned_items": "Sabitlenen eşyalar",
+        "pinned_items_info": "Yuvalarında yalnızca bu eşyalar kullanılır",
+        "banned_items": "Yasaklanan eşyalar",
+        "banned_items_info": "Bu eşyalar asla kullanılmaz",
+        "search_queue_full": "Çok fazla arama çalışıyor, lütfen birazdan tekrar deneyin.",
+        "auto_search": "Canlı arama",
+        "auto_search_info": "Filtreler değiştikten kısa süre sonra otomatik olarak yeniden ara"
 
     },
     "Português Brasileiro": {
@@ -389,7 +466,18 @@ translations = {
         "extra_settings_armorsubclass_text": "Subclasse de Armadura",
         "extra_settings_armorignore_text": "Ignorar Armadura",
         "selector_armor_subclass_info": "Todos os itens Quasimorph são Quasi. Todo o resto é Default.",
-        "selector_armor_categories_block_info": "Estas são as categorias que estão bloqueadas por padrão, pois são de baixo nível."
+        "selector_armor_categories_block_info": "Estas são as categorias que estão bloqueadas por padrão, pois são de baixo nível.",
+        "search_in_progress": "Buscando... {} de {} combinações verificadas, mostrando as melhores até agora.",
+        "search_time_budget_exceeded": "Busca interrompida pelo limite de tempo: {} de {} combinações verificadas, mostrando as melhores encontradas.",
+        "extra_modifiers": "Modificadores extras",
+        "extra_modifiers_info": "ex. +5, fire +10, cold +20%",
+        "pinned_items": "Itens fixados",
+        "pinned_items_info": "Apenas estes itens são usados em seus espaços",
+        "banned_items": "Itens excluídos",
+        "banned_items_info": "Estes itens nunca são usados",
+        "search_queue_full": "Há buscas demais em andamento, tente novamente em instantes.",
+        "auto_search": "Busca ao vivo",
+        "auto_search_info": "Buscar novamente de forma automática logo após mudar os filtros"
 
     },
     "한국어": {
@@ -438,7 +526,18 @@ translations = {
         "extra_settings_armorsubclass_text": "갑옷 서브 클래스",
         "extra_settings_armorignore_text": "갑옷 무시",
         "selector_armor_subclass_info": "모든 Quasimorph 아이템은 Quasi입니다. 나머지는 Default입니다.",
-        "selector_armor_categories_block_info": "이들은 기본적으로 차단된 카테고리로, 낮은 수준입니다."
+        "selector_armor_categories_block_info": "이들은 기본적으로 차단된 카테고리로, 낮은 수준입니다.",
+        "search_in_progress": "검색 중... {} / {} 조합 확인됨, 지금까지 최고의 결과를 표시합니다.",
+        "search_time_budget_exceeded": "시간 제한으로 검색이 중지됨: {} / {} 조합 확인됨, 찾은 최고의 결과를 표시합니다.",
+        "extra_modifiers": "추가 수정치",
+        "extra_modifiers_info": "예: +5, fire +10, cold +20%",
+        "pinned_items": "고정 아이템",
+        "pinned_items_info": "해당 슬롯에는 이 아이템만 사용됩니다",
+        "banned_items": "제외 아이템",
+        "banned_items_info": "이 아이템은 사용되지 않습니다",
+        "search_queue_full": "진행 중인 검색이 너무 많습니다. 잠시 후 다시 시도하세요.",
+        "auto_search": "실시간 검색",
+        "auto_search_info": "필터가 바뀌면 잠시 후 자동으로 다시 검색합니다"
 
     },
     "日本": {
@@ -487,7 +586,18 @@ translations = {
         "extra_settings_armorsubclass_text": "アーマーサブクラス",
         "extra_settings_armorignore_text": "アーマーを無視",
         "selector_armor_subclass_info": "すべてのQuasimorphアイテムはQuasiです。他のすべてはDefaultです。",
-        "selector_armor_categories_block_info": "これらはデフォルトでブロックされているカテゴリで、低いティアです。"
+        "selector_armor_categories_block_info": "これらはデフォルトでブロックされているカテゴリで、低いティアです。",
+        "search_in_progress": "検索中... {} / {} の組み合わせを確認済み、現時点で最良のものを表示しています。",
+        "search_time_budget_exceeded": "時間制限により検索を停止しました: {} / {} の組み合わせを確認済み、見つかった最良のものを表示しています。",
+        "extra_modifiers": "追加修正値",
+        "extra_modifiers_info": "例: +5, fire +10, cold +20%",
+        "pinned_items": "固定アイテム",
+        "pinned_items_info": "そのスロットではこれらのアイテムのみ使用されます",
+        "banned_items": "除外アイテム",
+        "banned_items_info": "これらのアイテムは使用されません",
+        "search_queue_full": "実行中の検索が多すぎます。しばらくしてからもう一度お試しください。",
+        "auto_search": "ライブ検索",
+        "auto_search_info": "フィルター変更後、少し待ってから自動で再検索します"
 
     },
     "中国人": {
@@ -536,6 +646,17 @@ translations = {
         "extra_settings_armorsubclass_text": "护甲子类别",
         "extra_settings_armorignore_text": "忽略护甲",
         "selector_armor_subclass_info": "所有的Quasimorph物品都是Quasi。其他的都是Default。",
-        "selector_armor_categories_block_info": "这些是默认被阻止的类别，因为它们是低级别的。"
+        "selector_armor_categories_block_info": "这些是默认被阻止的类别，因为它们是低级别的。",
+        "search_in_progress": "搜索中... 已检查 {} / {} 个组合，显示目前最佳结果。",
+        "search_time_budget_exceeded": "搜索因时间限制而停止：已检查 {} / {} 个组合，显示找到的最佳结果。",
+        "extra_modifiers": "额外修正",
+        "extra_modifiers_info": "例如 +5, fire +10, cold +20%",
+        "pinned_items": "锁定物品",
+        "pinned_items_info": "对应栏位只使用这些物品",
+        "banned_items": "排除物品",
+        "banned_items_info": "这些物品不会被使用",
+        "search_queue_full": "正在进行的搜索过多，请稍后再试。",
+        "auto_search": "实时搜索",
+        "auto_search_info": "筛选条件改变后稍等片刻自动重新搜索"
     }
 }
\ No newline at end of file
@@ -1,15 +1,80 @@
+import hashlib
 import json
 import re
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
 localization_data = {
     'languages': [],
     'items': {}
 }
 
+# Hashes of the inputs and outputs of the last export, for incremental rebuilds
+MANIFEST_FILE = 'armor_data_manifest.json'
+# Version of the exported file format, bump it whenever the output changes for the same inputs
+FORMAT_VERSION = 3
+
+# Exported fields written as numbers instead of strings
+NUMERIC_FIELDS = {
+    'TechLevel': int,
+    'MaxDurability': int,
+    'Weight': float,
+}
+
+def parse_language_header(lang_line, display_line):
+    """
+    Parse the two header lines of localization.txt.
+    
+    Returns:
+        tuple: (language codes, [{'code': ..., 'display_name': ...}, ...])
+    """
+    # First line contains language codes
+    languages = [lang.strip() for lang in lang_line.strip().split('\t') if lang.strip()]
+    
+    # Second line contains language display names
+    display_names = [name.strip() for name in display_line.strip().split('\t') if name.strip()]
+    
+    language_infos = []
+    for i, lang_code in enumerate(languages):
+        display_name = display_names[i + 1] if i < len(display_names) else lang_code # Shift by 1 to skip the first entry which is technical name
+        language_infos.append({
+            'code': lang_code,
+            'display_name': display_name
+        })
+    return languages, language_infos
+
+def add_translation_row(items, languages, line):
+    """
+    Add the translations of one localization.txt row to items, keyed by item id and translation type.
+    """
+    parts = [part.strip() for part in line.strip().split('\t')]
+    if len(parts) < 2:
+        return
+    
+    key = parts[0]
+    translations = parts[1:len(languages)+1]  # Only take as many as we have languages
+    
+    # Extract item ID and type from key
+    item_id = key.replace('.name', '').replace('.shortdesc', '')
+    translation_type = 'name' if '.name' in key else 'description'
+    
+    if item_id not in items:
+        items[item_id] = {}
+    
+    if translation_type not in items[item_id]:
+        items[item_id][translation_type] = {}
+    
+    # Map translations to languages
+    for i, translation in enumerate(translations):
+        items[item_id][translation_type][languages[i]] = translation
+
 def parse_localization_file(localization_path):
     """
-    Parse the localization file to extract translations.
+    Parse the localization file to extract item and ui translations.
+    
+    Loads every item name/description and ui row into the module-global localization_data,
+    replacing what an earlier call loaded. Prefer load_localization to load only what is needed.
     
     Args:
         localization_path (str): Path to localization file
@@ -17,6 +82,8 @@ def parse_localization_file(localization_path):
     Returns:
         dict: Dictionary with language mappings and item translations
     """
+    localization_data['languages'] = []
+    localization_data['items'] = {}
 
     try:
         with open(localization_path, 'r', encoding='utf-8') as file:
@@ -26,51 +93,13 @@ def parse_localization_file(localization_path):
             print("Warning: Localization file has insufficient data")
             return localization_data
         
-        # First line contains language codes
-        lang_line = lines[0].strip()
-        languages = [lang.strip() for lang in lang_line.split('\t') if lang.strip()]
-        
-        # Second line contains language display names
-        display_line = lines[1].strip()
-        display_names = [name.strip() for name in display_line.split('\t') if name.strip()]
-        
-        # Create language mapping
-        for i, lang_code in enumerate(languages):
-            display_name = display_names[i + 1] if i < len(display_names) else lang_code # Shift by 1 to skip the first entry which is technical name
-            localization_data['languages'].append({
-                'code': lang_code,
-                'display_name': display_name
-            })
+        languages, localization_data['languages'] = parse_language_header(lines[0], lines[1])
         
         # Parse item translations (skip first 2 lines)
         for line in lines[2:]:
-            line = line.strip()
-            if not line:
-                continue
-                
-            parts = [part.strip() for part in line.split('\t')]
-            if len(parts) < 2:
-                continue
-                
-            key = parts[0]
-            translations = parts[1:len(languages)+1]  # Only take as many as we have languages
-            
-            # Extract item ID and type from key
-            if ('item.' in key and ('.name' in key or '.shortdesc' in key)) or 'ui. in key':
-                item_id = key.replace('.name', '').replace('.shortdesc', '')
-                translation_type = 'name' if '.name' in key else 'description'
-                
-                if item_id not in localization_data['items']:
-                    localization_data['items'][item_id] = {}
-                
-                if translation_type not in localization_data['items'][item_id]:
-                    localization_data['items'][item_id][translation_type] = {}
-                
-                # Map translations to languages
-                for i, translation in enumerate(translations):
-                    if i < len(languages):
-                        lang_code = languages[i]
-                        localization_data['items'][item_id][translation_type][lang_code] = translation
+            key = line.strip().split('\t', 1)[0].strip()
+            if ('item.' in key and ('.name' in key or '.shortdesc' in key)) or 'ui.' in key:
+                add_translation_row(localization_data['items'], languages, line)
         
         print(f"Loaded localization for {len(localization_data['languages'])} languages")
         print(f"Found translations for {len(localization_data['items'])} items")
@@ -82,6 +111,77 @@ def parse_localization_file(localization_path):
     
     return localization_data
 
+def index_localization_file(localization_path):
+    """
+    Scan localization.txt once, keeping only the byte offset of each key's row.
+    
+    Args:
+        localization_path (str): Path to localization file
+        
+    Returns:
+        dict: {'codes': [...], 'languages': [...], 'offsets': {key: row offset}}
+    """
+    index = {'codes': [], 'languages': [], 'offsets': {}}
+    
+    with open(localization_path, 'rb') as file:
+        lang_line = file.readline().decode('utf-8')
+        display_line = file.readline().decode('utf-8')
+        if not display_line:
+            print("Warning: Localization file has insufficient data")
+            return index
+        
+        index['codes'], index['languages'] = parse_language_header(lang_line, display_line)
+        
+        offset = file.tell()
+        for line in file:
+            key, separator, _ = line.lstrip().partition(b'\t')
+            if separator:
+                index['offsets'][key.strip().decode('utf-8')] = offset
+            offset += len(line)
+    
+    return index
+
+def load_localization(localization_path, item_ids=(), key_prefixes=(), index=None):
+    """
+    Load only the requested translations of localization.txt.
+    
+    Args:
+        localization_path (str): Path to localization file
+        item_ids (iterable): Ids of items whose name and description are needed
+        key_prefixes (iterable): Prefixes of other keys to load, e.g. 'ui.damage.'
+        index (dict): Index from index_localization_file(), built when not given
+        
+    Returns:
+        dict: New dictionary shaped like localization_data with only the requested keys
+    """
+    data = {'languages': [], 'items': {}}
+    
+    try:
+        if index is None:
+            index = index_localization_file(localization_path)
+        offsets = index['offsets']
+        
+        keys = {f'item.{item_id}{suffix}' for item_id in item_ids for suffix in ('.name', '.shortdesc')}
+        if key_prefixes:
+            key_prefixes = tuple(key_prefixes)
+            keys.update(key for key in offsets if key.startswith(key_prefixes))
+        
+        data['languages'] = [dict(language_info) for language_info in index['languages']]
+        
+        # Read the requested rows in file order
+        with open(localization_path, 'rb') as file:
+            for offset in sorted(offsets[key] for key in keys if key in offsets):
+                file.seek(offset)
+                add_translation_row(data['items'], index['codes'], file.readline().decode('utf-8'))
+        
+        print(f"Loaded localization for {len(data['languages'])} languages")
+        print(f"Found translations for {len(data['items'])} of {len(offsets)} keys")
+        
+    except FileNotFoundError:
+        print(f"Warning: Localization file not found at {localization_path}")
+    
+    return data
+
 def clean_line(headers_line):
     """
     Clean headers line by handling multiple tabs and excess whitespace.
@@ -90,6 +190,64 @@ def clean_line(headers_line):
     headers = [h.strip() for h in cleaned_line.split('\t') if h.strip()]
     return headers
 
+def iter_config_categories(file_path, required_headers=None):
+    """
+    Stream config_items.txt category by category.
+    
+    Yields (category_name, headers, rows) for each category having all required headers,
+    where rows lazily yields the cleaned values of each data line. Rows left unread are
+    skipped when the next category is requested. Lines of categories without the required
+    headers are skipped without being tokenized, so files of any size parse in bounded memory.
+    
+    Args:
+        file_path (str): Path to the config_items.txt file
+        required_headers (list): List of headers that must be present in a category
+    """
+    if required_headers is None:
+        required_headers = ['ArmorClass']
+    
+    with open(file_path, 'r', encoding='utf-8') as file:
+        lines = (line.strip() for line in file)
+        current = {'line': next(lines, None)}
+        
+        def read_data_lines():
+            # Data lines run until #end or the next category
+            while current['line'] is not None and not current['line'].startswith('#'):
+                if current['line']:
+                    yield current['line']
+                current['line'] = next(lines, None)
+        
+        while current['line'] is not None:
+            line = current['line']
+            current['line'] = next(lines, None)
+            
+            # Check if line starts with # and is not #end
+            if not line.startswith('#') or line.startswith('#end'):
+                continue
+            
+            category_name = line[1:].strip()  # Remove # prefix
+            
+            # Get headers line
+            headers_line = current['line']
+            if headers_line is None:
+                return
+            current['line'] = next(lines, None)
+            original_headers = clean_line(headers_line)
+            
+            # Check if all required headers are present in original headers
+            if not all(header in original_headers for header in required_headers):
+                continue
+            
+            print(f"Category: {category_name}")
+            print(f"Headers: {['Type'] + original_headers}")
+            print(f"Header count: {len(original_headers) + 1}")
+            
+            data_lines = read_data_lines()
+            yield category_name, original_headers, (clean_line(data_line) for data_line in data_lines)
+            
+            for _ in data_lines:
+                pass
+
 def parse_config_items(file_path, required_headers=None, localization_data=None):
     """
     Parse config_items.txt file to extract categories with specified headers.
@@ -104,108 +262,82 @@ def parse_config_items(file_path, required_headers=None, localization_data=None)
     
     matching_categories = {}
     
-    with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
+    for category_name, original_headers, rows in iter_config_categories(file_path, required_headers):
+        category_type = category_name  # Store original category name as type
+        
+        # Add "Type" as first header
+        headers = ['Type'] + original_headers
+        category_data = []
+        
+        for values in rows:
+            # Create row dictionary with Type as first field
+            row_dict = {'Type': category_type}
+            
+            # Add other fields
+            for j, header in enumerate(original_headers):
+                if j < len(values):
+                    row_dict[header] = values[j]
+                else:
+                    row_dict[header] = ""
+            
+            category_data.append(row_dict)
+        
+        # Store category data
+        matching_categories[category_name] = {
+            'headers': headers,
+            'required_headers_found': required_headers,
+            'data': category_data
+        }
+    
+    # Add localization if available
+    if localization_data:
+        add_localization(matching_categories, localization_data)
     
-    lines = content.split('\n')
+    return matching_categories
+
+def add_localization(categories_data, localization_data):
+    """
+    Add Name_{code} and Description_{code} fields of every language to the rows of parsed categories.
     
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+    Args:
+        categories_data (dict): Categories from parse_config_items()
+        localization_data (dict): Localization data from load_localization()
+    """
+    for category_info in categories_data.values():
+        category_data = category_info['data']
         
-        # Check if line starts with # and is not #end
-        if line.startswith('#') and not line.startswith('#end'):
-            category_name = line[1:].strip()  # Remove # prefix
-            category_type = category_name  # Store original category name as type
-            i += 1
+        for row_dict in category_data:
+            if 'Id' not in row_dict:
+                continue
             
-            # Get headers line
-            if i < len(lines):
-                headers_line = lines[i].strip()
-                original_headers = clean_line(headers_line)
-                
-                # Add "Type" as first header
-                headers = ['Type'] + original_headers
-                
-                print(f"Category: {category_name}")
-                print(f"Headers: {headers}")
-                print(f"Header count: {len(headers)}")
+            item_id = 'item.' + row_dict['Id']
+            if item_id not in localization_data['items']:
+                continue
+            
+            item_translations = localization_data['items'][item_id]
+            
+            # Add name and description for each language
+            for lang_info in localization_data['languages']:
+                lang_code = lang_info['code']
                 
-                # Check if all required headers are present in original headers
-                has_required_headers = all(header in original_headers for header in required_headers)
+                # Add name
+                if 'name' in item_translations and lang_code in item_translations['name']:
+                    row_dict[f'Name_{lang_code}'] = item_translations['name'][lang_code]
+                else:
+                    row_dict[f'Name_{lang_code}'] = ""
                 
-                if has_required_headers:
-                    i += 1
-                    category_data = []
-                    
-                    # Collect data lines until #end or next category
-                    while i < len(lines):
-                        data_line = lines[i].strip()
-                        
-                        # Stop if we hit #end or another category
-                        if data_line.startswith('#end') or (data_line.startswith('#') and not data_line.startswith('#end')):
-                            break
-                        
-                        # Skip empty lines
-                        if data_line:
-                            # Clean and split data line
-                            values = clean_line(data_line)
-                            
-                            # Create row dictionary with Type as first field
-                            row_dict = {'Type': category_type}
-                            
-                            # Add other fields
-                            for j, header in enumerate(original_headers):
-                                if j < len(values):
-                                    row_dict[header] = values[j]
-                                else:
-                                    row_dict[header] = ""
-                            
-                            # Add localization if available
-                            if localization_data and 'Id' in row_dict:
-                                item_id = 'item.' + row_dict['Id']
-
-                                if item_id in localization_data['items']:
-                                    item_translations = localization_data['items'][item_id]
-                                    
-                                    # Add name and description for each language
-                                    for lang_info in localization_data['languages']:
-                                        lang_code = lang_info['code']
-                                        #lang_display = lang_info['display_name']
-                                        
-                                        # Add name
-                                        if 'name' in item_translations and lang_code in item_translations['name']:
-                                            row_dict[f'Name_{lang_code}'] = item_translations['name'][lang_code]
-                                        else:
-                                            row_dict[f'Name_{lang_code}'] = ""
-                                        
-                                        # Add description
-                                        if 'description' in item_translations and lang_code in item_translations['description']:
-                                            row_dict[f'Description_{lang_code}'] = item_translations['description'][lang_code]
-                                        else:
-                                            row_dict[f'Description_{lang_code}'] = ""
-                            
-                            category_data.append(row_dict)
-                        
-                        i += 1
-                    
-                    # Update headers to include localization headers if they were added
-                    if category_data and localization_data:
-                        # Get headers from first row to include localization headers
-                        headers = list(category_data[0].keys())
-                    
-                    # Store category data
-                    matching_categories[category_name] = {
-                        'headers': headers,
-                        'required_headers_found': required_headers,
-                        'data': category_data
-                    }
-                    
-                    continue
+                # Add description
+                if 'description' in item_translations and lang_code in item_translations['description']:
+                    row_dict[f'Description_{lang_code}'] = item_translations['description'][lang_code]
+                else:
+                    row_dict[f'Description_{lang_code}'] = ""
         
-        i += 1
+        # Update headers to include localization headers if they were added
+        if category_data:
+            # Get headers from first row to include localization headers
+            category_info['headers'] = list(category_data[0].keys())
     
-    return matching_categories
+    return categories_data
 
 def create_language_specific_data(categories_data, language_display_name):
     """
@@ -254,7 +386,7 @@ def create_language_specific_data(categories_data, language_display_name):
             for old_header, new_header in header_mapping.items():
                 new_row[new_header] = row.get(old_header, "")
             
-                tmp = parse_resistance_sheet(row['ResistSheet'], language_display_name)
+                tmp = parse_resistance_sheet(row['ResistSheet'])
                 new_row['ResistSheet'] = tmp
                 
             filtered_rows.append(new_row)
@@ -267,7 +399,31 @@ def create_language_specific_data(categories_data, language_display_name):
     
     return language_data
 
+def normalize_numeric_fields(row):
+    """
+    Convert the NUMERIC_FIELDS of an exported row from strings to numbers.
+    
+    Empty values become None. Raises ValueError for values that are not numbers,
+    so a broken export is never written.
+    """
+    for header, number_type in NUMERIC_FIELDS.items():
+        value = row.get(header)
+        if not isinstance(value, str):
+            continue
+        value = value.strip()
+        if not value:
+            row[header] = None
+            continue
+        try:
+            row[header] = number_type(value)
+        except ValueError:
+            raise ValueError(f"Invalid {header} {value!r} for item {row.get('Id', '?')}") from None
+    return row
+
 def filter_data_by_headers(categories_data, selected_headers=None):
+    """
+    Keep only the selected headers of each category, writing numeric fields as numbers.
+    """
     if selected_headers is None:
         return categories_data
     
@@ -281,7 +437,7 @@ def filter_data_by_headers(categories_data, selected_headers=None):
             filtered_rows = []
             for row in category_info['data']:
                 filtered_row = {header: row.get(header, "") for header in filtered_headers}
-                filtered_rows.append(filtered_row)
+                filtered_rows.append(normalize_numeric_fields(filtered_row))
             
             filtered_data[category_name] = {
                 'headers': filtered_headers,
@@ -292,50 +448,147 @@ def filter_data_by_headers(categories_data, selected_headers=None):
     
     return filtered_data
 
-def parse_resistance_sheet(resist_sheet, language_display_name):
+def tokenize_resistance_sheet(resist_sheet):
     """
-    Parse ResistSheet string into structured resistance data
+    Split a ResistSheet string into (type, value) pairs. The pairs are the same for every language.
     
     Args:
         resist_sheet (str): "blunt 6 pierce 0 lacer 0 fire 0 cold 5 poison 0 shock 0 beam 0"
         
     Returns:
-        list: [{"ResistType": "blunt", "ResistName": "Blunt", "ResistValue": 6}, ...]
+        list: [("blunt", 6), ("pierce", 0), ...]
     """
     if not resist_sheet or not isinstance(resist_sheet, str):
         return []
     
-    resistances = []
     parts = resist_sheet.split()
+    return [
+        (parts[i], int(parts[i + 1]) if parts[i + 1].isdigit() else 0)
+        for i in range(0, len(parts) - 1, 2)
+    ]
+
+def localize_resistance_name(resist_type, language_display_name, localization=None):
+    """
+    Get the localized name of a damage type from ui.damage.{type}, falling back to the capitalized type.
     
-    for i in range(0, len(parts), 2):
-        if i + 1 < len(parts):
-            resist_type = parts[i]
-            resist_value = int(parts[i + 1]) if parts[i + 1].isdigit() else 0
-            
-            # Get localized name from ui.damage.{type}
-            localized_name = resist_type.capitalize()  # fallback
-            if localization_data and 'items' in localization_data:
-                damage_key = f'ui.damage.{resist_type}'
-                if damage_key in localization_data['items']:
-                    name_data = localization_data['items'][damage_key].get('description', {})
-
-                    # Use first available language or English
-                 
-
-                    if language_display_name in name_data:
-                        localized_name = name_data[language_display_name]
-                    # else:
-                    # elif name_data:
-                    #     localized_name = next(iter(name_data.values()))
+    Uses the module-global localization_data unless a localization is given.
+    """
+    if localization is None:
+        localization = localization_data
+    
+    localized_name = resist_type.capitalize()  # fallback
+    if localization and 'items' in localization:
+        damage_key = f'ui.damage.{resist_type}'
+        if damage_key in localization['items']:
+            name_data = localization['items'][damage_key].get('description', {})
+
+            if language_display_name in name_data:
+                localized_name = name_data[language_display_name]
+    
+    return localized_name
+
+def build_resist_name_table(resist_types, language_display_name, localization=None):
+    """
+    Build the localized names of damage types for one language, written once per file as ResistNames.
+    
+    Returns:
+        dict: {"blunt": "Blunt", ...}
+    """
+    return {resist_type: localize_resistance_name(resist_type, language_display_name, localization) for resist_type in resist_types}
+
+def parse_resistance_sheet(resist_sheet):
+    """
+    Parse ResistSheet string into structured resistance data. Localized names are kept
+    in the ResistNames table of each language file instead of in every row.
+    
+    Args:
+        resist_sheet (str): "blunt 6 pierce 0 lacer 0 fire 0 cold 5 poison 0 shock 0 beam 0"
+        
+    Returns:
+        list: [{"ResistType": "blunt", "ResistValue": 6}, ...]
+    """
+    return [
+        {
+            "ResistType": resist_type,
+            "ResistValue": resist_value
+        }
+        for resist_type, resist_value in tokenize_resistance_sheet(resist_sheet)
+    ]
+
+def create_all_language_data(categories_data, language_names, selected_headers=None, localization=None):
+    """
+    Create the export data of every language in a single pass over the parsed categories.
+    
+    Gives the same rows as create_language_specific_data followed by filter_data_by_headers
+    with selected_headers for each language, but shared fields are copied and each ResistSheet
+    is parsed once per row instead of once per language. Each language also gets a ResistNames
+    table with the localized names of the damage types found.
+    
+    Args:
+        categories_data (dict): Full categories data with all languages
+        language_names (list): Language codes to export
+        selected_headers (list): Headers to keep, all when None
+        localization (dict): Localization for damage type names, localization_data when None
+        
+    Returns:
+        dict: Language code to language data
+    """
+    all_language_data = {lang_name: {} for lang_name in language_names}
+    resist_types = {}  # Damage types found, in order of appearance
+    
+    for category_name, category_info in categories_data.items():
+        base_headers = [h for h in category_info['headers']
+                       if not h.startswith('Name_') and not h.startswith('Description_')]
+        
+        # Headers each language ends up with once its Name_/Description_ fields are renamed
+        language_headers = {}
+        for lang_name in language_names:
+            lang_headers = [h for h in category_info['headers'] if h.endswith(f'_{lang_name}')]
+            header_mapping = {}
+            final_headers = base_headers.copy()
+            for lang_header in lang_headers:
+                for prefix, new_header in (('Name_', 'Name'), ('Description_', 'Description')):
+                    if lang_header.startswith(prefix):
+                        header_mapping[new_header] = lang_header
+                        if new_header not in final_headers:
+                            final_headers.append(new_header)
+            if selected_headers is not None:
+                final_headers = [h for h in selected_headers if h in final_headers]
+            language_headers[lang_name] = (final_headers, header_mapping)
+        
+        rows = {lang_name: [] for lang_name in language_names}
+        for row in category_info['data']:
+            # Fields shared by all languages
+            shared_row = normalize_numeric_fields({header: row.get(header, "") for header in base_headers})
+            resist_sheet = parse_resistance_sheet(row.get('ResistSheet'))
             
-            resistances.append({
-                "ResistType": resist_type,
-                "ResistName": localized_name,
-                "ResistValue": resist_value
-            })
+            for lang_name in language_names:
+                final_headers, header_mapping = language_headers[lang_name]
+                new_row = {}
+                for header in final_headers:
+                    if header in header_mapping:
+                        new_row[header] = row.get(header_mapping[header], "")
+                    elif header == 'ResistSheet' and header_mapping:
+                        # The same rows in every language, names are in ResistNames
+                        new_row[header] = resist_sheet
+                        resist_types.update(dict.fromkeys(resist["ResistType"] for resist in resist_sheet))
+                    else:
+                        new_row[header] = shared_row.get(header, "")
+                rows[lang_name].append(new_row)
+        
+        for lang_name in language_names:
+            if language_headers[lang_name][0]:
+                all_language_data[lang_name][category_name] = {
+                    'headers': language_headers[lang_name][0],
+                    'data': rows[lang_name]
+                }
     
-    return resistances
+    # Localized damage type names, built once per language
+    if resist_types:
+        for lang_name in language_names:
+            all_language_data[lang_name]['ResistNames'] = build_resist_name_table(resist_types, lang_name, localization)
+    
+    return all_language_data
 
 def save_data_to_json(categories_data, output_file='filtered_data.json'):
     with open(output_file, 'w', encoding='utf-8') as file:
@@ -346,14 +599,117 @@ def save_data_to_json(categories_data, output_file='filtered_data.json'):
     # for category_name, category_info in categories_data.items():
     #     print(f"  - {category_name}: {len(category_info['data'])} items")
 
-def main():
+def hash_file(file_path):
+    """
+    Get the SHA-256 hex digest of a file, or None if it does not exist.
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1 << 20), b''):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+def load_manifest(manifest_file=MANIFEST_FILE):
+    """
+    Load the build manifest, or an empty one if it is missing or unreadable.
+    """
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    manifest.setdefault('inputs', {})
+    manifest.setdefault('outputs', {})
+    return manifest
+
+def save_manifest(manifest, manifest_file=MANIFEST_FILE):
+    with open(manifest_file, 'w', encoding='utf-8') as file:
+        json.dump(manifest, file, indent=2, ensure_ascii=False)
+
+def is_manifest_current(manifest, input_hashes, settings):
+    """
+    Check that inputs and export settings match the manifest and every recorded output is unchanged.
+    """
+    return (
+        manifest['inputs'] == input_hashes
+        and manifest.get('settings') == settings
+        and bool(manifest['outputs'])
+        and all(hash_file(output_file) == digest for output_file, digest in manifest['outputs'].items())
+    )
+
+def save_data_if_changed(categories_data, output_file, manifest):
+    """
+    Write categories data like save_data_to_json, but only when the file content would change.
+    
+    Returns:
+        bool: True if the file was written
+    """
+    content = json.dumps(categories_data, indent=2, ensure_ascii=False).encode('utf-8')
+    digest = hashlib.sha256(content).hexdigest()
+    
+    manifest['outputs'][output_file] = digest
+    if hash_file(output_file) == digest:
+        return False
+    
+    with open(output_file, 'wb') as file:
+        file.write(content)
+    return True
+
+def export_language_file(lang_filtered, output_file):
+    """
+    Format and write one language file if its content changed. Runs in an export worker process.
+    
+    Returns:
+        tuple: (content digest, True if the file was written)
+    """
+    manifest = {'outputs': {}}
+    written = save_data_if_changed(lang_filtered, output_file, manifest)
+    return manifest['outputs'][output_file], written
+
+def export_language_files(all_language_data, manifest, workers=None):
+    """
+    Write the file of every language, fanning languages out over a process pool.
+    
+    Rows are built once by create_all_language_data, so workers only format, hash and write
+    their language's data.
+    
+    Args:
+        all_language_data (dict): Language code to language data
+        manifest (dict): Build manifest, whose outputs are updated
+        workers (int): Number of worker processes, all cores when None
+        
+    Returns:
+        int: Number of files written
+    """
+    output_files = {lang_name: f"armor_data_{lang_name.lower().replace(' ', '_')}.json" for lang_name in all_language_data}
+    workers = min(workers or os.cpu_count() or 1, len(all_language_data))
+    
+    if workers <= 1:
+        results = [export_language_file(all_language_data[lang_name], output_file) for lang_name, output_file in output_files.items()]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(export_language_file, all_language_data.values(), output_files.values()))
+    
+    written = 0
+    for output_file, (digest, file_written) in zip(output_files.values(), results):
+        manifest['outputs'][output_file] = digest
+        written += file_written
+    return written
+
+def main(force=False, workers=None):
+    """
+    Export the language files, skipping the export when inputs are unchanged since the last run.
+    
+    Args:
+        force (bool): Export even if the manifest says everything is up to date
+        workers (int): Number of processes writing language files, all cores when None
+    """
     input_file = 'config_items.txt'
     localization_file = f'localization.txt'
     
-    # Parse localization data
-    print("Loading localization data...")
-    localization_data = parse_localization_file(localization_file)
-    
     # Configuration options
     config_options = {
         'armor_with_localization': {
@@ -371,14 +727,31 @@ def main():
     print(f"\nUsing configuration: {selected_config}")
     print(f"Required headers: {config['required_headers']}")
     
+    export_headers = ['Id', 'Name', 'Description', 'Type', 'Categories', 'TechLevel', 'ItemClass', 'ArmorClass', 'ArmorSubClass', 'ResistSheet', 'MaxDurability', 'Weight']
+    
+    # Nothing to do when the inputs and outputs are those of the last export
+    manifest = load_manifest()
+    input_hashes = {input_file: hash_file(input_file), localization_file: hash_file(localization_file)}
+    settings = {'format_version': FORMAT_VERSION, 'required_headers': config['required_headers'], 'selected_headers': export_headers}
+    if not force and is_manifest_current(manifest, input_hashes, settings):
+        print("\nInputs unchanged since the last export, nothing to do")
+        return
+    
     try:
         # Parse the config file
         matching_categories = parse_config_items(
             input_file, 
             required_headers=config['required_headers'],
-            localization_data=localization_data if config.get('use_localization') else None
         )
         
+        # Load only the translations of parsed items and damage type names
+        localization_data = {'languages': [], 'items': {}}
+        if config.get('use_localization'):
+            print("Loading localization data...")
+            item_ids = {row['Id'] for category_info in matching_categories.values() for row in category_info['data'] if 'Id' in row}
+            localization_data = load_localization(localization_file, item_ids, key_prefixes=['ui.damage.'])
+            add_localization(matching_categories, localization_data)
+        
         # # Apply language filter if specified
         # if config.get('language_filter'):
         #     matching_categories = create_language_specific_data(
@@ -395,19 +768,24 @@ def main():
         # # Save to JSON
         # save_data_to_json(filtered_data, config['output_file'])
         
-        # Create individual language files
+        # Create individual language files, all languages in one pass
         if config.get('use_localization') and not config.get('language_filter'):
             print("\nCreating individual language files...")
-            for lang_info in localization_data['languages']:
-                lang_name = lang_info['code']
-                lang_data = create_language_specific_data(matching_categories, lang_name)
-                lang_filtered = filter_data_by_headers(
-                    lang_data,
-                    selected_headers=['Id', 'Name', 'Description', 'Type', 'Categories', 'TechLevel', 'ItemClass', 'ArmorClass', 'ArmorSubClass', 'ResistSheet', 'MaxDurability', 'Weight'],
-                )
-
-                lang_filename = f"armor_data_{lang_name.lower().replace(' ', '_')}.json"
-                save_data_to_json(lang_filtered, lang_filename)
+            all_language_data = create_all_language_data(
+                matching_categories,
+                [lang_info['code'] for lang_info in localization_data['languages']],
+                selected_headers=export_headers,
+                localization=localization_data,
+            )
+            
+            # Only rewrite files whose content changed, so unchanged languages are not churned
+            manifest['outputs'] = {}
+            written = export_language_files(all_language_data, manifest, workers)
+            print(f"Wrote {written} of {len(all_language_data)} language files")
+            
+            manifest['inputs'] = input_hashes
+            manifest['settings'] = settings
+            save_manifest(manifest)
         
         print(f"\nProcessing complete!")
         
@@ -444,4 +822,4 @@ def debug_localization_file(localization_path, max_items=5):
         print(f"Error reading localization file: {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(force='--force' in sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""Persistent cache of finished combination searches in a local SQLite file, kept across restarts"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+class ResultCache:
+    """Search results as JSON by key, evicting the least recently used beyond max_entries"""
+
+    def __init__(self, path: str, max_entries: int = 1000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Shared by search threads, every use holds the lock
+        self._connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, last_used REAL NOT NULL)")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+        logger.info(f"Result cache {path} opened with {len(self)} entries")
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get(self, key: str) -> Dict:
+        """Get the result stored under key, or None"""
+        with self._lock, self._connection:
+            row = self._connection.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict):
+        """Store a JSON-serializable result under key, evicting the least recently used ones"""
+        with self._lock, self._connection:
+            self._connection.execute("INSERT OR REPLACE INTO results (key, value, last_used) VALUES (?, ?, ?)", (key, json.dumps(value), time.time()))
+            self._connection.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
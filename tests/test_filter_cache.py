@@ -0,0 +1,74 @@
+"""Tests of the per-session filter cache of ArmorPicker.filter_armors."""
+import pytest
+
+from armor_picker import ArmorPicker
+
+CLASSES = ["Cloth", "HeavyArmor", "LightArmor", "MediumArmor", "PowerArmor"]
+SUBCLASSES = ["Default", "Quasi"]
+
+
+@pytest.fixture(scope="module")
+def picker():
+    picker = ArmorPicker()
+    yield picker
+    picker.close()
+
+
+@pytest.fixture
+def resistance_filters(picker):
+    return {resist_type: {"enabled": False, "value": 0} for resist_type in picker.resistance_types}
+
+
+@pytest.mark.parametrize("previous, filters", [
+    ((0, [], [], []), (3, [], [], [])),
+    ((0, [], [], []), (0, ["HeavyArmor"], ["Default"], ["Military"])),
+    ((2, ["HeavyArmor", "LightArmor"], ["Default", "Quasi"], []), (2, ["LightArmor"], ["Quasi"], [])),
+    ((2, [], [], ["Military"]), (2, [], [], ["Military", "Common Civillian"])),
+])
+def test_filters_narrow(previous, filters):
+    assert ArmorPicker.filters_narrow(previous, filters)
+
+
+@pytest.mark.parametrize("previous, filters", [
+    ((3, [], [], []), (2, [], [], [])),
+    ((0, ["HeavyArmor"], [], []), (0, ["HeavyArmor", "LightArmor"], [], [])),
+    # An empty list lets every class or subclass through again
+    ((0, ["HeavyArmor"], [], []), (0, [], [], [])),
+    ((0, [], ["Default"], []), (0, [], [], [])),
+    ((0, [], [], ["Military"]), (0, [], [], [])),
+])
+def test_filters_widen(previous, filters):
+    assert not ArmorPicker.filters_narrow(previous, filters)
+
+
+def test_widening_after_narrowing_filters_all_armors(picker, resistance_filters):
+    steps = [
+        (0, CLASSES, SUBCLASSES, []),
+        (3, ["HeavyArmor", "MediumArmor"], ["Default"], ["Military"]),
+        (5, ["HeavyArmor"], ["Default"], ["Military"]),
+        # Each of these widens the last step and must not reuse its narrowed result
+        (3, ["HeavyArmor"], ["Default"], ["Military"]),
+        (3, ["HeavyArmor", "PowerArmor"], ["Default"], ["Military"]),
+        (3, ["HeavyArmor", "PowerArmor"], [], ["Military"]),
+        (3, ["HeavyArmor", "PowerArmor"], [], []),
+        (3, [], [], []),
+        (0, [], [], []),
+    ]
+    for filters in steps:
+        narrowed = picker.filter_armors(resistance_filters, *filters, session_key="widen", version="0.9.2", language="English")
+        assert narrowed == picker.filter_all_armors(resistance_filters, *filters, "0.9.2", "English"), filters
+
+
+def test_cache_is_per_session_and_version(picker, resistance_filters):
+    narrow = (5, ["HeavyArmor"], ["Default"], [])
+    wide = (0, CLASSES, SUBCLASSES, [])
+    picker.filter_armors(resistance_filters, *narrow, session_key="first", version="0.9.2", language="English")
+
+    # Another session starts from its own filters
+    result = picker.filter_armors(resistance_filters, *wide, session_key="second", version="0.9.2", language="English")
+    assert result == picker.filter_all_armors(resistance_filters, *wide, "0.9.2", "English")
+
+    # Narrower filters of another version are not served from the cached rows of the first
+    for version in picker.versions:
+        result = picker.filter_armors(resistance_filters, 6, ["HeavyArmor"], ["Default"], [], session_key="first", version=version, language="English")
+        assert result == picker.filter_all_armors(resistance_filters, 6, ["HeavyArmor"], ["Default"], [], version, "English")
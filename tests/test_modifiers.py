@@ -0,0 +1,82 @@
+"""Tests of the resistance modifier text parsing and compilation in combination_search."""
+import pytest
+
+from combination_search import apply_modifiers, build_modifiers, compile_modifiers, parse_modifiers
+
+
+def apply_one_by_one(totals, modifiers, resist_types):
+    """Apply modifiers in order the plain way, as the compiled form must"""
+    totals = list(totals)
+    for modifier in modifiers:
+        for i, resist_type in enumerate(resist_types):
+            if modifier.get("resist_types") is not None and resist_type not in modifier["resist_types"]:
+                continue
+            if modifier["kind"] == "flat":
+                totals[i] += modifier["value"]
+            else:
+                totals[i] *= modifier["value"]
+    return totals
+
+
+def test_parse_modifiers_empty():
+    assert parse_modifiers("") == []
+    assert parse_modifiers(None) == []
+    assert parse_modifiers(" , \n ") == []
+
+
+def test_parse_modifiers_flat_and_percent():
+    assert parse_modifiers("+12") == [{"kind": "flat", "value": 12.0}]
+    assert parse_modifiers("fire +5") == [{"kind": "flat", "value": 5.0, "resist_types": ["fire"]}]
+    assert parse_modifiers("Cold +20%") == [{"kind": "multiplier", "value": 1.2, "resist_types": ["cold"]}]
+    assert parse_modifiers("all -3.5") == [{"kind": "flat", "value": -3.5}]
+
+
+def test_parse_modifiers_separators_keep_order():
+    modifiers = parse_modifiers("blunt +4, pierce 10%\nlacer -2")
+    assert [modifier.get("resist_types") for modifier in modifiers] == [["blunt"], ["pierce"], ["lacer"]]
+    assert [modifier["kind"] for modifier in modifiers] == ["flat", "multiplier", "flat"]
+
+
+@pytest.mark.parametrize("text", ["bogus", "wet +5", "+", "fire + 5 5", "12%%", "beam -100%", "-150%", "fire +5, nonsense"])
+def test_parse_modifiers_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        parse_modifiers(text)
+
+
+def test_compile_modifiers_without_modifiers():
+    assert compile_modifiers([], ["blunt", "fire"]) == ([1, 1], [0, 0])
+    assert apply_modifiers([10, 20], [1, 1], [0, 0]) == [10, 20]
+
+
+@pytest.mark.parametrize("text", [
+    "+12, 20%",
+    "20%, +12",
+    "fire +5, cold +20%, +3, 10%",
+    "10%, fire -4, 30%, blunt +7",
+])
+def test_compile_modifiers_matches_applying_in_order(text):
+    resist_types = ["blunt", "fire", "cold"]
+    modifiers = parse_modifiers(text)
+    scales, offsets = compile_modifiers(modifiers, resist_types)
+    sums = [10, 25, 40, 0, 7, 13]
+    expected = apply_one_by_one(sums[:3], modifiers, resist_types) + apply_one_by_one(sums[3:], modifiers, resist_types)
+    assert apply_modifiers(sums, scales, offsets) == pytest.approx(expected)
+
+
+def test_compile_modifiers_scales_and_offsets():
+    # Invincible then Hardened level 2: (sum + 12) * 1.2
+    scales, offsets = compile_modifiers(build_modifiers(True, True, 2), ["blunt", "fire"])
+    assert scales == pytest.approx([1.2, 1.2])
+    assert offsets == pytest.approx([12, 12])
+
+    # A flat bonus after a multiplier is divided by the scale so it is not scaled itself
+    scales, offsets = compile_modifiers(parse_modifiers("fire +50%, fire +6"), ["blunt", "fire"])
+    assert scales == pytest.approx([1, 1.5])
+    assert offsets == pytest.approx([0, 4])
+
+
+def test_compile_modifiers_rejects_bad_modifiers():
+    with pytest.raises(ValueError):
+        compile_modifiers([{"kind": "multiplier", "value": 0}], ["blunt"])
+    with pytest.raises(ValueError):
+        compile_modifiers([{"kind": "power", "value": 2}], ["blunt"])